@@ -61,6 +61,7 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_outstanding_summary: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
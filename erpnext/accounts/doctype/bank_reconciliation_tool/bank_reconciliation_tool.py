@@ -8,7 +8,7 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.query_builder.custom import ConstantColumn
-from frappe.utils import cint, flt
+from frappe.utils import cint, create_batch, flt
 
 from erpnext import get_default_cost_center
 from erpnext.accounts.doctype.bank_transaction.bank_transaction import get_total_allocated_amount
@@ -367,50 +367,281 @@ def auto_reconcile_vouchers(
 	from_reference_date=None,
 	to_reference_date=None,
 ):
+	bank_transactions = get_bank_transactions(bank_account)
+	filters = frappe._dict(
+		from_date=from_date,
+		to_date=to_date,
+		filter_by_reference_date=filter_by_reference_date,
+		from_reference_date=from_reference_date,
+		to_reference_date=to_reference_date,
+	)
+
+	if len(bank_transactions) > 100:
+		frappe.enqueue(
+			auto_reconcile_bank_transactions,
+			queue="long",
+			timeout=len(bank_transactions) + 1500,
+			bank_account=bank_account,
+			filters=filters,
+			publish_progress=True,
+			enqueue_after_commit=True,
+		)
+		frappe.msgprint(_("Auto Reconciliation has been queued as a background job"), alert=True)
+		return set(), set()
+
+	reconciled, partially_reconciled = auto_reconcile_bank_transactions(
+		bank_account, filters, bank_transactions
+	)
+
+	alert_message, indicator = get_auto_reconcile_message(partially_reconciled, reconciled)
+	frappe.msgprint(title=_("Auto Reconciliation"), msg=alert_message, indicator=indicator)
+
+	return reconciled, partially_reconciled
+
+
+def auto_reconcile_bank_transactions(bank_account, filters, bank_transactions=None, publish_progress=False):
+	"""Reconcile the Bank Transactions with the Payment Entries and Journal Entries having the same
+	reference number, ranked as in `get_linked_payments`.
+
+	The vouchers of all the transactions are loaded at once and indexed by their reference number,
+	so that transactions without a matching voucher cost no query.
+	"""
 	frappe.flags.auto_reconcile_vouchers = True
 	reconciled, partially_reconciled = set(), set()
 
-	bank_transactions = get_bank_transactions(bank_account)
-	for transaction in bank_transactions:
-		linked_payments = get_linked_payments(
-			transaction.name,
-			["payment_entry", "journal_entry"],
-			from_date,
-			to_date,
-			filter_by_reference_date,
-			from_reference_date,
-			to_reference_date,
-		)
+	if bank_transactions is None:
+		bank_transactions = get_bank_transactions(bank_account)
 
-		if not linked_payments:
-			continue
+	gl_account = frappe.db.get_value("Bank Account", bank_account, "account")
+	vouchers_by_reference = get_auto_reconcile_vouchers(gl_account, bank_transactions, filters)
+	cleared_vouchers = set()
+
+	for idx, transaction in enumerate(bank_transactions, start=1):
+		linked_payments = get_auto_reconcile_matches(transaction, vouchers_by_reference, cleared_vouchers)
+		linked_payments.extend(get_linked_payments_from_hooks(gl_account, transaction, filters))
 
-		vouchers = list(
-			map(
-				lambda entry: {
+		if linked_payments:
+			vouchers = [
+				{
 					"payment_doctype": entry.get("doctype"),
 					"payment_name": entry.get("name"),
 					"amount": entry.get("paid_amount"),
-				},
-				linked_payments,
+				}
+				for entry in sorted(linked_payments, key=lambda x: x["rank"], reverse=True)
+			]
+
+			try:
+				frappe.db.savepoint("auto_reconcile")
+				updated_transaction = reconcile_vouchers(transaction.name, json.dumps(vouchers))
+			except Exception:
+				if not publish_progress:
+					raise
+
+				frappe.db.rollback(save_point="auto_reconcile")
+				frappe.log_error(
+					title=_("Auto Reconciliation failed"),
+					reference_doctype="Bank Transaction",
+					reference_name=transaction.name,
+				)
+			else:
+				if updated_transaction.status == "Reconciled":
+					reconciled.add(updated_transaction.name)
+				elif flt(transaction.unallocated_amount) != flt(updated_transaction.unallocated_amount):
+					# Partially reconciled (status = Unreconciled & unallocated amount changed)
+					partially_reconciled.add(updated_transaction.name)
+
+				cleared_vouchers.update(get_cleared_vouchers(updated_transaction))
+
+		if publish_progress and (idx % 100 == 0 or idx == len(bank_transactions)):
+			frappe.publish_progress(
+				idx * 100 / len(bank_transactions),
+				title=_("Auto Reconciling Bank Transactions..."),
 			)
-		)
-
-		updated_transaction = reconcile_vouchers(transaction.name, json.dumps(vouchers))
 
-		if updated_transaction.status == "Reconciled":
-			reconciled.add(updated_transaction.name)
-		elif flt(transaction.unallocated_amount) != flt(updated_transaction.unallocated_amount):
-			# Partially reconciled (status = Unreconciled & unallocated amount changed)
-			partially_reconciled.add(updated_transaction.name)
+			if not frappe.flags.in_test:
+				frappe.db.commit()
 
-	alert_message, indicator = get_auto_reconcile_message(partially_reconciled, reconciled)
-	frappe.msgprint(title=_("Auto Reconciliation"), msg=alert_message, indicator=indicator)
+	if publish_progress:
+		alert_message, indicator = get_auto_reconcile_message(partially_reconciled, reconciled)
+		frappe.publish_realtime(
+			"msgprint",
+			{"title": _("Auto Reconciliation"), "message": alert_message, "indicator": indicator},
+			user=frappe.session.user,
+		)
 
 	frappe.flags.auto_reconcile_vouchers = False
 	return reconciled, partially_reconciled
 
 
+def get_auto_reconcile_vouchers(gl_account, bank_transactions, filters):
+	"""Returns the uncleared Payment Entries and Journal Entries of the bank account having the
+	reference number of any of the transactions, by (payment type, reference number).
+
+	Payment Entries come before Journal Entries and each in the order of their date, as in
+	`get_linked_payments`.
+	"""
+	reference_numbers = list(
+		{transaction.reference_number for transaction in bank_transactions if transaction.reference_number}
+	)
+
+	vouchers_by_reference = {}
+	for references in create_batch(reference_numbers, 1000):
+		for voucher in get_auto_reconcile_payment_entries(gl_account, references, filters):
+			vouchers_by_reference.setdefault((voucher.payment_type, voucher.reference_no), []).append(voucher)
+
+	for references in create_batch(reference_numbers, 1000):
+		for voucher in get_auto_reconcile_journal_entries(gl_account, references, filters):
+			vouchers_by_reference.setdefault((voucher.payment_type, voucher.reference_no), []).append(voucher)
+
+	return vouchers_by_reference
+
+
+def get_auto_reconcile_payment_entries(gl_account, reference_numbers, filters):
+	pe = frappe.qb.DocType("Payment Entry")
+	is_deposit = (pe.paid_to == gl_account) & pe.payment_type.isin(["Receive", "Internal Transfer"])
+	is_withdrawal = (pe.paid_from == gl_account) & pe.payment_type.isin(["Pay", "Internal Transfer"])
+
+	filter_by_date = pe.posting_date.between(filters.from_date, filters.to_date)
+	if cint(filters.filter_by_reference_date):
+		filter_by_date = pe.reference_date.between(filters.from_reference_date, filters.to_reference_date)
+
+	return (
+		frappe.qb.from_(pe)
+		.select(
+			ConstantColumn("Payment Entry").as_("doctype"),
+			pe.name,
+			frappe.qb.terms.Case().when(is_deposit, "Receive").else_("Pay").as_("payment_type"),
+			pe.paid_amount.as_("amount"),
+			pe.paid_amount_after_tax.as_("paid_amount"),
+			pe.reference_no,
+			pe.party,
+			pe.party_type,
+		)
+		.where(pe.docstatus == 1)
+		.where(is_deposit | is_withdrawal)
+		.where(pe.clearance_date.isnull())
+		.where(pe.paid_amount > 0.0)
+		.where(pe.reference_no.isin(reference_numbers))
+		.where(filter_by_date)
+		.orderby(pe.reference_date if cint(filters.filter_by_reference_date) else pe.posting_date)
+	).run(as_dict=True)
+
+
+def get_auto_reconcile_journal_entries(gl_account, reference_numbers, filters):
+	je = frappe.qb.DocType("Journal Entry")
+	jea = frappe.qb.DocType("Journal Entry Account")
+	is_deposit = jea.debit_in_account_currency > 0.0
+
+	filter_by_date = je.posting_date.between(filters.from_date, filters.to_date)
+	if cint(filters.filter_by_reference_date):
+		filter_by_date = je.cheque_date.between(filters.from_reference_date, filters.to_reference_date)
+
+	amount = (
+		frappe.qb.terms.Case()
+		.when(is_deposit, jea.debit_in_account_currency)
+		.else_(jea.credit_in_account_currency)
+	)
+
+	return (
+		frappe.qb.from_(jea)
+		.join(je)
+		.on(jea.parent == je.name)
+		.select(
+			ConstantColumn("Journal Entry").as_("doctype"),
+			je.name,
+			frappe.qb.terms.Case().when(is_deposit, "Receive").else_("Pay").as_("payment_type"),
+			amount.as_("amount"),
+			amount.as_("paid_amount"),
+			je.cheque_no.as_("reference_no"),
+		)
+		.where(je.docstatus == 1)
+		.where(je.voucher_type != "Opening Entry")
+		.where(je.clearance_date.isnull())
+		.where(jea.account == gl_account)
+		.where(is_deposit | (jea.credit_in_account_currency > 0.0))
+		.where(je.cheque_no.isin(reference_numbers))
+		.where(filter_by_date)
+		.orderby(je.cheque_date if cint(filters.filter_by_reference_date) else je.posting_date)
+	).run(as_dict=True)
+
+
+def get_auto_reconcile_matches(transaction, vouchers_by_reference, cleared_vouchers):
+	"""Ranked vouchers for the transaction, with the ranks of `get_pe_matching_query` and
+	`get_je_matching_query`. Vouchers are matched on the reference number for auto reconciliation,
+	so the reference rank is always 1."""
+
+	payment_type = "Receive" if transaction.deposit > 0.0 else "Pay"
+	matches = []
+	for voucher in vouchers_by_reference.get((payment_type, transaction.reference_number), []):
+		if (voucher.doctype, voucher.name) in cleared_vouchers:
+			continue
+
+		rank = 2 + cint(flt(voucher.amount) == flt(transaction.unallocated_amount))
+		if voucher.doctype == "Payment Entry" and voucher.party:
+			rank += cint(voucher.party_type == transaction.party_type and voucher.party == transaction.party)
+
+		matches.append(frappe._dict(voucher, rank=rank))
+
+	return matches
+
+
+def get_linked_payments_from_hooks(gl_account, transaction, filters):
+	"Matching vouchers from the `get_matching_queries` of other apps"
+
+	default_method = (
+		"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.get_matching_queries"
+	)
+	hooks = [method for method in frappe.get_hooks("get_matching_queries") if method != default_method]
+	if not hooks:
+		return []
+
+	document_types = ["payment_entry", "journal_entry"]
+	common_filters = frappe._dict(
+		{
+			"amount": transaction.unallocated_amount,
+			"payment_type": "Receive" if transaction.deposit > 0.0 else "Pay",
+			"reference_no": transaction.reference_number,
+			"party_type": transaction.party_type,
+			"party": transaction.party,
+			"bank_account": gl_account,
+		}
+	)
+
+	vouchers = []
+	for method_name in hooks:
+		for query in (
+			frappe.get_attr(method_name)(
+				gl_account,
+				transaction.company,
+				transaction,
+				document_types,
+				False,
+				"paid_to" if transaction.deposit > 0.0 else "paid_from",
+				filters.from_date,
+				filters.to_date,
+				filters.filter_by_reference_date,
+				filters.from_reference_date,
+				filters.to_reference_date,
+				common_filters,
+			)
+			or []
+		):
+			vouchers.extend(query.run(as_dict=True))
+
+	return subtract_allocations(gl_account, vouchers)
+
+
+def get_cleared_vouchers(transaction):
+	cleared_vouchers = set()
+	for row in transaction.payment_entries:
+		if row.payment_document in ("Payment Entry", "Journal Entry") and frappe.db.get_value(
+			row.payment_document, row.payment_entry, "clearance_date"
+		):
+			cleared_vouchers.add((row.payment_document, row.payment_entry))
+
+	return cleared_vouchers
+
+
 def get_auto_reconcile_message(partially_reconciled, reconciled):
 	"""Returns alert message and indicator for auto reconciliation depending on result state."""
 	alert_message, indicator = "", "blue"
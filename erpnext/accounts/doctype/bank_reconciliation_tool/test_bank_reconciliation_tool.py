@@ -8,6 +8,7 @@ from frappe.tests import IntegrationTestCase
 from frappe.utils import add_days, today
 
 from erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool import (
+	auto_reconcile_bank_transactions,
 	auto_reconcile_vouchers,
 	get_bank_transactions,
 )
@@ -98,3 +99,55 @@ class TestBankReconciliationTool(AccountsTestMixin, IntegrationTestCase):
 		# assert API output post reconciliation
 		transactions = get_bank_transactions(self.bank_account, from_date, to_date)
 		self.assertEqual(len(transactions), 0)
+
+	def test_auto_reconcile_in_bulk(self):
+		from_date = add_days(today(), -1)
+		to_date = today()
+
+		for reference_no, paid_amount in (("REF-1", 100), ("REF-2", 50)):
+			payment = create_payment_entry(
+				company=self.company,
+				posting_date=from_date,
+				payment_type="Receive",
+				party_type="Customer",
+				party=self.customer,
+				paid_from=self.debit_to,
+				paid_to=self.bank,
+				paid_amount=paid_amount,
+			)
+			payment.reference_no = reference_no
+			payment.save().submit()
+
+		# the first payment is split over two transactions, the last one has no matching payment
+		bank_transactions = [
+			frappe.get_doc(
+				{
+					"doctype": "Bank Transaction",
+					"date": to_date,
+					"deposit": deposit,
+					"bank_account": self.bank_account,
+					"reference_number": reference_number,
+					"currency": "INR",
+				}
+			)
+			.save()
+			.submit()
+			.name
+			for reference_number, deposit in (("REF-1", 60), ("REF-1", 40), ("REF-2", 80), ("REF-3", 10))
+		]
+
+		reconciled, partially_reconciled = auto_reconcile_bank_transactions(
+			self.bank_account,
+			frappe._dict(from_date=from_date, to_date=to_date, filter_by_reference_date=False),
+			publish_progress=True,
+		)
+
+		self.assertEqual(reconciled, set(bank_transactions[:2]))
+		self.assertEqual(partially_reconciled, {bank_transactions[2]})
+		self.assertEqual(
+			{d.name for d in get_bank_transactions(self.bank_account, from_date, to_date)},
+			set(bank_transactions[2:]),
+		)
+		self.assertEqual(
+			frappe.db.get_value("Bank Transaction", bank_transactions[2], "unallocated_amount"), 30
+		)
@@ -16,6 +16,10 @@ from frappe.utils.xlsxutils import ILLEGAL_CHARACTERS_RE, handle_html
 from openpyxl.styles import Font
 from openpyxl.utils import get_column_letter
 
+from erpnext.accounts.doctype.bank_statement_import.bank_transaction_importer import (
+	BankTransactionImporter,
+)
+
 INVALID_VALUES = ("", None)
 
 
@@ -146,6 +150,20 @@ def start_import(data_import, bank_account, import_file_path, google_sheets_url,
 	update_mapping_db(bank, template_options)
 
 	data_import = frappe.get_doc("Bank Statement Import", data_import)
+
+	if BankTransactionImporter.is_supported(import_file_path):
+		# CSV/XLSX statements are streamed and inserted in bulk, instead of a document per row
+		column_to_field_map = json.loads(template_options or "{}").get("column_to_field_map")
+		try:
+			BankTransactionImporter(data_import, bank_account, import_file_path, column_to_field_map).run()
+		except Exception:
+			frappe.db.rollback()
+			data_import.db_set("status", "Error")
+			data_import.log_error("Bank Statement Import failed")
+
+		frappe.publish_realtime("data_import_refresh", {"data_import": data_import.name})
+		return
+
 	file = import_file_path if import_file_path else google_sheets_url
 
 	import_file = ImportFile("Bank Transaction", file=file, import_type="Insert New Records")
@@ -0,0 +1,536 @@
+# Copyright (c) 2025, Frappe Technologies and contributors
+# For license information, please see license.txt
+
+import codecs
+import csv
+import datetime
+import hashlib
+import json
+import time
+from collections import defaultdict
+
+import frappe
+import openpyxl
+from frappe import _
+from frappe.model.meta import get_field_precision
+from frappe.model.naming import get_default_naming_series, parse_naming_series
+from frappe.utils import cint, cstr, flt, getdate, now
+from frappe.utils.dateutils import parse_date
+
+from erpnext.accounts.doctype.bank_transaction.auto_match_party import AutoMatchParty
+
+CHUNK_SIZE = 1000
+DEFAULT_DELIMITERS = ",;\t|"
+# same as the encodings tried by Data Import, see `frappe.utils.csvutils.read_csv_content`
+CSV_ENCODINGS = ("utf-8-sig", "windows-1250", "windows-1252")
+
+# Bank Transaction fields which can be imported from a column of the statement
+IMPORT_FIELDS = {
+	"date": "Date",
+	"deposit": "Currency",
+	"withdrawal": "Currency",
+	"currency": "Link",
+	"description": "Small Text",
+	"reference_number": "Data",
+	"transaction_id": "Data",
+	"transaction_type": "Data",
+	"bank_party_name": "Data",
+	"bank_party_iban": "Data",
+	"bank_party_account_number": "Data",
+}
+
+BANK_TRANSACTION_FIELDS = [
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"docstatus",
+	"naming_series",
+	"status",
+	"bank_account",
+	"company",
+	"allocated_amount",
+	"unallocated_amount",
+	"party_type",
+	"party",
+	*IMPORT_FIELDS,
+]
+
+LOG_FIELDS = [
+	"name",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"data_import",
+	"success",
+	"docname",
+	"row_indexes",
+	"messages",
+	"exception",
+	"log_index",
+]
+
+
+class BankTransactionImporter:
+	"""Imports a CSV/XLSX bank statement as Bank Transactions, a chunk of rows at a time.
+
+	Rows are validated in memory and inserted in bulk. A row is skipped as a duplicate if its
+	Transaction ID exists, or if the Bank Account already had as many transactions with the same
+	date, amount, reference and description as the file has upto that row.
+	"""
+
+	def __init__(
+		self,
+		data_import,
+		bank_account: str,
+		import_file_path: str,
+		column_to_field_map: dict | None = None,
+		chunk_size: int = CHUNK_SIZE,
+	) -> None:
+		self.data_import = data_import
+		self.bank_account = bank_account
+		self.file_path = frappe.get_doc("File", {"file_url": import_file_path}).get_full_path()
+		self.column_to_field_map = column_to_field_map or {}
+		self.chunk_size = chunk_size
+
+		self.submit = cint(data_import.submit_after_import)
+		self.match_party = self.submit and frappe.db.get_single_value(
+			"Accounts Settings", "enable_party_matching"
+		)
+
+		self.company, account = frappe.get_cached_value("Bank Account", bank_account, ["company", "account"])
+		self.account_currency = account and frappe.get_cached_value("Account", account, "account_currency")
+
+		meta = frappe.get_meta("Bank Transaction")
+		self.precision = get_field_precision(
+			meta.get_field("unallocated_amount"), currency=self.account_currency
+		)
+		self.field_lengths = {
+			fieldname: meta.get_field(fieldname).length or 140
+			for fieldname, fieldtype in IMPORT_FIELDS.items()
+			if fieldtype == "Data"
+		}
+		self.naming_series = get_naming_series()
+		self.csv_encoding = None
+
+		self.started_at = now()
+		# occurrences in the file so far of the rows matching an existing transaction
+		self.occurrences = defaultdict(int)
+		self.log_index = 0
+		self.imported = self.failed = 0
+
+	@staticmethod
+	def is_supported(import_file_path: str | None) -> bool:
+		return bool(import_file_path) and import_file_path.lower().endswith((".csv", ".xlsx"))
+
+	def run(self) -> frappe._dict:
+		total, start = self.get_row_count(), time.monotonic()
+		done = 0
+
+		for chunk in self.get_chunks():
+			counts = (self.imported, self.failed, self.log_index)
+			frappe.db.savepoint("bank_statement_chunk")
+			try:
+				self.import_chunk(chunk)
+			except Exception:
+				frappe.db.rollback(save_point="bank_statement_chunk")
+				self.imported, self.failed, self.log_index = counts
+				self.log(
+					[(row_index, None) for row_index, _values in chunk], exception=frappe.get_traceback()
+				)
+
+			done += len(chunk)
+			if not frappe.flags.in_test:
+				frappe.db.commit()  # nosemgrep
+
+			frappe.publish_realtime(
+				"data_import_progress",
+				{
+					"current": done,
+					"total": total,
+					"eta": (time.monotonic() - start) / done * (total - done) if total > done else 0,
+					"success": True,
+					"data_import": self.data_import.name,
+				},
+				user=frappe.session.user,
+			)
+
+		self.data_import.db_set("status", self.get_status())
+		return frappe._dict(imported=self.imported, failed=self.failed)
+
+	def get_status(self) -> str:
+		if not self.failed:
+			return "Success"
+
+		return "Partial Success" if self.imported else "Error"
+
+	def get_row_count(self) -> int:
+		if self.file_path.lower().endswith(".xlsx"):
+			workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+			row_count = max((workbook.active.max_row or 1) - 1, 0)
+			workbook.close()
+			return row_count
+
+		with open(self.file_path, encoding=self.get_csv_encoding(), newline="") as f:
+			return max(sum(1 for _row in csv.reader(f, self.get_csv_dialect(f))) - 1, 0)
+
+	def get_rows(self):
+		"Yields the rows of the file, the header first"
+		if self.file_path.lower().endswith(".xlsx"):
+			workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+			yield from workbook.active.iter_rows(values_only=True)
+			workbook.close()
+			return
+
+		with open(self.file_path, encoding=self.get_csv_encoding(), newline="") as f:
+			yield from csv.reader(f, self.get_csv_dialect(f))
+
+	def get_csv_encoding(self) -> str:
+		"Returns the first of the encodings the whole file can be decoded in, reading it a block at a time"
+		if self.csv_encoding:
+			return self.csv_encoding
+
+		for encoding in CSV_ENCODINGS:
+			decoder = codecs.getincrementaldecoder(encoding)()
+			try:
+				with open(self.file_path, "rb") as f:
+					while block := f.read(1024 * 1024):
+						decoder.decode(block)
+				decoder.decode(b"", final=True)
+			except UnicodeDecodeError:
+				continue
+
+			self.csv_encoding = encoding
+			return encoding
+
+		frappe.throw(_("Unknown file encoding. Tried {0}.").format(", ".join(CSV_ENCODINGS)))
+
+	def get_csv_dialect(self, f):
+		delimiters = DEFAULT_DELIMITERS
+		if self.data_import.custom_delimiters and self.data_import.delimiter_options:
+			delimiters = self.data_import.delimiter_options.replace("\\t", "\t")
+
+		sample = f.read(64 * 1024)
+		f.seek(0)
+		try:
+			return csv.Sniffer().sniff(sample, delimiters=delimiters)
+		except csv.Error:
+			return csv.excel
+
+	def get_chunks(self):
+		"Yields lists of (row index, {fieldname: value}) of the non empty rows"
+		rows = self.get_rows()
+		header = next(rows, None)
+		if not header:
+			return
+
+		field_map = self.get_field_map(header)
+		chunk = []
+		# row indexes are as shown in the import log, the header being row 1
+		for row_index, row in enumerate(rows, start=2):
+			if all(value in ("", None) for value in row):
+				continue
+
+			chunk.append(
+				(row_index, {fieldname: row[idx] for idx, fieldname in field_map.items() if idx < len(row)})
+			)
+			if len(chunk) >= self.chunk_size:
+				yield chunk
+				chunk = []
+
+		if chunk:
+			yield chunk
+
+	def get_field_map(self, header) -> dict[int, str]:
+		"""Returns the Bank Transaction field of each column, as per the column mapping of the import
+		or the Bank, else as per the label of the field."""
+		labels = {
+			cstr(df.label).lower(): df.fieldname
+			for df in frappe.get_meta("Bank Transaction").fields
+			if df.fieldname in IMPORT_FIELDS
+		}
+
+		field_map = {}
+		for idx, column in enumerate(header):
+			column = cstr(column).strip()
+			if str(idx) in self.column_to_field_map:
+				fieldname = self.column_to_field_map[str(idx)]
+			elif column in self.column_to_field_map:
+				fieldname = self.column_to_field_map[column]
+			else:
+				fieldname = labels.get(column.lower(), column)
+
+			if fieldname in IMPORT_FIELDS:
+				field_map[idx] = fieldname
+
+		return field_map
+
+	def import_chunk(self, chunk: list) -> None:
+		transactions, errors = [], []
+		for row_index, values in chunk:
+			try:
+				transactions.append((row_index, self.get_transaction(values)))
+			except Exception as e:
+				errors.append((row_index, str(e)))
+
+		self.log(errors)
+		transactions = self.remove_duplicates(transactions)
+
+		if self.match_party:
+			for _row_index, transaction in transactions:
+				self.set_party(transaction)
+
+		self.insert(transactions)
+
+	def get_transaction(self, values: dict) -> frappe._dict:
+		transaction = frappe._dict()
+		for fieldname, fieldtype in IMPORT_FIELDS.items():
+			value = values.get(fieldname)
+			if value in ("", None):
+				transaction[fieldname] = 0.0 if fieldtype == "Currency" else None
+			elif fieldtype == "Date":
+				transaction[fieldname] = (
+					getdate(value)
+					if isinstance(value, datetime.date)
+					else getdate(parse_date(cstr(value).strip()))
+				)
+			elif fieldtype == "Currency":
+				transaction[fieldname] = flt(value, self.precision)
+			else:
+				value = cstr(value).strip()
+				if fieldtype == "Data" and len(value) > self.field_lengths[fieldname]:
+					frappe.throw(
+						_("{0} cannot be longer than {1} characters").format(
+							_(frappe.get_meta("Bank Transaction").get_label(fieldname)),
+							self.field_lengths[fieldname],
+						)
+					)
+
+				transaction[fieldname] = value or None
+
+		if transaction.currency and self.account_currency and transaction.currency != self.account_currency:
+			frappe.throw(
+				_(
+					"Transaction currency: {0} cannot be different from Bank Account({1}) currency: {2}"
+				).format(
+					frappe.bold(transaction.currency),
+					frappe.bold(self.bank_account),
+					frappe.bold(self.account_currency),
+				)
+			)
+
+		transaction.unallocated_amount = flt(
+			abs(transaction.withdrawal - transaction.deposit), self.precision
+		)
+		return transaction
+
+	def remove_duplicates(self, transactions: list) -> list:
+		"""Removes and logs the transactions already in the system.
+
+		Rows inserted by this import are told apart from the existing transactions by their
+		creation, so that rows repeated in the statement are not taken as duplicates."""
+
+		existing_ids = self.get_existing_transaction_ids(
+			[t.transaction_id for _row_index, t in transactions if t.transaction_id]
+		)
+		existing = self.get_existing_transactions({t.date for _row_index, t in transactions if t.date})
+
+		to_insert, duplicates = [], []
+		for row_index, transaction in transactions:
+			if transaction.transaction_id in existing_ids:
+				duplicates.append((row_index, existing_ids[transaction.transaction_id]))
+				continue
+
+			key = self.get_transaction_hash(transaction)
+			if key in existing:
+				self.occurrences[key] += 1
+				if self.occurrences[key] <= len(existing[key]):
+					duplicates.append((row_index, existing[key][self.occurrences[key] - 1]))
+					continue
+
+			if transaction.transaction_id:
+				# a repeated Transaction ID later in the same chunk is a duplicate of this row
+				existing_ids[transaction.transaction_id] = None
+
+			to_insert.append((row_index, transaction))
+
+		self.log(
+			[
+				(
+					row_index,
+					_("Skipped as a duplicate of Bank Transaction {0}").format(frappe.bold(name))
+					if name
+					else _("Skipped as a duplicate of an earlier row"),
+				)
+				for row_index, name in duplicates
+			]
+		)
+		return to_insert
+
+	def get_existing_transaction_ids(self, transaction_ids: list) -> dict:
+		if not transaction_ids:
+			return {}
+
+		return {
+			row.transaction_id: row.name
+			for row in frappe.get_all(
+				"Bank Transaction",
+				filters={"transaction_id": ("in", transaction_ids)},
+				fields=["name", "transaction_id"],
+			)
+		}
+
+	def get_existing_transactions(self, dates: set) -> dict[bytes, list[str]]:
+		"Returns the names of the transactions of the Bank Account on the dates, by their hash"
+		if not dates:
+			return {}
+
+		existing = defaultdict(list)
+		for row in frappe.get_all(
+			"Bank Transaction",
+			filters={
+				"bank_account": self.bank_account,
+				"date": ("in", list(dates)),
+				"docstatus": ("<", 2),
+				"creation": ("<", self.started_at),
+			},
+			fields=["name", "date", "deposit", "withdrawal", "reference_number", "description"],
+			order_by="creation",
+		):
+			existing[self.get_transaction_hash(row)].append(row.name)
+
+		return existing
+
+	def get_transaction_hash(self, transaction) -> bytes:
+		key = (
+			str(getdate(transaction.date)) if transaction.date else "",
+			flt(flt(transaction.deposit) - flt(transaction.withdrawal), self.precision),
+			cstr(transaction.reference_number).strip(),
+			cstr(transaction.description).strip(),
+		)
+		return hashlib.blake2b(json.dumps(key).encode(), digest_size=16).digest()
+
+	def set_party(self, transaction: frappe._dict) -> None:
+		result = AutoMatchParty(
+			bank_party_account_number=transaction.bank_party_account_number,
+			bank_party_iban=transaction.bank_party_iban,
+			bank_party_name=transaction.bank_party_name,
+			description=transaction.description,
+			deposit=transaction.deposit,
+		).match()
+
+		if result:
+			transaction.party_type, transaction.party = result
+
+	def insert(self, transactions: list) -> None:
+		if not transactions:
+			return
+
+		timestamp, user = now(), frappe.session.user
+		names = reserve_names(self.naming_series, len(transactions))
+
+		values = []
+		for name, (_row_index, transaction) in zip(names, transactions, strict=True):
+			transaction.update(
+				name=name,
+				creation=timestamp,
+				modified=timestamp,
+				owner=user,
+				modified_by=user,
+				docstatus=self.submit,
+				naming_series=self.naming_series,
+				status=self.get_transaction_status(transaction),
+				bank_account=self.bank_account,
+				company=self.company,
+				allocated_amount=0.0,
+			)
+			values.append(tuple(transaction.get(field) for field in BANK_TRANSACTION_FIELDS))
+
+		frappe.db.bulk_insert("Bank Transaction", fields=BANK_TRANSACTION_FIELDS, values=values)
+
+		self.log([(row_index, None) for row_index, _transaction in transactions], names=names)
+
+	def get_transaction_status(self, transaction: frappe._dict) -> str:
+		if not self.submit:
+			return "Pending"
+
+		return "Unreconciled" if transaction.unallocated_amount > 0 else "Reconciled"
+
+	def log(self, rows: list, names: list | None = None, exception: str | None = None) -> None:
+		"""Adds a Data Import Log for each (row index, message) of failed rows, or for each row
+		imported as the given names."""
+
+		if not rows:
+			return
+
+		timestamp, user = now(), frappe.session.user
+		values = []
+		for idx, (row_index, message) in enumerate(rows):
+			self.log_index += 1
+			values.append(
+				(
+					frappe.generate_hash(length=10),
+					timestamp,
+					timestamp,
+					user,
+					user,
+					self.data_import.name,
+					1 if names else 0,
+					names[idx] if names else None,
+					json.dumps([row_index]),
+					json.dumps(
+						[{"title": _("Row {0}").format(row_index), "message": message}] if message else []
+					),
+					exception,
+					self.log_index,
+				)
+			)
+
+		frappe.db.bulk_insert("Data Import Log", fields=LOG_FIELDS, values=values)
+
+		if names:
+			self.imported += len(rows)
+		else:
+			self.failed += len(rows)
+
+
+def get_naming_series() -> str:
+	"Returns the naming series of new Bank Transactions, as configured in Document Naming Settings"
+	naming_series = get_default_naming_series("Bank Transaction")
+	if not naming_series:
+		frappe.throw(_("Naming Series mandatory"))
+
+	return naming_series
+
+
+def reserve_names(naming_series: str, count: int) -> list[str]:
+	"Returns the next `count` names of the naming series, updating its counter once"
+	if "#" not in naming_series:
+		# same as the names of documents named by naming series
+		naming_series += ".#####"
+
+	prefix = None
+
+	def get_prefix(partial_series: str, digits: int) -> str:
+		nonlocal prefix
+		prefix = partial_series
+		return ""
+
+	# evaluates the series only upto its counter, as `getseries` would
+	parse_naming_series(naming_series, number_generator=get_prefix)
+	series = frappe.qb.DocType("Series")
+
+	current = frappe.qb.from_(series).select(series.current).where(series.name == prefix).for_update().run()
+	if current:
+		start = cint(current[0][0])
+		frappe.qb.update(series).set(series.current, start + count).where(series.name == prefix).run()
+	else:
+		start = 0
+		frappe.qb.into(series).insert(prefix, count).run()
+
+	return [
+		parse_naming_series(naming_series, number_generator=lambda _prefix, digits, i=i: str(i).zfill(digits))
+		for i in range(start + 1, start + count + 1)
+	]
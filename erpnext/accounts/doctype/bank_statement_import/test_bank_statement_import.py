@@ -1,10 +1,168 @@
 # Copyright (c) 2020, Frappe Technologies and Contributors
 # See license.txt
-# import frappe
-import unittest
+import csv
+import io
+import random
 
+import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, getdate
+
+from erpnext.accounts.doctype.bank_statement_import.bank_transaction_importer import (
+	BankTransactionImporter,
+)
+from erpnext.accounts.doctype.bank_transaction.test_bank_transaction import (
+	create_bank_account,
+	create_gl_account,
+)
+
+HEADER = ["Date", "Description", "Deposit", "Withdrawal", "Reference Number", "Currency"]
 
 
 class TestBankStatementImport(IntegrationTestCase):
-	pass
+	def setUp(self):
+		uniq_identifier = frappe.generate_hash(length=10)
+		gl_account = create_gl_account("_Test Bank " + uniq_identifier)
+		self.bank_account = create_bank_account(
+			gl_account=gl_account, bank_account_name="Statement Account " + uniq_identifier
+		)
+		self.data_import = frappe.get_doc(
+			{
+				"doctype": "Bank Statement Import",
+				"company": "_Test Company",
+				"bank": "Citi Bank",
+				"bank_account": self.bank_account,
+				"reference_doctype": "Bank Transaction",
+				"import_type": "Insert New Records",
+				"submit_after_import": 1,
+			}
+		).insert()
+
+	def import_statement(self, rows, **kwargs):
+		return BankTransactionImporter(
+			self.data_import, self.bank_account, create_statement_file([HEADER, *rows]), **kwargs
+		).run()
+
+	def get_transactions(self):
+		return frappe.get_all(
+			"Bank Transaction",
+			filters={"bank_account": self.bank_account},
+			fields=[
+				"description",
+				"deposit",
+				"withdrawal",
+				"status",
+				"docstatus",
+				"company",
+				"unallocated_amount",
+			],
+			order_by="name",
+		)
+
+	def test_import_statement(self):
+		result = self.import_statement(
+			[
+				["2025-01-15", "Rent January", "", "1200", "RENT-01", "INR"],
+				["2025-01-16", "Invoice SINV-0001", "540.5", "", "SINV-0001", ""],
+				["2025-01-16", "Card payment", "", "20", "", "USD"],
+				["", "", "", "", "", ""],
+			]
+		)
+
+		self.assertEqual(result.imported, 2)
+		self.assertEqual(result.failed, 1)
+		self.assertEqual(
+			frappe.db.get_value("Bank Statement Import", self.data_import.name, "status"), "Partial Success"
+		)
+
+		transactions = self.get_transactions()
+		self.assertEqual([t.description for t in transactions], ["Rent January", "Invoice SINV-0001"])
+		for transaction in transactions:
+			self.assertEqual(transaction.docstatus, 1)
+			self.assertEqual(transaction.status, "Unreconciled")
+			self.assertEqual(transaction.company, "_Test Company")
+			self.assertEqual(transaction.unallocated_amount, transaction.deposit + transaction.withdrawal)
+
+		# the currency of the failed row differs from the bank account
+		log = frappe.get_all(
+			"Data Import Log",
+			filters={"data_import": self.data_import.name, "success": 0},
+			fields=["row_indexes", "messages"],
+		)
+		self.assertEqual(log[0].row_indexes, "[4]")
+		self.assertIn("USD", log[0].messages)
+
+	def test_skip_duplicates(self):
+		rows = [
+			["2025-02-01", "Coffee", "", "4.5", "", "INR"],
+			# same as the previous row, but is a separate transaction in the statement
+			["2025-02-01", "Coffee", "", "4.5", "", "INR"],
+			["2025-02-02", "Salary", "3000", "", "SAL-02", "INR"],
+		]
+
+		self.assertEqual(self.import_statement(rows, chunk_size=2).imported, 3)
+
+		# importing the statement again, with a new row
+		result = self.import_statement([*rows, ["2025-02-03", "Coffee", "", "4.5", "", "INR"]], chunk_size=2)
+		self.assertEqual(result.imported, 1)
+		self.assertEqual(result.failed, 3)
+		self.assertEqual(len(self.get_transactions()), 4)
+
+	def test_import_statement_in_chunks(self):
+		row_count = 250
+		rows = generate_statement(row_count)
+
+		result = self.import_statement(rows, chunk_size=100)
+		self.assertEqual(result.imported, row_count)
+		self.assertEqual(frappe.db.count("Bank Transaction", {"bank_account": self.bank_account}), row_count)
+
+		result = self.import_statement(rows, chunk_size=100)
+		self.assertEqual(result.imported, 0)
+		self.assertEqual(result.failed, row_count)
+
+	def test_import_windows_encoded_statement(self):
+		statement = create_statement_file(
+			[HEADER, ["2025-03-01", "Café Zürich", "", "12", "", "INR"]], encoding="windows-1252"
+		)
+		result = BankTransactionImporter(self.data_import, self.bank_account, statement).run()
+
+		self.assertEqual(result.imported, 1)
+		self.assertEqual(self.get_transactions()[0].description, "Café Zürich")
+
+
+def create_statement_file(rows, encoding: str | None = None) -> str:
+	content = io.StringIO()
+	csv.writer(content).writerows(rows)
+
+	file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": f"statement-{frappe.generate_hash(length=10)}.csv",
+			"content": content.getvalue().encode(encoding) if encoding else content.getvalue(),
+			"is_private": 1,
+		}
+	).insert()
+	return file.file_url
+
+
+def generate_statement(row_count: int) -> list:
+	"Generate random deposits and withdrawals over a year."
+	random.seed(42)
+	start_date = getdate("2025-01-01")
+	rows = []
+
+	for i in range(row_count):
+		amount = f"{random.randint(1, 100000) / 100:.2f}"
+		deposit = random.random() < 0.3
+		rows.append(
+			[
+				str(add_days(start_date, i * 365 // row_count)),
+				f"Payment {i} {random.choice(['Card', 'Transfer', 'Direct Debit'])}",
+				amount if deposit else "",
+				"" if deposit else amount,
+				f"REF-{i:06d}",
+				"INR",
+			]
+		)
+
+	return rows
@@ -1,6 +1,12 @@
+from bisect import bisect_left, bisect_right
+
 import frappe
 from frappe.utils import flt
 from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+# parties with a fuzzy score above the cutoff are considered a match
+FUZZY_CUTOFF = 80
 
 
 class AutoMatchParty:
@@ -50,45 +56,27 @@ class AutoMatchbyAccountIBAN:
 
 	def match_account_in_party(self) -> tuple | None:
 		"""Check if there is a IBAN/Account No. match in Customer/Supplier/Employee"""
-		result = None
-		parties = get_parties_in_order(self.deposit)
-		or_filters = self.get_or_filters()
+		index = get_party_match_index("accounts")
 
-		for party in parties:
-			party_result = frappe.db.get_all(
-				"Bank Account", or_filters=or_filters, pluck="party", limit_page_length=1
-			)
-
-			if party == "Employee" and not party_result:
-				# Search in Bank Accounts first for Employee, and then Employee record
-				if "bank_account_no" in or_filters:
-					or_filters["bank_ac_no"] = or_filters.pop("bank_account_no")
-
-				party_result = frappe.db.get_all(
-					party, or_filters=or_filters, pluck="name", limit_page_length=1
-				)
-
-				if "bank_ac_no" in or_filters:
-					or_filters["bank_account_no"] = or_filters.pop("bank_ac_no")
-
-			if party_result:
-				result = (
-					party,
-					party_result[0],
-				)
-				break
+		for party in get_parties_in_order(self.deposit):
+			# Search in Bank Accounts first for Employee, and then Employee record
+			sources = ["Bank Account", "Employee"] if party == "Employee" else ["Bank Account"]
 
-		return result
+			for source in sources:
+				matches = [
+					index[key]
+					for key in (
+						(source, party, "bank_party_account_number", self.bank_party_account_number),
+						(source, party, "bank_party_iban", self.bank_party_iban),
+					)
+					if key[-1] and key in index
+				]
 
-	def get_or_filters(self) -> dict:
-		or_filters = {}
-		if self.bank_party_account_number:
-			or_filters["bank_account_no"] = self.bank_party_account_number
+				if matches:
+					# the latest modified record matching either the account no. or the IBAN
+					return (party, min(matches)[1])
 
-		if self.bank_party_iban:
-			or_filters["iban"] = self.bank_party_iban
-
-		return or_filters
+		return None
 
 
 class AutoMatchbyPartyNameDescription:
@@ -112,9 +100,7 @@ class AutoMatchbyPartyNameDescription:
 		parties = get_parties_in_order(self.deposit)
 
 		for party in parties:
-			filters = {"status": "Active"} if party == "Employee" else {"disabled": 0}
-			field = party.lower() + "_name"
-			names = frappe.get_all(party, filters=filters, fields=[f"{field} as party_name", "name"])
+			names = get_party_match_index(party)
 
 			for field in ["bank_party_name", "description"]:
 				if not self.get(field):
@@ -133,12 +119,14 @@ class AutoMatchbyPartyNameDescription:
 
 	def fuzzy_search_and_return_result(self, party, names, field) -> tuple | None:
 		skip = False
+		query = default_process(self.get(field))
 		result = process.extract(
-			query=self.get(field),
-			choices={row.get("name"): row.get("party_name") for row in names},
+			query=query,
+			choices=names.get_candidates(query),
 			scorer=fuzz.token_set_ratio,
+			processor=None,
 		)
-		party_name, skip = self.process_fuzzy_result(result)
+		party_name, skip = self.process_fuzzy_result(result, single_choice=len(names) == 1)
 
 		if not party_name:
 			return None, skip
@@ -148,27 +136,32 @@ class AutoMatchbyPartyNameDescription:
 			party_name,
 		), skip
 
-	def process_fuzzy_result(self, result: list | None):
+	def process_fuzzy_result(self, result: list | None, single_choice: bool | None = None):
 		"""
 		If there are multiple valid close matches return None as result may be faulty.
 		Return the result only if one accurate match stands out.
 
+		`single_choice` tells if there is only one party to choose from, when `result` leaves
+		out the parties which cannot score above the cutoff.
+
 		Returns: Result, Skip (whether or not to discontinue matching)
 		"""
-		SCORE, PARTY_ID, CUTOFF = 1, 2, 80
+		SCORE, PARTY_ID, CUTOFF = 1, 2, FUZZY_CUTOFF
+
+		if single_choice is None:
+			single_choice = len(result or []) == 1
 
 		if not result or not len(result):
-			return None, False
+			return None, single_choice
 
 		first_result = result[0]
-		if len(result) == 1:
+		if single_choice:
 			return (first_result[PARTY_ID] if first_result[SCORE] > CUTOFF else None), True
 
-		second_result = result[1]
 		if first_result[SCORE] > CUTOFF:
 			# If multiple matches with the same score, return None but discontinue matching
 			# Matches were found but were too close to distinguish between
-			if first_result[SCORE] == second_result[SCORE]:
+			if len(result) > 1 and first_result[SCORE] == result[1][SCORE]:
 				return None, True
 
 			return first_result[PARTY_ID], True
@@ -182,3 +175,137 @@ def get_parties_in_order(deposit: float) -> list:
 		parties = ["Customer", "Supplier", "Employee"]  # most -> least likely to pay
 
 	return parties
+
+
+class PartyNameIndex:
+	"""Normalised names of the parties of a Party Type, to be fuzzy searched.
+
+	Only the names which can score above `FUZZY_CUTOFF` with `fuzz.token_set_ratio` are
+	returned as candidates for a search. Such a name either shares a word with the query,
+	or has a similar length and shares at least a pair of consecutive characters with it.
+	"""
+
+	def __init__(self, names: dict[str, str]) -> None:
+		self.names = {}
+		self.bigrams = {}
+		self.tokens = {}
+		# parties without a name are left out by `process.extract`
+		self.count = len([party_name for party_name in names.values() if party_name is not None])
+		lengths = []
+
+		for name, party_name in names.items():
+			party_name = default_process(party_name or "")
+			if not party_name:
+				continue
+
+			self.names[name] = party_name
+			self.bigrams[name] = get_bigrams(party_name)
+			for token in party_name.split():
+				self.tokens.setdefault(token, set()).add(name)
+
+			lengths.append((get_token_set_length(party_name), name))
+
+		lengths.sort()
+		self.lengths = [length for length, _name in lengths]
+		self.names_by_length = [name for _length, name in lengths]
+
+	def __len__(self) -> int:
+		return self.count
+
+	def get_candidates(self, query: str) -> dict[str, str]:
+		"""Returns the names (party: normalised party name) which may match the processed query"""
+		if not query:
+			return {}
+
+		candidates = set()
+		for token in set(query.split()):
+			candidates.update(self.tokens.get(token, ()))
+
+		# names not sharing a word are compared as a whole, which can only score above the
+		# cutoff for names of length between 2/3 and 3/2 of the query
+		length = get_token_set_length(query)
+		bigrams = get_bigrams(query)
+		for name in self.names_by_length[
+			bisect_left(self.lengths, length * 2 / 3) : bisect_right(self.lengths, length * 3 / 2)
+		]:
+			if name not in candidates and not bigrams.isdisjoint(self.bigrams[name]):
+				candidates.add(name)
+
+		return {name: self.names[name] for name in candidates}
+
+
+def get_bigrams(text: str) -> set[str]:
+	text = f" {text} "
+	return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def get_token_set_length(text: str) -> int:
+	return len(" ".join(set(text.split())))
+
+
+def get_party_match_index(key: str):
+	"""Returns the index of the IBANs/Account Nos. ("accounts") or the names of a Party Type.
+
+	Indexes are cached till a Customer, Supplier, Employee or Bank Account is changed,
+	so that they are built once for a whole bank statement import. They are also kept for the
+	request or background job, so that they are not loaded from the cache for every transaction.
+	"""
+
+	if not hasattr(frappe.local, "party_match_index"):
+		frappe.local.party_match_index = {}
+
+	if key not in frappe.local.party_match_index:
+		index = frappe.cache().hget("bank_transaction_party_match_index", key)
+		if index is None:
+			index = build_account_index() if key == "accounts" else build_party_name_index(key)
+			frappe.cache().hset("bank_transaction_party_match_index", key, index)
+
+		frappe.local.party_match_index[key] = index
+
+	return frappe.local.party_match_index[key]
+
+
+def build_account_index() -> dict[tuple, tuple[int, str]]:
+	"""Maps (Source, Party Type, Field, Value) to (position, Party) of the matching record
+	with the least position, records being ordered by the latest modified first."""
+
+	index = {}
+
+	def add(source, party_type, party, account_no, iban):
+		position = len(index)
+		if account_no:
+			index.setdefault((source, party_type, "bank_party_account_number", account_no), (position, party))
+		if iban:
+			index.setdefault((source, party_type, "bank_party_iban", iban), (position, party))
+
+	for row in frappe.get_all(
+		"Bank Account",
+		filters={"party_type": ("in", ["Customer", "Supplier", "Employee"]), "party": ("is", "set")},
+		fields=["party_type", "party", "bank_account_no", "iban"],
+		order_by="modified desc",
+	):
+		add("Bank Account", row.party_type, row.party, row.bank_account_no, row.iban)
+
+	for row in frappe.get_all(
+		"Employee",
+		or_filters={"bank_ac_no": ("is", "set"), "iban": ("is", "set")},
+		fields=["name", "bank_ac_no", "iban"],
+		order_by="modified desc",
+	):
+		add("Employee", "Employee", row.name, row.bank_ac_no, row.iban)
+
+	return index
+
+
+def build_party_name_index(party: str) -> PartyNameIndex:
+	filters = {"status": "Active"} if party == "Employee" else {"disabled": 0}
+	field = party.lower() + "_name"
+	names = frappe.get_all(party, filters=filters, fields=[f"{field} as party_name", "name"])
+
+	return PartyNameIndex({row.name: row.party_name for row in names})
+
+
+def clear_party_match_index(doc=None, method=None, *args):
+	"Clear the cached index on a change of a Customer, Supplier, Employee or Bank Account"
+	frappe.cache().delete_value("bank_transaction_party_match_index")
+	frappe.local.party_match_index = {}
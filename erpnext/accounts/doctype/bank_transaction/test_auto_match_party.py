@@ -1,10 +1,17 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from unittest.mock import patch
+
 import frappe
 from frappe.tests import IntegrationTestCase, UnitTestCase
 from frappe.utils import nowdate
 
+from erpnext.accounts.doctype.bank_transaction.auto_match_party import (
+	PartyNameIndex,
+	clear_party_match_index,
+	get_party_match_index,
+)
 from erpnext.accounts.doctype.bank_transaction.test_bank_transaction import create_bank_account
 
 
@@ -23,6 +30,7 @@ class TestAutoMatchParty(IntegrationTestCase):
 		create_bank_account()
 		frappe.db.set_single_value("Accounts Settings", "enable_party_matching", 1)
 		frappe.db.set_single_value("Accounts Settings", "enable_fuzzy_matching", 1)
+		clear_party_match_index()
 		return super().setUpClass()
 
 	@classmethod
@@ -91,6 +99,51 @@ class TestAutoMatchParty(IntegrationTestCase):
 		self.assertEqual(doc.party_type, None)
 		self.assertEqual(doc.party, None)
 
+	def test_match_index_cleared_on_party_update(self):
+		create_supplier_for_match(supplier_name="Tapioca Traders")
+		self.assertIn("Tapioca Traders", get_party_match_index("Supplier").names)
+
+		supplier = frappe.get_doc("Supplier", "Tapioca Traders")
+		supplier.disabled = 1
+		supplier.save()
+
+		doc = create_bank_transaction(
+			description="Tapioca Traders, PINV-0042",
+			withdrawal=500,
+			transaction_id="9b1c0e5e43f1b1d3e0a5f4a8c7d2e6f1",
+			party_name="Tapioca Traders",
+		)
+		self.assertEqual(doc.party, None)
+		self.assertNotIn("Tapioca Traders", get_party_match_index("Supplier").names)
+
+	def test_match_index_kept_for_request(self):
+		clear_party_match_index()
+		index = get_party_match_index("Supplier")
+
+		# later transactions of the import reuse the index without loading it from the cache
+		with patch("frappe.cache") as cache:
+			self.assertIs(get_party_match_index("Supplier"), index)
+			cache.assert_not_called()
+
+	def test_fuzzy_match_candidates(self):
+		index = PartyNameIndex(
+			{
+				"SUP-1": "Adithya Medical & General Stores",
+				"SUP-2": "Microsoft",
+				"SUP-3": "Jackson Ella W.",
+				"SUP-4": None,
+			}
+		)
+
+		self.assertEqual(len(index), 3)
+		# shares a word
+		self.assertIn("SUP-2", index.get_candidates("auftraggeber microsoft payments"))
+		# misspelt, of a similar length
+		self.assertIn("SUP-3", index.get_candidates("jakson ela"))
+		# much longer than the query, without any common word
+		self.assertNotIn("SUP-1", index.get_candidates("microsoft"))
+		self.assertEqual(index.get_candidates("zzz"), {})
+
 
 def create_supplier_for_match(supplier_name="John Doe & Co.", iban=None, account_no=None):
 	if frappe.db.exists("Supplier", {"supplier_name": supplier_name}):
@@ -103,6 +156,7 @@ def create_supplier_for_match(supplier_name="John Doe & Co.", iban=None, account
 			dn={"party": supplier_name},
 			field={"iban": iban, "bank_account_no": account_no},
 		)
+		clear_party_match_index()
 		return
 
 	# Create Supplier and Bank Account for the same
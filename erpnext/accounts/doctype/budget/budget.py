@@ -140,9 +140,39 @@ class Budget(Document):
 		self.naming_series = f"{{{frappe.scrub(self.budget_against)}}}./.{self.fiscal_year}/.###"
 
 
-def validate_expense_against_budget(args, expense_amount=0):
+def validate_lines_against_budget(lines):
+	"""Validates the lines of a document against the budgets, once for each budget key.
+
+	The budget records and the amounts consumed of a budget are computed once and shared by
+	all the lines, with the amounts of open Material Requests and Purchase Orders grouped by item.
+	"""
+
+	cache = {}
+	validated = set()
+	for args in lines:
+		key = get_budget_key(args)
+		if key not in validated:
+			validated.add(key)
+			validate_expense_against_budget(args, cache=cache)
+
+
+def get_budget_key(args):
+	fields = ["doctype", "company", "posting_date", "fiscal_year", "account", "expense_account"]
+	fields += ["item_code", "item_group", "cost_center", "project"]
+	fields += get_accounting_dimensions()
+
+	return tuple(args.get(field) for field in fields)
+
+
+def validate_expense_against_budget(args, expense_amount=0, cache=None):
 	args = frappe._dict(args)
-	if not frappe.get_all("Budget", limit=1):
+	if cache is None:
+		cache = {}
+
+	if "has_budget" not in cache:
+		cache["has_budget"] = bool(frappe.get_all("Budget", limit=1))
+
+	if not cache["has_budget"]:
 		return
 
 	if args.get("company") and not args.fiscal_year:
@@ -151,7 +181,13 @@ def validate_expense_against_budget(args, expense_amount=0):
 			"Company", args.get("company"), "exception_budget_approver_role"
 		)
 
-	if not frappe.get_cached_value("Budget", {"fiscal_year": args.fiscal_year, "company": args.company}):  # nosec
+	key = ("has_budget", args.fiscal_year, args.company)
+	if key not in cache:
+		cache[key] = bool(
+			frappe.get_cached_value("Budget", {"fiscal_year": args.fiscal_year, "company": args.company})
+		)  # nosec
+
+	if not cache[key]:
 		return
 
 	if not args.account:
@@ -183,45 +219,57 @@ def validate_expense_against_budget(args, expense_amount=0):
 			and (frappe.get_cached_value("Account", args.account, "root_type") == "Expense")
 		):
 			doctype = dimension.get("document_type")
-
-			if frappe.get_cached_value("DocType", doctype, "is_tree"):
-				lft, rgt = frappe.get_cached_value(doctype, args.get(budget_against), ["lft", "rgt"])
-				condition = f"""and exists(select name from `tab{doctype}`
-					where lft<={lft} and rgt>={rgt} and name=b.{budget_against})"""  # nosec
-				args.is_tree = True
-			else:
-				condition = f"and b.{budget_against}={frappe.db.escape(args.get(budget_against))}"
-				args.is_tree = False
-
+			args.is_tree = bool(frappe.get_cached_value("DocType", doctype, "is_tree"))
 			args.budget_against_field = budget_against
 			args.budget_against_doctype = doctype
 
-			budget_records = frappe.db.sql(
-				f"""
-				select
-					b.{budget_against} as budget_against, ba.budget_amount, b.monthly_distribution,
-					ifnull(b.applicable_on_material_request, 0) as for_material_request,
-					ifnull(applicable_on_purchase_order, 0) as for_purchase_order,
-					ifnull(applicable_on_booking_actual_expenses,0) as for_actual_expenses,
-					b.action_if_annual_budget_exceeded, b.action_if_accumulated_monthly_budget_exceeded,
-					b.action_if_annual_budget_exceeded_on_mr, b.action_if_accumulated_monthly_budget_exceeded_on_mr,
-					b.action_if_annual_budget_exceeded_on_po, b.action_if_accumulated_monthly_budget_exceeded_on_po
-				from
-					`tabBudget` b, `tabBudget Account` ba
-				where
-					b.name=ba.parent and b.fiscal_year=%s
-					and ba.account=%s and b.docstatus=1
-					{condition}
-			""",
-				(args.fiscal_year, args.account),
-				as_dict=True,
-			)  # nosec
-
+			budget_records = get_budget_records(args, cache)
 			if budget_records:
-				validate_budget_records(args, budget_records, expense_amount)
+				validate_budget_records(args, budget_records, expense_amount, cache)
+
 
+def get_budget_records(args, cache=None):
+	budget_against = args.budget_against_field
+	key = ("budget_records", budget_against, args.get(budget_against), args.fiscal_year, args.account)
+	if cache is not None and key in cache:
+		return cache[key]
 
-def validate_budget_records(args, budget_records, expense_amount):
+	doctype = args.budget_against_doctype
+	if args.is_tree:
+		lft, rgt = frappe.get_cached_value(doctype, args.get(budget_against), ["lft", "rgt"])
+		condition = f"""and exists(select name from `tab{doctype}`
+			where lft<={lft} and rgt>={rgt} and name=b.{budget_against})"""  # nosec
+	else:
+		condition = f"and b.{budget_against}={frappe.db.escape(args.get(budget_against))}"
+
+	budget_records = frappe.db.sql(
+		f"""
+		select
+				b.{budget_against} as budget_against, ba.budget_amount, b.monthly_distribution,
+				ifnull(b.applicable_on_material_request, 0) as for_material_request,
+				ifnull(applicable_on_purchase_order, 0) as for_purchase_order,
+				ifnull(applicable_on_booking_actual_expenses,0) as for_actual_expenses,
+				b.action_if_annual_budget_exceeded, b.action_if_accumulated_monthly_budget_exceeded,
+				b.action_if_annual_budget_exceeded_on_mr, b.action_if_accumulated_monthly_budget_exceeded_on_mr,
+				b.action_if_annual_budget_exceeded_on_po, b.action_if_accumulated_monthly_budget_exceeded_on_po
+			from
+				`tabBudget` b, `tabBudget Account` ba
+			where
+				b.name=ba.parent and b.fiscal_year=%s
+				and ba.account=%s and b.docstatus=1
+				{condition}
+		""",
+		(args.fiscal_year, args.account),
+		as_dict=True,
+	)  # nosec
+
+	if cache is not None:
+		cache[key] = budget_records
+
+	return budget_records
+
+
+def validate_budget_records(args, budget_records, expense_amount, cache=None):
 	for budget in budget_records:
 		if flt(budget.budget_amount):
 			yearly_action, monthly_action = get_actions(args, budget)
@@ -236,6 +284,7 @@ def validate_budget_records(args, budget_records, expense_amount):
 					yearly_action,
 					budget.budget_against,
 					expense_amount,
+					cache,
 				)
 
 			if monthly_action in ["Stop", "Warn"]:
@@ -252,13 +301,17 @@ def validate_budget_records(args, budget_records, expense_amount):
 					monthly_action,
 					budget.budget_against,
 					expense_amount,
+					cache,
 				)
 
 
-def compare_expense_with_budget(args, budget_amount, action_for, action, budget_against, amount=0):
-	args.actual_expense, args.requested_amount, args.ordered_amount = get_actual_expense(args), 0, 0
+def compare_expense_with_budget(
+	args, budget_amount, action_for, action, budget_against, amount=0, cache=None
+):
+	args.actual_expense, args.requested_amount, args.ordered_amount = get_actual_expense(args, cache), 0, 0
 	if not amount:
-		args.requested_amount, args.ordered_amount = get_requested_amount(args), get_ordered_amount(args)
+		args.requested_amount = get_requested_amount(args, cache)
+		args.ordered_amount = get_ordered_amount(args, cache)
 
 		if args.get("doctype") == "Material Request" and args.for_material_request:
 			amount = args.requested_amount + args.ordered_amount
@@ -393,36 +446,43 @@ def get_actions(args, budget):
 	return yearly_action, monthly_action
 
 
-def get_requested_amount(args):
-	item_code = args.get("item_code")
-	condition = get_other_condition(args, "Material Request")
+def get_requested_amount(args, cache=None):
+	return get_open_amounts(args, "Material Request", cache).get(args.get("item_code"), 0)
 
-	data = frappe.db.sql(
-		""" select ifnull((sum(child.stock_qty - child.ordered_qty) * rate), 0) as amount
-		from `tabMaterial Request Item` child, `tabMaterial Request` parent where parent.name = child.parent and
-		child.item_code = %s and parent.docstatus = 1 and child.stock_qty > child.ordered_qty and {} and
-		parent.material_request_type = 'Purchase' and parent.status != 'Stopped'""".format(condition),
-		item_code,
-		as_list=1,
-	)
 
-	return data[0][0] if data else 0
+def get_ordered_amount(args, cache=None):
+	return get_open_amounts(args, "Purchase Order", cache).get(args.get("item_code"), 0)
+
 
+def get_open_amounts(args, for_doc, cache=None):
+	"""Returns the amounts of the open Material Requests or Purchase Orders against the budget, by item.
+	Without a cache, only the amount of the item in `args` is computed."""
 
-def get_ordered_amount(args):
-	item_code = args.get("item_code")
-	condition = get_other_condition(args, "Purchase Order")
+	condition = get_other_condition(args, for_doc)
+	key = ("open_amounts", for_doc, condition)
+	if cache is not None and key in cache:
+		return cache[key]
 
-	data = frappe.db.sql(
-		f""" select ifnull(sum(child.amount - child.billed_amt), 0) as amount
+	item_condition = "" if cache is not None else "and child.item_code = %(item_code)s"
+	if for_doc == "Material Request":
+		query = f""" select child.item_code, ifnull((sum(child.stock_qty - child.ordered_qty) * rate), 0)
+		from `tabMaterial Request Item` child, `tabMaterial Request` parent where parent.name = child.parent
+		{item_condition} and parent.docstatus = 1 and child.stock_qty > child.ordered_qty and {condition} and
+		parent.material_request_type = 'Purchase' and parent.status != 'Stopped'
+		group by child.item_code"""
+	else:
+		query = f""" select child.item_code, ifnull(sum(child.amount - child.billed_amt), 0)
 		from `tabPurchase Order Item` child, `tabPurchase Order` parent where
-		parent.name = child.parent and child.item_code = %s and parent.docstatus = 1 and child.amount > child.billed_amt
-		and parent.status != 'Closed' and {condition}""",
-		item_code,
-		as_list=1,
-	)
+		parent.name = child.parent {item_condition} and parent.docstatus = 1 and child.amount > child.billed_amt
+		and parent.status != 'Closed' and {condition}
+		group by child.item_code"""
+
+	amounts = dict(frappe.db.sql(query, {"item_code": args.get("item_code")}))  # nosec
+
+	if cache is not None:
+		cache[key] = amounts
 
-	return data[0][0] if data else 0
+	return amounts
 
 
 def get_other_condition(args, for_doc):
@@ -444,11 +504,24 @@ def get_other_condition(args, for_doc):
 	return condition
 
 
-def get_actual_expense(args):
+def get_actual_expense(args, cache=None):
 	if not args.budget_against_doctype:
 		args.budget_against_doctype = frappe.unscrub(args.budget_against_field)
 
 	budget_against_field = args.get("budget_against_field")
+	key = (
+		"actual_expense",
+		args.account,
+		budget_against_field,
+		args.get(budget_against_field),
+		args.is_tree,
+		args.fiscal_year,
+		args.company,
+		args.get("month_end_date"),
+	)
+	if cache is not None and key in cache:
+		return cache[key]
+
 	condition1 = " and gle.posting_date <= %(month_end_date)s" if args.get("month_end_date") else ""
 
 	if args.is_tree:
@@ -484,6 +557,9 @@ def get_actual_expense(args):
 		)[0][0]
 	)  # nosec
 
+	if cache is not None:
+		cache[key] = amount
+
 	return amount
 
 
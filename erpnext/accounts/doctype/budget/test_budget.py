@@ -1,12 +1,17 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
 from frappe.utils import now_datetime, nowdate
 
-from erpnext.accounts.doctype.budget.budget import BudgetError, get_actual_expense
+from erpnext.accounts.doctype.budget.budget import (
+	BudgetError,
+	get_actual_expense,
+	validate_expense_against_budget,
+)
 from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
 from erpnext.accounts.utils import get_fiscal_year
 from erpnext.buying.doctype.purchase_order.test_purchase_order import create_purchase_order
@@ -145,6 +150,41 @@ class TestBudget(IntegrationTestCase):
 		budget.cancel()
 		po.cancel()
 
+	def test_budget_validated_once_per_budget_key(self):
+		budget = make_budget(
+			applicable_on_purchase_order=1,
+			action_if_annual_budget_exceeded_on_po="Warn",
+			action_if_accumulated_monthly_budget_exceeded_on_po="Warn",
+			budget_against="Cost Center",
+		)
+
+		items = [
+			{
+				"item_code": item_code,
+				"warehouse": "_Test Warehouse - _TC",
+				"qty": 1,
+				"rate": 100,
+				"schedule_date": nowdate(),
+				"expense_account": "_Test Account Cost for Goods Sold - _TC",
+				"cost_center": "_Test Cost Center - _TC",
+			}
+			for item_code in ["_Test Item"] * 30 + ["_Test Item 2"]
+		]
+		po = create_purchase_order(transaction_date=nowdate(), rm_items=items, do_not_submit=True)
+
+		with patch(
+			"erpnext.accounts.doctype.budget.budget.validate_expense_against_budget",
+			wraps=validate_expense_against_budget,
+		) as validate:
+			po.submit()
+
+		# the lines of an item are validated together
+		self.assertEqual(validate.call_count, 2)
+
+		budget.load_from_db()
+		budget.cancel()
+		po.cancel()
+
 	def test_monthly_budget_crossed_stop2(self):
 		set_total_expense_zero(nowdate(), "project")
 
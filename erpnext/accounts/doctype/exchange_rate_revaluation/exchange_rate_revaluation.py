@@ -9,11 +9,12 @@ from frappe.model.meta import get_field_precision
 from frappe.query_builder import Criterion, Order
 from frappe.query_builder.functions import NullIf, Sum
 from frappe.utils import flt, get_link_to_form
+from pypika.analytics import RowNumber
 
 import erpnext
 from erpnext.accounts.doctype.journal_entry.journal_entry import get_balance_on
 from erpnext.accounts.utils import get_currency_precision
-from erpnext.setup.utils import get_exchange_rate
+from erpnext.setup.utils import get_exchange_rates
 
 
 class ExchangeRateRevaluation(Document):
@@ -256,11 +257,15 @@ class ExchangeRateRevaluation(Document):
 
 		if account_details:
 			# Handle Accounts with balance in both Account/Base Currency
-			for d in [x for x in account_details if not x.zero_balance]:
+			accounts_with_balance = [x for x in account_details if not x.zero_balance]
+			exchange_rates = get_exchange_rates(
+				[(d.account_currency, posting_date) for d in accounts_with_balance], company_currency
+			)
+			for d in accounts_with_balance:
 				current_exchange_rate = (
 					d.balance / d.balance_in_account_currency if d.balance_in_account_currency else 0
 				)
-				new_exchange_rate = get_exchange_rate(d.account_currency, company_currency, posting_date)
+				new_exchange_rate = exchange_rates[(d.account_currency, posting_date)]
 				new_balance_in_base_currency = flt(d.balance_in_account_currency * new_exchange_rate)
 				gain_loss = flt(new_balance_in_base_currency, precision) - flt(d.balance, precision)
 
@@ -282,7 +287,11 @@ class ExchangeRateRevaluation(Document):
 				)
 
 			# Handle Accounts with '0' balance in Account/Base Currency
-			for d in [x for x in account_details if x.zero_balance]:
+			zero_balance_accounts = [x for x in account_details if x.zero_balance]
+			last_exchange_rates = get_exchange_rates_using_last_gle(
+				company, [x for x in zero_balance_accounts if x.balance == 0]
+			)
+			for d in zero_balance_accounts:
 				if d.balance != 0:
 					current_exchange_rate = new_exchange_rate = 0
 
@@ -295,8 +304,7 @@ class ExchangeRateRevaluation(Document):
 					new_balance_in_account_currency = 0
 
 					current_exchange_rate = (
-						calculate_exchange_rate_using_last_gle(company, d.account, d.party_type, d.party)
-						or 0.0
+						last_exchange_rates.get((d.account, d.party_type or None, d.party or None)) or 0.0
 					)
 
 					gain_loss = new_balance_in_account_currency - (
@@ -366,6 +374,7 @@ class ExchangeRateRevaluation(Document):
 			return
 
 		unrealized_exchange_gain_loss_account = self.get_for_unrealized_gain_loss_account()
+		unrealized_exchange_gain_loss_balance = get_balance_on(unrealized_exchange_gain_loss_account)
 
 		journal_entry = frappe.new_doc("Journal Entry")
 		journal_entry.voucher_type = "Exchange Gain Or Loss"
@@ -420,7 +429,7 @@ class ExchangeRateRevaluation(Document):
 				journal_entry_accounts.append(
 					{
 						"account": unrealized_exchange_gain_loss_account,
-						"balance": get_balance_on(unrealized_exchange_gain_loss_account),
+						"balance": unrealized_exchange_gain_loss_balance,
 						"debit": 0,
 						"credit": 0,
 						"debit_in_account_currency": abs(d.gain_loss) if d.gain_loss < 0 else 0,
@@ -452,7 +461,7 @@ class ExchangeRateRevaluation(Document):
 				journal_entry_accounts.append(
 					{
 						"account": unrealized_exchange_gain_loss_account,
-						"balance": get_balance_on(unrealized_exchange_gain_loss_account),
+						"balance": unrealized_exchange_gain_loss_balance,
 						"debit": abs(d.gain_loss) if d.gain_loss < 0 else 0,
 						"credit": abs(d.gain_loss) if d.gain_loss > 0 else 0,
 						"debit_in_account_currency": 0,
@@ -568,47 +577,87 @@ class ExchangeRateRevaluation(Document):
 		return journal_entry
 
 
-def calculate_exchange_rate_using_last_gle(company, account, party_type, party):
+def get_exchange_rates_using_last_gle(company, account_details) -> dict:
 	"""
-	Use last GL entry to calculate exchange rate
+	Use last GL entry of each account and party to calculate exchange rate
 	"""
-	last_exchange_rate = None
-	if company and account:
-		gl = qb.DocType("GL Entry")
-
-		# build conditions
-		conditions = []
-		conditions.append(gl.company == company)
-		conditions.append(gl.account == account)
-		conditions.append(gl.is_cancelled == 0)
-		conditions.append((gl.debit > 0) | (gl.credit > 0))
-		conditions.append((gl.debit_in_account_currency > 0) | (gl.credit_in_account_currency > 0))
-		if party_type:
-			conditions.append(gl.party_type == party_type)
-		if party:
-			conditions.append(gl.party == party)
-
-		voucher_type, voucher_no = (
-			qb.from_(gl)
-			.select(gl.voucher_type, gl.voucher_no)
-			.where(Criterion.all(conditions))
+	if not (company and account_details):
+		return {}
+
+	gl = qb.DocType("GL Entry")
+	conditions = [
+		gl.company == company,
+		gl.account.isin({d.account for d in account_details}),
+		gl.is_cancelled == 0,
+		(gl.debit > 0) | (gl.credit > 0),
+		(gl.debit_in_account_currency > 0) | (gl.credit_in_account_currency > 0),
+	]
+	# accounts without a party are matched against the last entry of any party
+	parties = {d.party for d in account_details if d.party}
+	match_any_party = not all(d.party for d in account_details)
+	if not match_any_party:
+		conditions.append(gl.party.isin(parties))
+
+	def last_entry_rank(*partition):
+		return (
+			RowNumber()
+			.over(*partition)
 			.orderby(gl.posting_date, order=Order.desc)
-			.limit(1)
-			.run()[0]
+			.orderby(gl.creation, order=Order.desc)
 		)
 
-		last_exchange_rate = (
-			qb.from_(gl)
-			.select((gl.debit - gl.credit) / (gl.debit_in_account_currency - gl.credit_in_account_currency))
-			.where(
-				(gl.voucher_type == voucher_type) & (gl.voucher_no == voucher_no) & (gl.account == account)
-			)
-			.orderby(gl.posting_date, order=Order.desc)
-			.limit(1)
-			.run()[0][0]
+	entries = (
+		qb.from_(gl)
+		.select(
+			gl.account,
+			gl.party_type,
+			gl.party,
+			(gl.debit - gl.credit).as_("balance"),
+			(gl.debit_in_account_currency - gl.credit_in_account_currency).as_("balance_in_account_currency"),
+			last_entry_rank(gl.account, gl.party_type, gl.party).as_("party_rank"),
+			last_entry_rank(gl.account).as_("account_rank"),
 		)
+		.where(Criterion.all(conditions))
+	).as_("entries")
+
+	# only the last entry of each account and party, or of each account
+	rank_condition = entries.party_rank == 1
+	if match_any_party:
+		rank_condition = (entries.account_rank == 1) | (
+			(entries.party_rank == 1) & entries.party.isin(parties or [""])
+		)
+
+	last_entries = {}
+	for entry in (
+		qb.from_(entries)
+		.select(
+			entries.account,
+			entries.party_type,
+			entries.party,
+			entries.balance,
+			entries.balance_in_account_currency,
+			entries.party_rank,
+			entries.account_rank,
+		)
+		.where(rank_condition)
+		.run(as_dict=True)
+	):
+		if entry.party_rank == 1 and (entry.party_type or entry.party):
+			last_entries[(entry.account, entry.party_type or None, entry.party or None)] = entry
+		if entry.account_rank == 1:
+			last_entries[(entry.account, None, None)] = entry
+
+	exchange_rates = {}
+	for d in account_details:
+		key = (d.account, d.party_type or None, d.party or None)
+		if entry := last_entries.get(key):
+			exchange_rates[key] = (
+				entry.balance / entry.balance_in_account_currency
+				if entry.balance_in_account_currency
+				else None
+			)
 
-	return last_exchange_rate
+	return exchange_rates
 
 
 @frappe.whitelist()
@@ -1,6 +1,7 @@
 # Copyright (c) 2018, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
@@ -88,6 +89,48 @@ class TestExchangeRateRevaluation(AccountsTestMixin, IntegrationTestCase):
 		)[0]
 		self.assertEqual(acc_balance.balance, 8500.0)
 
+	@IntegrationTestCase.change_settings(
+		"Accounts Settings",
+		{"allow_multi_currency_invoices_against_single_party_account": 1, "allow_stale": 0},
+	)
+	def test_01a_revaluation_of_many_parties(self):
+		customers = []
+		for i in range(5):
+			self.create_customer(f"_Test ERR Customer {i}")
+			customers.append(self.customer)
+
+			si = create_sales_invoice(
+				item=self.item,
+				company=self.company,
+				customer=self.customer,
+				debit_to=self.debtors_usd,
+				posting_date=today(),
+				parent_cost_center=self.cost_center,
+				cost_center=self.cost_center,
+				rate=100 * (i + 1),
+				price_list_rate=100 * (i + 1),
+				do_not_submit=1,
+			)
+			si.currency = "USD"
+			si.conversion_rate = 80
+			si.save().submit()
+
+		err = frappe.new_doc("Exchange Rate Revaluation")
+		err.company = self.company
+		err.posting_date = today()
+		with patch(
+			"erpnext.setup.utils.get_exchange_rate",
+			return_value=85,
+		) as get_exchange_rate:
+			accounts = err.get_accounts_data()
+
+		# the rate is fetched once for the currency
+		self.assertEqual(get_exchange_rate.call_count, 1)
+		self.assertEqual(sorted(x["party"] for x in accounts), customers)
+		for row in accounts:
+			self.assertEqual(row["new_exchange_rate"], 85)
+			self.assertEqual(row["gain_loss"], flt(row["balance_in_account_currency"] * 5))
+
 	@IntegrationTestCase.change_settings(
 		"Accounts Settings",
 		{"allow_multi_currency_invoices_against_single_party_account": 1, "allow_stale": 0},
@@ -263,6 +263,39 @@ class TestPaymentEntry(IntegrationTestCase):
 		self.assertEqual(flt(outstanding_amount), 100)
 		self.assertEqual(status, "Unpaid")
 
+	def test_payment_against_many_sales_invoices_to_check_status(self):
+		invoices = [create_sales_invoice(qty=1, rate=100) for i in range(10)]
+
+		pe = get_payment_entry("Sales Invoice", invoices[0].name)
+		for si in invoices[1:]:
+			pe.append(
+				"references",
+				{
+					"reference_doctype": "Sales Invoice",
+					"reference_name": si.name,
+					"total_amount": si.grand_total,
+					"outstanding_amount": si.outstanding_amount,
+					"allocated_amount": si.outstanding_amount,
+				},
+			)
+		# the last invoice is partly paid
+		pe.references[-1].allocated_amount = 40
+		pe.paid_amount = pe.received_amount = 940
+		pe.reference_no = "1"
+		pe.reference_date = nowdate()
+		pe.submit()
+
+		def get_outstanding_and_status():
+			return [
+				frappe.db.get_value("Sales Invoice", si.name, ["outstanding_amount", "status"])
+				for si in invoices
+			]
+
+		self.assertEqual(get_outstanding_and_status(), [(0, "Paid")] * 9 + [(60, "Partly Paid")])
+
+		pe.cancel()
+		self.assertEqual(get_outstanding_and_status(), [(100, "Unpaid")] * 10)
+
 	def test_payment_entry_against_payment_terms(self):
 		si = create_sales_invoice(do_not_save=1, qty=1, rate=200)
 		create_payment_terms_template()
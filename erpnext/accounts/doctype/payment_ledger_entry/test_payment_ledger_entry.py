@@ -8,7 +8,11 @@ from frappe.utils import nowdate
 
 from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
 from erpnext.accounts.doctype.payment_entry.test_payment_entry import create_payment_entry
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	get_summary_differences,
+)
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.utils import get_outstanding_invoices
 from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
 from erpnext.stock.doctype.item.test_item import create_item
 
@@ -170,6 +174,7 @@ class TestPaymentLedgerEntry(IntegrationTestCase):
 			"Purchase Invoice",
 			"Payment Entry",
 			"Journal Entry",
+			"Payment Ledger Outstanding",
 		]
 		for doctype in doctype_list:
 			qb.from_(qb.DocType(doctype)).delete().where(qb.DocType(doctype).company == self.company).run()
@@ -543,3 +548,36 @@ class TestPaymentLedgerEntry(IntegrationTestCase):
 		# with references removed, deletion should be possible
 		so.delete()
 		self.assertRaises(frappe.DoesNotExistError, frappe.get_doc, so.doctype, so.name)
+
+	def test_outstanding_summary(self):
+		invoices = [self.create_sales_invoice(qty=1, rate=100) for i in range(3)]
+
+		# partial payment, full payment, and an unallocated advance
+		pe = get_payment_entry(invoices[0].doctype, invoices[0].name)
+		pe.paid_amount = 40
+		pe.get("references")[0].allocated_amount = 40
+		pe.save().submit()
+		pe = get_payment_entry(invoices[1].doctype, invoices[1].name).save().submit()
+		self.create_payment_entry(amount=30).save().submit()
+
+		def get_outstanding():
+			return sorted(
+				(x.voucher_no, x.outstanding_amount)
+				for x in get_outstanding_invoices("Customer", self.customer, [self.debit_to])
+			)
+
+		def assert_summary_matches_ledger():
+			self.assertEqual(get_summary_differences(self.company), [])
+			frappe.db.set_single_value("Accounts Settings", "use_outstanding_summary", 0)
+			expected = get_outstanding()
+			frappe.db.set_single_value("Accounts Settings", "use_outstanding_summary", 1)
+			self.assertEqual(get_outstanding(), expected)
+			return expected
+
+		self.assertEqual(assert_summary_matches_ledger(), [(invoices[0].name, 60), (invoices[2].name, 100)])
+
+		pe.cancel()
+		self.assertEqual(
+			assert_summary_matches_ledger(),
+			[(invoices[0].name, 60), (invoices[1].name, 100), (invoices[2].name, 100)],
+		)
@@ -0,0 +1,157 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Criterion
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, now
+
+SUMMARY_KEY_FIELDS = [
+	"company",
+	"account_type",
+	"account",
+	"party_type",
+	"party",
+	"against_voucher_type",
+	"against_voucher_no",
+]
+
+
+class PaymentLedgerOutstanding(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_type: DF.Literal["Receivable", "Payable"]
+		against_voucher_no: DF.DynamicLink | None
+		against_voucher_type: DF.Link | None
+		amount: DF.Currency
+		amount_in_account_currency: DF.Currency
+		company: DF.Link | None
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def refresh_payment_ledger_outstanding(vouchers) -> None:
+	"""Recomputes the summary rows of the against vouchers from their Payment Ledger Entries.
+
+	vouchers - list of (against_voucher_type, against_voucher_no)
+	"""
+
+	vouchers = {(voucher_type, voucher_no) for voucher_type, voucher_no in vouchers if voucher_no}
+	if not vouchers:
+		return
+
+	voucher_types = {voucher[0] for voucher in vouchers}
+	voucher_nos = {voucher[1] for voucher in vouchers}
+
+	summary = frappe.qb.DocType("Payment Ledger Outstanding")
+	frappe.qb.from_(summary).delete().where(
+		summary.against_voucher_type.isin(voucher_types) & summary.against_voucher_no.isin(voucher_nos)
+	).run()
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	insert_summary_rows(
+		get_outstanding_from_ledger(
+			[ple.against_voucher_type.isin(voucher_types), ple.against_voucher_no.isin(voucher_nos)]
+		)
+	)
+
+
+def get_outstanding_from_ledger(filters: list) -> list[tuple]:
+	"Aggregates the Payment Ledger Entries into rows of the summary, keyed by `SUMMARY_KEY_FIELDS`"
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	key_fields = [ple[field] for field in SUMMARY_KEY_FIELDS]
+	return (
+		frappe.qb.from_(ple)
+		.select(*key_fields, Sum(ple.amount), Sum(ple.amount_in_account_currency))
+		.where((ple.delinked == 0) & Criterion.all(filters))
+		.groupby(*key_fields)
+		.run()
+	)
+
+
+def insert_summary_rows(rows: list[tuple]) -> None:
+	if not rows:
+		return
+
+	timestamp, user = now(), frappe.session.user
+	frappe.db.bulk_insert(
+		"Payment Ledger Outstanding",
+		fields=[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			*SUMMARY_KEY_FIELDS,
+			"amount",
+			"amount_in_account_currency",
+		],
+		values=[(frappe.generate_hash(length=10), timestamp, timestamp, user, user, *row) for row in rows],
+	)
+
+
+def rebuild_payment_ledger_outstanding(company: str | None = None) -> None:
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	for company in companies:
+		frappe.db.delete("Payment Ledger Outstanding", {"company": company})
+		insert_summary_rows(get_outstanding_from_ledger([ple.company == company]))
+
+
+def get_summary_differences(company: str) -> list[frappe._dict]:
+	"""Compares the summary of the company with the outstanding aggregated from the Payment Ledger,
+	and returns the rows which differ. The summary can be rebuilt with
+	`rebuild_payment_ledger_outstanding`."""
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	precision = frappe.get_precision("Payment Ledger Outstanding", "amount")
+	expected = {
+		tuple(row[:-2]): [flt(row[-2]), flt(row[-1])]
+		for row in get_outstanding_from_ledger([ple.company == company])
+	}
+
+	summary = frappe.qb.DocType("Payment Ledger Outstanding")
+	key_fields = [summary[field] for field in SUMMARY_KEY_FIELDS]
+	actual = {
+		tuple(row[:-2]): [flt(row[-2]), flt(row[-1])]
+		for row in (
+			frappe.qb.from_(summary)
+			.select(*key_fields, Sum(summary.amount), Sum(summary.amount_in_account_currency))
+			.where(summary.company == company)
+			.groupby(*key_fields)
+			.run()
+		)
+	}
+
+	differences = []
+	for key in expected.keys() | actual.keys():
+		amounts = actual.get(key, [0.0, 0.0])
+		computed = expected.get(key, [0.0, 0.0])
+		if any(flt(a - b, precision) for a, b in zip(amounts, computed, strict=True)):
+			differences.append(
+				frappe._dict(
+					dict(zip(SUMMARY_KEY_FIELDS, key, strict=True)),
+					amount=amounts[0],
+					amount_in_account_currency=amounts[1],
+					expected_amount=computed[0],
+					expected_amount_in_account_currency=computed[1],
+				)
+			)
+
+	return differences
+
+
+def on_doctype_update():
+	frappe.db.add_index("Payment Ledger Outstanding", ["against_voucher_no", "against_voucher_type"])
@@ -392,11 +392,12 @@ class PaymentReconciliation(Document):
 			inv.currency = entry.get("currency")
 			inv.outstanding_amount = flt(entry.get("outstanding_amount"))
 
-	def get_difference_amount(self, payment_entry, invoice, allocated_amount):
+	def get_difference_amount(self, payment_entry, invoice, allocated_amount, is_foreign_currency=None):
+		if is_foreign_currency is None:
+			is_foreign_currency = self.is_foreign_currency_account()
+
 		difference_amount = 0
-		if frappe.get_cached_value(
-			"Account", self.receivable_payable_account, "account_currency"
-		) != frappe.get_cached_value("Company", self.company, "default_currency"):
+		if is_foreign_currency:
 			if invoice.get("exchange_rate") and payment_entry.get("exchange_rate", 1) != invoice.get(
 				"exchange_rate", 1
 			):
@@ -406,6 +407,11 @@ class PaymentReconciliation(Document):
 
 		return difference_amount
 
+	def is_foreign_currency_account(self):
+		return frappe.get_cached_value(
+			"Account", self.receivable_payable_account, "account_currency"
+		) != frappe.get_cached_value("Company", self.company, "default_currency")
+
 	@frappe.whitelist()
 	def is_auto_process_enabled(self):
 		return frappe.db.get_single_value("Accounts Settings", "auto_reconcile_payments")
@@ -430,11 +436,20 @@ class PaymentReconciliation(Document):
 		default_exchange_gain_loss_account = frappe.get_cached_value(
 			"Company", self.company, "exchange_gain_loss_account"
 		)
+		is_foreign_currency = self.is_foreign_currency_account()
 
+		invoices = args.get("invoices")
 		entries = []
+		# invoices before this index are fully allocated, and would only get a zero allocation
+		first_open_invoice = 0
 		for pay in args.get("payments"):
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
+			if pay.get("amount") <= 0:
+				# such an amount is allocated to the first invoice, even if it is fully allocated
+				first_open_invoice = 0
+
+			for idx in range(first_open_invoice, len(invoices)):
+				inv = invoices[idx]
 				if pay.get("amount") >= inv.get("outstanding_amount"):
 					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
 					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
@@ -444,11 +459,16 @@ class PaymentReconciliation(Document):
 					inv["outstanding_amount"] = flt(inv.get("outstanding_amount")) - flt(pay.get("amount"))
 					pay["amount"] = 0
 
+				if inv.get("outstanding_amount") == 0:
+					first_open_invoice = idx + 1
+
 				inv["exchange_rate"] = invoice_exchange_map.get(inv.get("invoice_number"))
 				if pay.get("reference_type") in ["Sales Invoice", "Purchase Invoice"]:
 					pay["exchange_rate"] = invoice_exchange_map.get(pay.get("reference_name"))
 
-				res.difference_amount = self.get_difference_amount(pay, inv, res["allocated_amount"])
+				res.difference_amount = self.get_difference_amount(
+					pay, inv, res["allocated_amount"], is_foreign_currency
+				)
 				res.difference_account = default_exchange_gain_loss_account
 				res.exchange_rate = inv.get("exchange_rate")
 				res.update({"gain_loss_posting_date": pay.get("posting_date")})
@@ -488,6 +488,43 @@ class TestPaymentReconciliation(IntegrationTestCase):
 		self.assertEqual(len(pr.get("payments")), 0)
 		self.assertEqual(pr.get("invoices")[0].get("outstanding_amount"), 165)
 
+	def test_allocate_many_payments_against_many_invoices(self):
+		invoices = [self.create_sales_invoice(qty=1, rate=100) for _ in range(20)]
+		for _ in range(15):
+			self.create_payment_entry(amount=150).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.get_unreconciled_entries()
+		self.assertEqual(len(pr.invoices), 20)
+		self.assertEqual(len(pr.payments), 15)
+
+		pr.allocate_entries(
+			frappe._dict(
+				{
+					"invoices": [x.as_dict() for x in pr.invoices],
+					"payments": [x.as_dict() for x in pr.payments],
+				}
+			)
+		)
+
+		# each payment is allocated to the invoices in order, till the invoices are fully allocated
+		self.assertEqual(len(pr.allocation), 27)
+		allocated = {}
+		for row in pr.allocation:
+			self.assertGreater(row.allocated_amount, 0)
+			allocated[row.invoice_number] = allocated.get(row.invoice_number, 0) + row.allocated_amount
+		self.assertEqual(allocated, {si.name: 100 for si in invoices})
+
+		pr.reconcile()
+
+		for si in invoices:
+			si.reload()
+			self.assertEqual(si.outstanding_amount, 0)
+			self.assertEqual(si.status, "Paid")
+
+		self.assertEqual(pr.get("invoices"), [])
+		self.assertEqual(sum(x.amount for x in pr.get("payments")), 250)
+
 	def test_payment_against_journal(self):
 		transaction_date = nowdate()
 
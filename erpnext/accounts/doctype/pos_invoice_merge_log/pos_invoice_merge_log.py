@@ -6,6 +6,7 @@ import json
 
 import frappe
 from frappe import _
+from frappe.model import no_value_fields
 from frappe.model.document import Document
 from frappe.model.mapper import map_child_doc, map_doc
 from frappe.utils import cint, flt, get_time, getdate, nowdate, nowtime
@@ -170,6 +171,9 @@ class POSInvoiceMergeLog(Document):
 
 	def merge_pos_invoice_into(self, invoice, data):
 		items, payments, taxes = [], [], []
+		# rows of the consolidated invoice, keyed on what the rows of the next POS invoices are merged by
+		item_rows, tax_rows, payment_rows = {}, {}, {}
+		item_wise_tax_details = {}
 
 		loyalty_amount_sum, loyalty_points_sum = 0, 0
 
@@ -178,9 +182,9 @@ class POSInvoiceMergeLog(Document):
 
 		loyalty_amount_sum, loyalty_points_sum, idx = 0, 0, 1
 
-		for doc in data:
-			map_doc(doc, invoice, table_map={"doctype": invoice.doctype})
+		map_doc(get_merged_pos_invoice(data), invoice, table_map={"doctype": invoice.doctype})
 
+		for doc in data:
 			if doc.redeem_loyalty_points:
 				invoice.loyalty_redemption_account = doc.loyalty_redemption_account
 				invoice.loyalty_redemption_cost_center = doc.loyalty_redemption_cost_center
@@ -188,25 +192,13 @@ class POSInvoiceMergeLog(Document):
 				loyalty_amount_sum += doc.loyalty_amount
 
 			for item in doc.get("items"):
-				found = False
-				for i in items:
-					if (
-						i.item_code == item.item_code
-						and not i.serial_and_batch_bundle
-						and not i.serial_no
-						and not i.batch_no
-						and i.uom == item.uom
-						and i.net_rate == item.net_rate
-						and i.warehouse == item.warehouse
-					):
-						found = True
-						i.qty = i.qty + item.qty
-						i.amount = i.amount + item.net_amount
-						i.net_amount = i.amount
-						i.base_amount = i.base_amount + item.base_net_amount
-						i.base_net_amount = i.base_amount
-
-				if not found:
+				if i := item_rows.get(get_item_key(item)):
+					i.qty = i.qty + item.qty
+					i.amount = i.amount + item.net_amount
+					i.net_amount = i.amount
+					i.base_amount = i.base_amount + item.base_net_amount
+					i.base_net_amount = i.base_amount
+				else:
 					item.rate = item.net_rate
 					item.amount = item.net_amount
 					item.base_amount = item.base_net_amount
@@ -216,17 +208,21 @@ class POSInvoiceMergeLog(Document):
 						si_item.serial_and_batch_bundle = item.serial_and_batch_bundle
 					items.append(si_item)
 
+					# rows with serial nos or batches are never merged into
+					if not (si_item.serial_and_batch_bundle or si_item.serial_no or si_item.batch_no):
+						item_rows[get_item_key(si_item)] = si_item
+
 			for tax in doc.get("taxes"):
-				found = False
-				for t in taxes:
-					if t.account_head == tax.account_head and t.cost_center == tax.cost_center:
-						t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
-						t.base_tax_amount = flt(t.base_tax_amount) + flt(
-							tax.base_tax_amount_after_discount_amount
-						)
-						update_item_wise_tax_detail(t, tax)
-						found = True
-				if not found:
+				key = (tax.account_head, tax.cost_center)
+				if t := tax_rows.get(key):
+					t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
+					t.base_tax_amount = flt(t.base_tax_amount) + flt(
+						tax.base_tax_amount_after_discount_amount
+					)
+					if key not in item_wise_tax_details:
+						item_wise_tax_details[key] = json.loads(t.item_wise_tax_detail) or {}
+					merge_item_wise_tax_detail(item_wise_tax_details[key], tax)
+				else:
 					tax.charge_type = "Actual"
 					tax.idx = idx
 					idx += 1
@@ -235,22 +231,25 @@ class POSInvoiceMergeLog(Document):
 					tax.base_tax_amount = tax.base_tax_amount_after_discount_amount
 					tax.item_wise_tax_detail = tax.item_wise_tax_detail
 					taxes.append(tax)
+					tax_rows[key] = tax
 
 			for payment in doc.get("payments"):
-				found = False
-				for pay in payments:
-					if pay.account == payment.account and pay.mode_of_payment == payment.mode_of_payment:
-						pay.amount = flt(pay.amount) + flt(payment.amount)
-						pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
-						found = True
-				if not found:
+				key = (payment.account, payment.mode_of_payment)
+				if pay := payment_rows.get(key):
+					pay.amount = flt(pay.amount) + flt(payment.amount)
+					pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
+				else:
 					payments.append(payment)
+					payment_rows[key] = payment
 
 			rounding_adjustment += doc.rounding_adjustment
 			rounded_total += doc.rounded_total
 			base_rounding_adjustment += doc.base_rounding_adjustment
 			base_rounded_total += doc.base_rounded_total
 
+		for key, item_wise_tax_detail in item_wise_tax_details.items():
+			tax_rows[key].item_wise_tax_detail = json.dumps(item_wise_tax_detail)
+
 		if loyalty_points_sum:
 			invoice.redeem_loyalty_points = 1
 			invoice.loyalty_points = loyalty_points_sum
@@ -329,13 +328,43 @@ class POSInvoiceMergeLog(Document):
 			si.cancel()
 
 
+def get_merged_pos_invoice(pos_invoices):
+	"""
+	Returns a POS Invoice holding the last non-empty value of every field of the POS invoices,
+	which is what mapping each of them into the consolidated invoice in turn would leave behind
+	"""
+	last_invoice = pos_invoices[-1]
+	merged_invoice = frappe.get_doc({"doctype": last_invoice.doctype, "name": last_invoice.name})
+
+	for df in merged_invoice.meta.get("fields"):
+		if df.fieldtype in no_value_fields:
+			continue
+
+		for doc in reversed(pos_invoices):
+			if doc.get(df.fieldname) not in (None, ""):
+				merged_invoice.set(df.fieldname, doc.get(df.fieldname))
+				break
+
+	return merged_invoice
+
+
+def get_item_key(item):
+	return (item.item_code, item.uom, item.net_rate, item.warehouse)
+
+
 def update_item_wise_tax_detail(consolidate_tax_row, tax_row):
 	consolidated_tax_detail = json.loads(consolidate_tax_row.item_wise_tax_detail)
-	tax_row_detail = json.loads(tax_row.item_wise_tax_detail)
 
 	if not consolidated_tax_detail:
 		consolidated_tax_detail = {}
 
+	merge_item_wise_tax_detail(consolidated_tax_detail, tax_row)
+	consolidate_tax_row.item_wise_tax_detail = json.dumps(consolidated_tax_detail)
+
+
+def merge_item_wise_tax_detail(consolidated_tax_detail, tax_row):
+	tax_row_detail = json.loads(tax_row.item_wise_tax_detail)
+
 	for item_code, tax_data in tax_row_detail.items():
 		tax_data = ItemWiseTaxDetail(**tax_data)
 		if consolidated_tax_detail.get(item_code):
@@ -344,8 +373,6 @@ def update_item_wise_tax_detail(consolidate_tax_row, tax_row):
 		else:
 			consolidated_tax_detail.update({item_code: tax_data})
 
-	consolidate_tax_row.item_wise_tax_detail = json.dumps(consolidated_tax_detail)
-
 
 def get_all_unconsolidated_invoices():
 	filters = {
@@ -404,6 +404,76 @@ class TestPOSInvoiceMergeLog(IntegrationTestCase):
 			frappe.db.sql("delete from `tabPOS Profile`")
 			frappe.db.sql("delete from `tabPOS Invoice`")
 
+	def test_consolidation_of_repeated_rows(self):
+		"""
+		Test if the items, taxes and payments repeated across POS Invoices are merged into one row each
+		"""
+		frappe.db.sql("delete from `tabPOS Invoice`")
+
+		try:
+			for item_code in ("_Test Item", "_Test Item 2"):
+				make_stock_entry(to_warehouse="_Test Warehouse - _TC", item_code=item_code, rate=50, qty=10)
+
+			init_user_and_profile()
+
+			invoices = []
+			for i in range(6):
+				inv = create_pos_invoice(qty=1, rate=100, do_not_save=True)
+				inv.get("items")[0].item_code = "_Test Item 2" if i % 2 else "_Test Item"
+				inv.append(
+					"taxes",
+					{
+						"account_head": "_Test Account VAT - _TC",
+						"charge_type": "On Net Total",
+						"cost_center": "_Test Cost Center - _TC",
+						"description": "VAT",
+						"doctype": "Sales Taxes and Charges",
+						"rate": 10,
+					},
+				)
+				if i % 2:
+					inv.append(
+						"payments",
+						{"mode_of_payment": "Bank Draft", "account": "_Test Bank - _TC", "amount": 110},
+					)
+				else:
+					inv.append(
+						"payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": 110}
+					)
+				inv.insert()
+				inv.submit()
+				invoices.append(inv)
+
+			consolidate_pos_invoices()
+
+			invoices[0].load_from_db()
+			consolidated_invoice = frappe.get_doc("Sales Invoice", invoices[0].consolidated_invoice)
+
+			self.assertEqual(
+				[(d.item_code, d.qty, d.amount) for d in consolidated_invoice.items],
+				[("_Test Item", 3, 300), ("_Test Item 2", 3, 300)],
+			)
+
+			self.assertEqual(len(consolidated_invoice.taxes), 1)
+			self.assertEqual(consolidated_invoice.taxes[0].tax_amount, 60)
+			self.assertEqual(
+				json.loads(consolidated_invoice.taxes[0].item_wise_tax_detail),
+				{
+					"_Test Item": {"tax_rate": 10, "tax_amount": 30, "net_amount": 300},
+					"_Test Item 2": {"tax_rate": 10, "tax_amount": 30, "net_amount": 300},
+				},
+			)
+
+			self.assertEqual(
+				sorted((d.mode_of_payment, d.amount) for d in consolidated_invoice.payments),
+				[("Bank Draft", 330), ("Cash", 330)],
+			)
+
+		finally:
+			frappe.set_user("Administrator")
+			frappe.db.sql("delete from `tabPOS Profile`")
+			frappe.db.sql("delete from `tabPOS Invoice`")
+
 	def test_serial_no_case_1(self):
 		"""
 		Create a POS Invoice with serial no
@@ -5,8 +5,9 @@ import json
 
 import frappe
 from frappe import _, qb
+from frappe.model import no_value_fields
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form
+from frappe.utils import get_link_to_form, now
 from frappe.utils.scheduler import is_scheduler_inactive
 
 
@@ -340,8 +341,6 @@ def fetch_and_allocate(doc: str) -> None:
 		log = frappe.db.get_value("Process Payment Reconciliation Log", filters={"process_pr": doc})
 		if log:
 			if not frappe.db.get_value("Process Payment Reconciliation Log", log, "allocated"):
-				reconcile_log = frappe.get_doc("Process Payment Reconciliation Log", log)
-
 				pr = get_pr_instance(doc)
 				pr.get_unreconciled_entries()
 
@@ -349,23 +348,19 @@ def fetch_and_allocate(doc: str) -> None:
 					invoices = [x.as_dict() for x in pr.invoices]
 					payments = [x.as_dict() for x in pr.payments]
 					pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
-
-					for x in pr.get("allocation"):
-						reconcile_log.append(
-							"allocations",
-							x.as_dict().update(
-								{
-									"parenttype": "Process Payment Reconciliation Log",
-									"parent": reconcile_log.name,
-									"name": None,
-									"reconciled": False,
-								}
-							),
-						)
-				reconcile_log.allocated = True
-				reconcile_log.total_allocations = len(reconcile_log.get("allocations"))
-				reconcile_log.reconciled_entries = 0
-				reconcile_log.save()
+					insert_log_allocations(log, pr.get("allocation"))
+
+				frappe.db.set_value(
+					"Process Payment Reconciliation Log",
+					log,
+					{
+						"allocated": True,
+						"total_allocations": frappe.db.count(
+							"Process Payment Reconciliation Log Allocations", {"parent": log}
+						),
+						"reconciled_entries": 0,
+					},
+				)
 
 				# generate reconcile job name
 				allocation = get_next_allocation(log)
@@ -388,6 +383,53 @@ def fetch_and_allocate(doc: str) -> None:
 					)
 
 
+def insert_log_allocations(log: str, allocations: list) -> None:
+	"Add the allocations to the log in a single query, instead of saving the log with a row each"
+	if not allocations:
+		return
+
+	doctype = "Process Payment Reconciliation Log Allocations"
+	fields = [df.fieldname for df in frappe.get_meta(doctype).fields if df.fieldtype not in no_value_fields]
+	idx = frappe.db.count(doctype, {"parent": log})
+	timestamp, user = now(), frappe.session.user
+
+	values = []
+	for allocation in allocations:
+		idx += 1
+		allocation = frappe._dict(allocation.as_dict(), reconciled=False)
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				log,
+				"Process Payment Reconciliation Log",
+				"allocations",
+				idx,
+				*(allocation.get(field) for field in fields),
+			)
+		)
+
+	frappe.db.bulk_insert(
+		doctype,
+		fields=[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"parent",
+			"parenttype",
+			"parentfield",
+			"idx",
+			*fields,
+		],
+		values=values,
+	)
+
+
 def reconcile(doc: None | str = None) -> None:
 	if doc:
 		log = frappe.db.get_value("Process Payment Reconciliation Log", filters={"process_pr": doc})
@@ -9,6 +9,9 @@ from frappe.query_builder import Criterion
 from frappe.query_builder.functions import Abs, Sum
 from frappe.utils import cint, flt, getdate
 
+from erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger import (
+	get_tax_deducted as get_tax_deducted_from_ledger,
+)
 from erpnext.controllers.accounts_controller import validate_account_head
 
 
@@ -265,32 +268,38 @@ def get_lower_deduction_certificate(company, tax_details, pan_no):
 
 
 def get_tax_amount(party_type, parties, inv, tax_details, posting_date, pan_no=None):
-	vouchers, voucher_wise_amount = get_invoice_vouchers(
-		parties, tax_details, inv.company, party_type=party_type
-	)
+	vouchers, voucher_wise_amount, advance_vouchers = [], {}, []
 
-	payment_entry_vouchers = get_payment_entry_vouchers(
-		parties, tax_details, inv.company, party_type=party_type
-	)
+	# once tax is deducted in the period, the tax amount no longer depends on the previous vouchers,
+	# so they are only scanned till the ledger has a deduction
+	tax_deducted = get_tax_deducted_from_ledger(party_type, parties, inv.company, tax_details)
 
-	advance_vouchers = get_advance_vouchers(
-		parties,
-		company=inv.company,
-		from_date=tax_details.from_date,
-		to_date=tax_details.to_date,
-		party_type=party_type,
-	)
+	if not tax_deducted:
+		vouchers, voucher_wise_amount = get_invoice_vouchers(
+			parties, tax_details, inv.company, party_type=party_type
+		)
+
+		payment_entry_vouchers = get_payment_entry_vouchers(
+			parties, tax_details, inv.company, party_type=party_type
+		)
+
+		advance_vouchers = get_advance_vouchers(
+			parties,
+			company=inv.company,
+			from_date=tax_details.from_date,
+			to_date=tax_details.to_date,
+			party_type=party_type,
+		)
+
+		taxable_vouchers = vouchers + advance_vouchers + payment_entry_vouchers
+		if taxable_vouchers:
+			tax_deducted = get_deducted_tax(taxable_vouchers, tax_details)
 
-	taxable_vouchers = vouchers + advance_vouchers + payment_entry_vouchers
 	tax_deducted_on_advances = 0
 
 	if inv.doctype == "Purchase Invoice":
 		tax_deducted_on_advances = get_taxes_deducted_on_advances_allocated(inv, tax_details)
 
-	tax_deducted = 0
-	if taxable_vouchers:
-		tax_deducted = get_deducted_tax(taxable_vouchers, tax_details)
-
 	# If advance is outside the current tax withholding period (usually a fiscal year), `get_deducted_tax` won't fetch it.
 	# updating `tax_deducted` with correct advance tax value (from current and previous previous withholding periods), will allow the
 	# rest of the below logic to function properly
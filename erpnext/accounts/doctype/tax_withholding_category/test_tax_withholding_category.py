@@ -10,6 +10,15 @@ from frappe.tests import IntegrationTestCase, UnitTestCase
 from frappe.utils import add_days, today
 
 from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
+from erpnext.accounts.doctype.tax_withholding_category.tax_withholding_category import (
+	get_tax_withholding_details,
+)
+from erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger import (
+	get_ledger_differences,
+)
+from erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger import (
+	get_tax_deducted as get_tax_deducted_from_ledger,
+)
 from erpnext.accounts.utils import get_fiscal_year
 from erpnext.buying.doctype.purchase_order.purchase_order import make_purchase_invoice
 
@@ -71,6 +80,54 @@ class TestTaxWithholdingCategory(IntegrationTestCase):
 		for d in reversed(invoices):
 			d.cancel()
 
+	def test_tax_withholding_ledger(self):
+		frappe.db.set_value(
+			"Supplier", "Test TDS Supplier", "tax_withholding_category", "Cumulative Threshold TDS"
+		)
+		tax_details = get_tax_withholding_details("Cumulative Threshold TDS", today(), "_Test Company")
+
+		def get_ledger():
+			return frappe.get_all(
+				"Tax Withholding Ledger",
+				filters={"party": "Test TDS Supplier", "company": "_Test Company"},
+				fields=["sum(taxable_amount) as taxable_amount", "sum(tax_deducted) as tax_deducted"],
+			)[0]
+
+		invoices = []
+		for _ in range(3):
+			pi = create_purchase_invoice(supplier="Test TDS Supplier")
+			pi.submit()
+			invoices.append(pi)
+
+		# the last invoice crosses the cumulative threshold
+		ledger = get_ledger()
+		self.assertEqual(ledger.taxable_amount, 30000)
+		self.assertEqual(ledger.tax_deducted, 3000)
+		self.assertEqual(
+			get_tax_deducted_from_ledger("Supplier", ["Test TDS Supplier"], "_Test Company", tax_details),
+			3000,
+		)
+
+		# the ledger matches the amounts computed from the invoices
+		differences = get_ledger_differences("_Test Company")
+		self.assertFalse([d for d in differences if d.party == "Test TDS Supplier"])
+
+		# tax is deducted on the net total once the ledger has a deduction
+		pi = create_purchase_invoice(supplier="Test TDS Supplier", rate=5000)
+		self.assertEqual(pi.taxes_and_charges_deducted, 500)
+
+		invoices[-1].cancel()
+		ledger = get_ledger()
+		self.assertEqual(ledger.taxable_amount, 20000)
+		self.assertEqual(ledger.tax_deducted, 0)
+
+		# back under the threshold, as the invoice deducting the tax is cancelled
+		pi = create_purchase_invoice(supplier="Test TDS Supplier", rate=5000)
+		self.assertEqual(pi.taxes_and_charges_deducted, 0)
+
+		for d in reversed(invoices[:-1]):
+			d.cancel()
+
 	def test_single_threshold_tds(self):
 		invoices = []
 		frappe.db.set_value(
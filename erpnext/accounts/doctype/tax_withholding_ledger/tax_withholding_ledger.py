@@ -0,0 +1,413 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, getdate, now
+
+LEDGER_KEY_FIELDS = [
+	"party_type",
+	"party",
+	"tax_withholding_category",
+	"account",
+	"from_date",
+	"to_date",
+]
+
+
+class TaxWithholdingLedger(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link
+		company: DF.Link
+		from_date: DF.Date
+		party: DF.DynamicLink
+		party_type: DF.Link
+		tax_deducted: DF.Currency
+		tax_withholding_category: DF.Link
+		taxable_amount: DF.Currency
+		to_date: DF.Date
+	# end: auto-generated types
+
+	pass
+
+
+def get_tax_deducted(party_type: str, parties: list[str], company: str, tax_details) -> float:
+	"""Returns the tax withheld from the parties in the period of `tax_details`, as per the ledger.
+
+	The ledger only has vouchers which `get_tax_amount` also considers when it scans the history
+	of the parties, so a non zero amount means that tax is already deducted in the period.
+	"""
+
+	ledger = frappe.qb.DocType("Tax Withholding Ledger")
+	tax_deducted = (
+		frappe.qb.from_(ledger)
+		.select(Sum(ledger.tax_deducted))
+		.where(
+			(ledger.company == company)
+			& (ledger.party_type == party_type)
+			& (ledger.party.isin(parties))
+			& (ledger.tax_withholding_category == tax_details.tax_withholding_category)
+			& (ledger.account == tax_details.account_head)
+			& (ledger.from_date == tax_details.from_date)
+			& (ledger.to_date == tax_details.to_date)
+		)
+		.run()
+	)[0][0]
+
+	return flt(tax_deducted, frappe.get_precision("Tax Withholding Ledger", "tax_deducted"))
+
+
+def update_tax_withholding_ledger(doc, method=None):
+	"Add the voucher to the ledger on submit and remove it on cancel, or when marked as opening"
+
+	if method == "on_update_after_submit":
+		if not doc.has_value_changed("is_opening"):
+			return
+
+		sign = -1 if doc.is_opening == "Yes" else 1
+	elif doc.doctype != "Payment Entry" and doc.get("is_opening") == "Yes":
+		return
+	else:
+		sign = -1 if method == "before_cancel" else 1
+
+	for voucher in get_voucher_parties(doc):
+		period = get_ledger_period(voucher.category, doc.company, doc.posting_date)
+		if not period:
+			continue
+
+		account, from_date, to_date = period
+		tax_deducted = frappe.db.get_value(
+			"GL Entry",
+			{
+				"voucher_type": doc.doctype,
+				"voucher_no": doc.name,
+				"account": account,
+				"is_cancelled": 0,
+				"credit": [">", 0],
+			},
+			"sum(credit)",
+		)
+
+		add_to_ledger(
+			doc.company,
+			(voucher.party_type, voucher.party, voucher.category, account, from_date, to_date),
+			sign * flt(voucher.taxable_amount),
+			sign * flt(tax_deducted),
+		)
+
+
+def get_voucher_parties(doc) -> list[frappe._dict]:
+	"""Returns the parties of the voucher with their taxable amount, and the Tax Withholding Category
+	for which the voucher is considered, as per the filters of `get_invoice_vouchers` and
+	`get_payment_entry_vouchers`."""
+
+	def voucher(party_type, party, category, taxable_amount=0.0):
+		return frappe._dict(
+			party_type=party_type, party=party, category=category, taxable_amount=taxable_amount
+		)
+
+	if doc.doctype == "Purchase Invoice":
+		if doc.apply_tds and doc.tax_withholding_category:
+			return [
+				voucher(
+					"Supplier", doc.supplier, doc.tax_withholding_category, doc.base_tax_withholding_net_total
+				)
+			]
+
+	elif doc.doctype == "Sales Invoice":
+		# invoices of a customer are considered for its category, whichever it is
+		category = frappe.db.get_value("Customer", doc.customer, "tax_withholding_category")
+		if category:
+			return [voucher("Customer", doc.customer, category, doc.base_net_total)]
+
+	elif doc.doctype == "Journal Entry":
+		if doc.apply_tds and doc.tax_withholding_category:
+			parties = {}
+			for row in doc.accounts:
+				if row.party_type and row.party:
+					key = (row.party_type, row.party)
+					parties[key] = parties.get(key, 0.0) + flt(row.credit) - flt(row.debit)
+
+			return [
+				voucher(party_type, party, doc.tax_withholding_category, amount)
+				for (party_type, party), amount in parties.items()
+			]
+
+	elif doc.doctype == "Payment Entry":
+		# the unallocated amount of payments changes on reconciliation, so it is not kept in the ledger
+		if doc.apply_tax_withholding_amount and doc.tax_withholding_category and doc.party:
+			return [voucher(doc.party_type, doc.party, doc.tax_withholding_category)]
+
+	return []
+
+
+def get_ledger_period(category: str, company: str, posting_date):
+	"Returns the withholding account of the company and the period of the rate for the posting date"
+
+	tax_withholding = frappe.get_cached_doc("Tax Withholding Category", category)
+	account = next((d.account for d in tax_withholding.accounts if d.company == company), None)
+	if not account:
+		return
+
+	posting_date = getdate(posting_date)
+	for rate in tax_withholding.rates:
+		if getdate(rate.from_date) <= posting_date <= getdate(rate.to_date):
+			return account, getdate(rate.from_date), getdate(rate.to_date)
+
+
+def add_to_ledger(company: str, key: tuple, taxable_amount: float, tax_deducted: float) -> None:
+	filters = dict(zip(LEDGER_KEY_FIELDS, key, strict=True), company=company)
+
+	name = frappe.db.get_value("Tax Withholding Ledger", filters)
+	if not name:
+		frappe.get_doc(
+			doctype="Tax Withholding Ledger",
+			taxable_amount=taxable_amount,
+			tax_deducted=tax_deducted,
+			**filters,
+		).insert(ignore_permissions=True)
+		return
+
+	ledger = frappe.qb.DocType("Tax Withholding Ledger")
+	(
+		frappe.qb.update(ledger)
+		.set(ledger.taxable_amount, ledger.taxable_amount + taxable_amount)
+		.set(ledger.tax_deducted, ledger.tax_deducted + tax_deducted)
+		.set(ledger.modified, now())
+		.where(ledger.name == name)
+		.run()
+	)
+
+
+def build_tax_withholding_ledger(company: str) -> dict[tuple, list[float]]:
+	"Computes the ledger of the company afresh from the submitted vouchers and their GL Entries"
+
+	accounts = frappe.get_all(
+		"Tax Withholding Account",
+		filters={"company": company, "parenttype": "Tax Withholding Category"},
+		pluck="account",
+		distinct=True,
+	)
+	if not accounts:
+		return {}
+
+	gle = frappe.qb.DocType("GL Entry")
+	credits = {
+		(row.voucher_no, row.account): flt(row.credit)
+		for row in (
+			frappe.qb.from_(gle)
+			.select(gle.voucher_no, gle.account, Sum(gle.credit).as_("credit"))
+			.where(
+				(gle.company == company)
+				& (gle.is_cancelled == 0)
+				& (gle.credit > 0)
+				& (gle.account.isin(accounts))
+			)
+			.groupby(gle.voucher_no, gle.account)
+			.run(as_dict=True)
+		)
+	}
+
+	ledger = {}
+	for voucher in get_ledger_vouchers(company):
+		period = get_ledger_period(voucher.category, company, voucher.posting_date)
+		if not period:
+			continue
+
+		account, from_date, to_date = period
+		amounts = ledger.setdefault(
+			(voucher.party_type, voucher.party, voucher.category, account, from_date, to_date), [0.0, 0.0]
+		)
+		amounts[0] += flt(voucher.taxable_amount)
+		amounts[1] += credits.get((voucher.voucher_no, account), 0.0)
+
+	return ledger
+
+
+def get_ledger_vouchers(company: str) -> list[frappe._dict]:
+	"Returns the submitted vouchers of the company with a row per party, as `get_voucher_parties` does"
+
+	invoices = frappe.get_all(
+		"Purchase Invoice",
+		filters={
+			"company": company,
+			"docstatus": 1,
+			"is_opening": "No",
+			"apply_tds": 1,
+			"tax_withholding_category": ["is", "set"],
+		},
+		fields=[
+			"name as voucher_no",
+			"posting_date",
+			"supplier as party",
+			"tax_withholding_category as category",
+			"base_tax_withholding_net_total as taxable_amount",
+		],
+	)
+
+	for invoice in invoices:
+		invoice.party_type = "Supplier"
+
+	sinv = frappe.qb.DocType("Sales Invoice")
+	customer = frappe.qb.DocType("Customer")
+	sales_invoices = (
+		frappe.qb.from_(sinv)
+		.inner_join(customer)
+		.on(customer.name == sinv.customer)
+		.select(
+			sinv.name.as_("voucher_no"),
+			sinv.posting_date,
+			sinv.customer.as_("party"),
+			customer.tax_withholding_category.as_("category"),
+			sinv.base_net_total.as_("taxable_amount"),
+		)
+		.where(
+			(sinv.company == company)
+			& (sinv.docstatus == 1)
+			& (sinv.is_opening == "No")
+			& (customer.tax_withholding_category.isnotnull())
+			& (customer.tax_withholding_category != "")
+		)
+		.run(as_dict=True)
+	)
+	for invoice in sales_invoices:
+		invoice.party_type = "Customer"
+
+	vouchers = invoices + sales_invoices
+
+	journal = frappe.qb.DocType("Journal Entry")
+	account = frappe.qb.DocType("Journal Entry Account")
+	vouchers += (
+		frappe.qb.from_(journal)
+		.inner_join(account)
+		.on(account.parent == journal.name)
+		.select(
+			journal.name.as_("voucher_no"),
+			journal.posting_date,
+			account.party_type,
+			account.party,
+			journal.tax_withholding_category.as_("category"),
+			Sum(account.credit - account.debit).as_("taxable_amount"),
+		)
+		.where(
+			(journal.company == company)
+			& (journal.docstatus == 1)
+			& (journal.is_opening == "No")
+			& (journal.apply_tds == 1)
+			& (journal.tax_withholding_category.isnotnull())
+			& (journal.tax_withholding_category != "")
+			& (account.party_type.isnotnull())
+			& (account.party_type != "")
+			& (account.party.isnotnull())
+			& (account.party != "")
+		)
+		.groupby(
+			journal.name,
+			journal.posting_date,
+			journal.tax_withholding_category,
+			account.party_type,
+			account.party,
+		)
+		.run(as_dict=True)
+	)
+
+	vouchers += frappe.get_all(
+		"Payment Entry",
+		filters={
+			"company": company,
+			"docstatus": 1,
+			"apply_tax_withholding_amount": 1,
+			"tax_withholding_category": ["is", "set"],
+			"party": ["is", "set"],
+		},
+		fields=[
+			"name as voucher_no",
+			"posting_date",
+			"party_type",
+			"party",
+			"tax_withholding_category as category",
+		],
+	)
+
+	return vouchers
+
+
+def rebuild_tax_withholding_ledger(company: str | None = None) -> None:
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	for company in companies:
+		frappe.db.delete("Tax Withholding Ledger", {"company": company})
+
+		timestamp, user = now(), frappe.session.user
+		values = [
+			(frappe.generate_hash(length=10), timestamp, timestamp, user, user, company, *key, *amounts)
+			for key, amounts in build_tax_withholding_ledger(company).items()
+		]
+
+		frappe.db.bulk_insert(
+			"Tax Withholding Ledger",
+			fields=[
+				"name",
+				"creation",
+				"modified",
+				"owner",
+				"modified_by",
+				"company",
+				*LEDGER_KEY_FIELDS,
+				"taxable_amount",
+				"tax_deducted",
+			],
+			values=values,
+		)
+
+
+def get_ledger_differences(company: str) -> list[frappe._dict]:
+	"""Compares the ledger of the company with the amounts computed afresh from the vouchers, and
+	returns the rows which differ. The ledger can be rebuilt with `rebuild_tax_withholding_ledger`."""
+
+	precision = frappe.get_precision("Tax Withholding Ledger", "tax_deducted")
+	expected = build_tax_withholding_ledger(company)
+	actual = {
+		tuple(row[field] for field in LEDGER_KEY_FIELDS): [flt(row.taxable_amount), flt(row.tax_deducted)]
+		for row in frappe.get_all(
+			"Tax Withholding Ledger",
+			filters={"company": company},
+			fields=[
+				*LEDGER_KEY_FIELDS,
+				"sum(taxable_amount) as taxable_amount",
+				"sum(tax_deducted) as tax_deducted",
+			],
+			group_by=", ".join(LEDGER_KEY_FIELDS),
+		)
+	}
+
+	differences = []
+	for key in expected.keys() | actual.keys():
+		ledger = actual.get(key, [0.0, 0.0])
+		computed = expected.get(key, [0.0, 0.0])
+		if any(flt(a - b, precision) for a, b in zip(ledger, computed, strict=True)):
+			differences.append(
+				frappe._dict(
+					dict(zip(LEDGER_KEY_FIELDS, key, strict=True)),
+					company=company,
+					taxable_amount=ledger[0],
+					expected_taxable_amount=computed[0],
+					tax_deducted=ledger[1],
+					expected_tax_deducted=computed[1],
+				)
+			)
+
+	return differences
+
+
+def on_doctype_update():
+	frappe.db.add_index(
+		"Tax Withholding Ledger", ["party", "tax_withholding_category", "from_date", "company"]
+	)
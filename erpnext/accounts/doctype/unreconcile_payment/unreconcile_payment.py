@@ -13,7 +13,7 @@ from frappe.utils.data import comma_and
 from erpnext.accounts.utils import (
 	cancel_exchange_gain_loss_journal,
 	unlink_ref_doc_from_payment_entries,
-	update_voucher_outstanding,
+	update_voucher_outstandings,
 )
 
 
@@ -77,12 +77,13 @@ class UnreconcilePayment(Document):
 
 	def on_submit(self):
 		# todo: more granular unreconciliation
+		vouchers = []
 		for alloc in self.allocations:
 			doc = frappe.get_doc(alloc.reference_doctype, alloc.reference_name)
 			unlink_ref_doc_from_payment_entries(doc, self.voucher_no)
 			cancel_exchange_gain_loss_journal(doc, self.voucher_type, self.voucher_no)
-			update_voucher_outstanding(
-				alloc.reference_doctype, alloc.reference_name, alloc.account, alloc.party_type, alloc.party
+			vouchers.append(
+				(alloc.reference_doctype, alloc.reference_name, alloc.account, alloc.party_type, alloc.party)
 			)
 			if doc.doctype in frappe.get_hooks("advance_payment_payable_doctypes") + frappe.get_hooks(
 				"advance_payment_receivable_doctypes"
@@ -91,6 +92,8 @@ class UnreconcilePayment(Document):
 
 			frappe.db.set_value("Unreconcile Payment Entries", alloc.name, "unlinked", True)
 
+		update_voucher_outstandings(vouchers)
+
 
 @frappe.whitelist()
 def doc_has_references(doctype: str | None = None, docname: str | None = None):
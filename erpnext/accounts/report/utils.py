@@ -13,8 +13,6 @@ from erpnext.accounts.doctype.fiscal_year.fiscal_year import get_from_and_to_dat
 from erpnext.accounts.party import get_party_account
 from erpnext.setup.utils import get_exchange_rate
 
-__exchange_rates = {}
-
 
 def get_currency(filters):
 	"""
@@ -70,20 +68,15 @@ def get_rate_as_at(date, from_currency, to_currency):
 	"""
 	Gets exchange rate as at `date` for `from_currency` - `to_currency` exchange rate.
 	This calls `get_exchange_rate` so that we can get the correct exchange rate as per
-	the user's Accounts Settings.
-	It is made efficient by memoising results to `__exchange_rates`
+	the user's Accounts Settings. Currency Exchange records are looked up from the cached
+	index of `get_exchange_rate`, which is cleared when they change.
 	:param date: exchange rate as at this date
 	:param from_currency: Base currency
 	:param to_currency: Quote currency
 	:return: Retrieved exchange rate
 	"""
 
-	rate = __exchange_rates.get(f"{from_currency}-{to_currency}@{date}")
-	if not rate:
-		rate = get_exchange_rate(from_currency, to_currency, date) or 1
-		__exchange_rates[f"{from_currency}-{to_currency}@{date}"] = rate
-
-	return rate
+	return get_exchange_rate(from_currency, to_currency, date) or 1
 
 
 def convert_to_presentation_currency(gl_entries, currency_info):
@@ -99,6 +92,7 @@ def convert_to_presentation_currency(gl_entries, currency_info):
 	company_currency = currency_info["company_currency"]
 
 	account_currencies = list(set(entry["account_currency"] for entry in gl_entries))
+	rate = None
 
 	for entry in gl_entries:
 		debit = flt(entry["debit"])
@@ -111,9 +105,10 @@ def convert_to_presentation_currency(gl_entries, currency_info):
 			entry["debit"] = debit_in_account_currency
 			entry["credit"] = credit_in_account_currency
 		else:
-			date = currency_info["report_date"]
-			converted_debit_value = convert(debit, presentation_currency, company_currency, date)
-			converted_credit_value = convert(credit, presentation_currency, company_currency, date)
+			if rate is None:
+				rate = get_rate_as_at(currency_info["report_date"], presentation_currency, company_currency)
+			converted_debit_value = debit / rate
+			converted_credit_value = credit / rate
 
 			if entry.get("debit"):
 				entry["debit"] = converted_debit_value
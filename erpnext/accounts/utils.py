@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from collections import defaultdict
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -33,6 +34,10 @@ import erpnext
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	SUMMARY_KEY_FIELDS,
+	refresh_payment_ledger_outstanding,
+)
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
 
@@ -497,8 +502,25 @@ def reconcile_against_document(
 		else:
 			_delete_pl_entries(voucher_type, voucher_no)
 
+		# the Payment Entry is saved only after all its references are updated, so entries
+		# checking it for the same unreconciled amount need a single query
+		checked_entries = set()
 		for entry in entries:
-			check_if_advance_entry_modified(entry)
+			if voucher_type == "Journal Entry":
+				check_if_advance_entry_modified(entry)
+			else:
+				key = (
+					entry.voucher_detail_no,
+					flt(entry.unreconciled_amount or entry.unadjusted_amount),
+					entry.party_type,
+					entry.party,
+				)
+				if key not in checked_entries:
+					check_if_advance_entry_modified(entry)
+					checked_entries.add(key)
+				elif not entry.get("unreconciled_amount"):
+					entry.update({"unreconciled_amount": entry.get("unadjusted_amount")})
+
 			validate_allocated_amount(entry)
 
 			dimensions_dict = _build_dimensions_dict_for_exc_gain_loss(entry, active_dimensions)
@@ -541,17 +563,21 @@ def reconcile_against_document(
 			from erpnext.accounts.general_ledger import process_debit_credit_difference
 
 			process_debit_credit_difference(gl_map)
-			create_payment_ledger_entry(gl_map, update_outstanding="No", cancel=0, adv_adj=1)
+			create_payment_ledger_entries_in_bulk(gl_map, adv_adj=1)
 
 		# Only update outstanding for newly linked vouchers
-		for entry in entries:
-			update_voucher_outstanding(
-				entry.against_voucher_type,
-				entry.against_voucher,
-				entry.account,
-				entry.party_type,
-				entry.party,
-			)
+		update_voucher_outstandings(
+			[
+				(
+					entry.against_voucher_type,
+					entry.against_voucher,
+					entry.account,
+					entry.party_type,
+					entry.party,
+				)
+				for entry in entries
+			]
+		)
 		# update advance paid in Advance Receivable/Payable doctypes
 		if update_advance_paid:
 			for t, n in update_advance_paid:
@@ -920,6 +946,18 @@ def update_accounting_ledgers_after_reference_removal(
 
 	# Payment Ledger
 	ple = qb.DocType("Payment Ledger Entry")
+	payments = (
+		qb.from_(ple)
+		.select(ple.voucher_type, ple.voucher_no)
+		.distinct()
+		.where(
+			(ple.against_voucher_type == ref_type) & (ple.against_voucher_no == ref_no) & (ple.delinked == 0)
+		)
+	)
+	if payment_name:
+		payments = payments.where(ple.voucher_no == payment_name)
+	payments = payments.run()
+
 	ple_update_query = (
 		qb.update(ple)
 		.set(ple.against_voucher_type, ple.voucher_type)
@@ -935,6 +973,8 @@ def update_accounting_ledgers_after_reference_removal(
 		ple_update_query = ple_update_query.where(ple.voucher_no == payment_name)
 	ple_update_query.run()
 
+	refresh_payment_ledger_outstanding([(ref_type, ref_no), *payments])
+
 
 def remove_ref_from_advance_section(ref_doc: object = None):
 	# TODO: this might need some testing
@@ -1469,7 +1509,15 @@ def repost_gle_for_stock_vouchers(
 
 def _delete_pl_entries(voucher_type, voucher_no):
 	ple = qb.DocType("Payment Ledger Entry")
+	against_vouchers = (
+		qb.from_(ple)
+		.select(ple.against_voucher_type, ple.against_voucher_no)
+		.distinct()
+		.where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no))
+		.run()
+	)
 	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
+	refresh_payment_ledger_outstanding(against_vouchers)
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
@@ -1690,23 +1738,48 @@ def check_and_delete_linked_reports(report):
 
 
 def create_err_and_its_journals(companies: list | None = None) -> None:
-	if companies:
-		for company in companies:
-			err = frappe.new_doc("Exchange Rate Revaluation")
-			err.company = company.name
-			err.posting_date = nowdate()
-			err.rounding_loss_allowance = 0.0
+	"""
+	Revaluation of each company runs as a job of its own, so that companies are revalued in
+	parallel by the workers and a failure in one doesn't stop the others
+	"""
+	if not companies:
+		return
 
-			err.fetch_and_calculate_accounts_data()
-			if err.accounts:
-				err.save().submit()
-				response = err.make_jv_entries()
+	if len(companies) == 1:
+		create_err_and_its_journal(companies[0].name, companies[0].submit_err_jv)
+		return
+
+	from frappe.utils.background_jobs import is_job_enqueued
+
+	for company in companies:
+		job_id = "exchange_rate_revaluation::" + company.name
+		if not is_job_enqueued(job_id):
+			frappe.enqueue(
+				create_err_and_its_journal,
+				queue="long",
+				job_id=job_id,
+				now=frappe.flags.in_test,
+				company=company.name,
+				submit_err_jv=company.submit_err_jv,
+			)
 
-				if company.submit_err_jv:
-					jv = response.get("revaluation_jv", None)
-					jv and frappe.get_doc("Journal Entry", jv).submit()
-					jv = response.get("zero_balance_jv", None)
-					jv and frappe.get_doc("Journal Entry", jv).submit()
+
+def create_err_and_its_journal(company: str, submit_err_jv: bool = False) -> None:
+	err = frappe.new_doc("Exchange Rate Revaluation")
+	err.company = company
+	err.posting_date = nowdate()
+	err.rounding_loss_allowance = 0.0
+
+	err.fetch_and_calculate_accounts_data()
+	if err.accounts:
+		err.save().submit()
+		response = err.make_jv_entries()
+
+		if submit_err_jv:
+			jv = response.get("revaluation_jv", None)
+			jv and frappe.get_doc("Journal Entry", jv).submit()
+			jv = response.get("zero_balance_jv", None)
+			jv and frappe.get_doc("Journal Entry", jv).submit()
 
 
 def auto_create_exchange_rate_revaluation_daily() -> None:
@@ -1823,6 +1896,7 @@ def create_payment_ledger_entry(
 ):
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
+		against_vouchers = []
 
 		for entry in ple_map:
 			ple = frappe.get_doc(entry)
@@ -1833,46 +1907,151 @@ def create_payment_ledger_entry(
 			ple.flags.ignore_permissions = 1
 			ple.flags.adv_adj = adv_adj
 			ple.flags.from_repost = from_repost
-			ple.flags.update_outstanding = update_outstanding
+			# outstanding of the against vouchers is updated once all the entries are posted
+			ple.flags.update_outstanding = "No"
 			ple.submit()
 
+			if update_outstanding == "Yes" and not frappe.flags.is_reverse_depr_entry:
+				against_vouchers.append(
+					(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+				)
+
+		refresh_payment_ledger_outstanding(
+			[(entry.against_voucher_type, entry.against_voucher_no) for entry in ple_map]
+		)
+		update_voucher_outstandings(against_vouchers)
+
+
+def create_payment_ledger_entries_in_bulk(gl_entries, adv_adj=0):
+	"""Insert the Payment Ledger Entries of the GL Entries in a single query.
+
+	Validations of each entry are as in `PaymentLedgerEntry`, the ones depending only on the
+	account being run once per account. Outstanding of the against vouchers is not updated.
+	"""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import validate_balance_type, validate_frozen_account
+
+	ple_map = get_payment_ledger_entries(gl_entries)
+	if not ple_map:
+		return
+
+	validated_accounts = set()
+	for entry in ple_map:
+		ple = frappe.get_doc(entry)
+		if (ple.account, ple.account_type, ple.company) not in validated_accounts:
+			ple.validate_account()
+			validate_frozen_account(ple.account, adv_adj)
+			ple.validate_account_details()
+			validate_balance_type(ple.account, adv_adj)
+			validated_accounts.add((ple.account, ple.account_type, ple.company))
+
+		ple.validate_dimensions_for_pl_and_bs()
+		ple.validate_allowed_dimensions()
+
+	timestamp, user = now(), frappe.session.user
+	fields = [field for field in ple_map[0] if field != "doctype"]
+	values = [
+		(frappe.generate_hash(length=10), timestamp, timestamp, user, user, 1, *(entry[f] for f in fields))
+		for entry in ple_map
+	]
+
+	frappe.db.bulk_insert(
+		"Payment Ledger Entry",
+		fields=["name", "creation", "modified", "owner", "modified_by", "docstatus", *fields],
+		values=values,
+	)
+	refresh_payment_ledger_outstanding(
+		[(entry.against_voucher_type, entry.against_voucher_no) for entry in ple_map]
+	)
+
 
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
-	ple = frappe.qb.DocType("Payment Ledger Entry")
-	vouchers = [frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})]
-	common_filter = []
-	if account:
-		common_filter.append(ple.account == account)
+	update_voucher_outstandings([(voucher_type, voucher_no, account, party_type, party)])
 
-	if party_type:
-		common_filter.append(ple.party_type == party_type)
 
-	if party:
-		common_filter.append(ple.party == party)
+def update_voucher_outstandings(vouchers):
+	"""Update outstanding amount and status of invoices from the Payment Ledger.
 
-	ple_query = QueryPaymentLedger()
+	vouchers - list of (voucher_type, voucher_no, account, party_type, party)
 
-	# on cancellation outstanding can be an empty list
-	voucher_outstanding = ple_query.get_voucher_outstandings(vouchers, common_filter=common_filter)
-	if (
-		voucher_type in ["Sales Invoice", "Purchase Invoice", "Fees"]
-		and party_type
-		and party
-		and voucher_outstanding
-	):
-		outstanding = voucher_outstanding[0]
-		ref_doc = frappe.get_doc(voucher_type, voucher_no)
-
-		# Didn't use db_set for optimisation purpose
-		ref_doc.outstanding_amount = outstanding["outstanding_in_account_currency"] or 0.0
-		frappe.db.set_value(
-			voucher_type,
-			voucher_no,
-			"outstanding_amount",
-			outstanding["outstanding_in_account_currency"] or 0.0,
+	Outstanding of all the vouchers is fetched in two grouped queries and written back
+	in a single update per doctype, instead of a query and an update per voucher.
+	"""
+	vouchers = [
+		voucher
+		for voucher in dict.fromkeys(tuple(v) for v in vouchers)
+		if voucher[0] in ["Sales Invoice", "Purchase Invoice", "Fees"] and voucher[3] and voucher[4]
+	]
+	if not vouchers:
+		return
+
+	ple = qb.DocType("Payment Ledger Entry")
+	voucher_types = {v[0] for v in vouchers}
+	voucher_nos = {v[1] for v in vouchers}
+	party_types = {v[3] for v in vouchers}
+	parties = {v[4] for v in vouchers}
+
+	# vouchers having ledger entries of their own, on cancellation there are none
+	posted = (
+		qb.from_(ple)
+		.select(ple.voucher_type, ple.voucher_no, ple.account, ple.party_type, ple.party)
+		.where(
+			(ple.delinked == 0)
+			& ple.voucher_type.isin(voucher_types)
+			& ple.voucher_no.isin(voucher_nos)
+			& ple.party_type.isin(party_types)
+			& ple.party.isin(parties)
 		)
+		.groupby(ple.voucher_type, ple.voucher_no, ple.account, ple.party_type, ple.party)
+		.run()
+	)
 
-		ref_doc.set_status(update=True)
+	outstanding = (
+		qb.from_(ple)
+		.select(
+			ple.against_voucher_type,
+			ple.against_voucher_no,
+			ple.account,
+			ple.party_type,
+			ple.party,
+			Sum(ple.amount_in_account_currency),
+		)
+		.where(
+			(ple.delinked == 0)
+			& ple.against_voucher_type.isin(voucher_types)
+			& ple.against_voucher_no.isin(voucher_nos)
+			& ple.party_type.isin(party_types)
+			& ple.party.isin(parties)
+		)
+		.groupby(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+		.run()
+	)
+
+	# without an account, a voucher is matched across all of its accounts
+	posted = {key for row in posted for key in (row, (*row[:2], None, *row[3:]))}
+	outstanding_map = defaultdict(float)
+	for *row, amount in outstanding:
+		outstanding_map[tuple(row)] += flt(amount)
+		outstanding_map[(*row[:2], None, *row[3:])] += flt(amount)
+
+	updates, docs = {}, []
+	for voucher in vouchers:
+		voucher = (*voucher[:2], voucher[2] or None, *voucher[3:])
+		if voucher not in posted:
+			continue
+
+		ref_doc = frappe.get_doc(voucher[0], voucher[1])
+		ref_doc.outstanding_amount = outstanding_map.get(voucher, 0.0)
+		ref_doc.set_status()
+		updates.setdefault(ref_doc.doctype, {})[ref_doc.name] = {
+			"outstanding_amount": ref_doc.outstanding_amount,
+			"status": ref_doc.status,
+		}
+		docs.append(ref_doc)
+
+	for doctype, values in updates.items():
+		frappe.db.bulk_update(doctype, values)
+
+	for ref_doc in docs:
 		ref_doc.notify_update()
 
 
@@ -1931,6 +2110,47 @@ class QueryPaymentLedger:
 		# clear result
 		self.voucher_outstandings.clear()
 
+	def can_use_outstanding_summary(self, filter_on_against_voucher_no):
+		"""
+		Outstanding can be read from the Payment Ledger Outstanding summary when it is enabled,
+		and the ledger is only filtered on the fields which the summary has
+		"""
+		if not frappe.db.get_single_value("Accounts Settings", "use_outstanding_summary"):
+			return False
+
+		return all(
+			field.table == self.ple and field.name in SUMMARY_KEY_FIELDS
+			for criterion in [*filter_on_against_voucher_no, *self.common_filter]
+			for field in criterion.fields_()
+		)
+
+	def query_outstanding_summary(self, filter_on_against_voucher_no):
+		"""
+		Query for voucher outstanding, from the summary maintained per voucher, account and party
+		"""
+		summary = qb.DocType("Payment Ledger Outstanding")
+		filters = [
+			criterion.replace_table(self.ple, summary)
+			for criterion in [*filter_on_against_voucher_no, *self.common_filter]
+		]
+
+		return (
+			qb.from_(summary)
+			.select(
+				summary.account,
+				summary.against_voucher_type.as_("voucher_type"),
+				summary.against_voucher_no.as_("voucher_no"),
+				summary.party_type,
+				summary.party,
+				Sum(summary.amount).as_("amount"),
+				Sum(summary.amount_in_account_currency).as_("amount_in_account_currency"),
+			)
+			.where(Criterion.all(filters))
+			.groupby(
+				summary.against_voucher_type, summary.against_voucher_no, summary.party_type, summary.party
+			)
+		)
+
 	def query_for_outstanding(self):
 		"""
 		Database query to fetch voucher amount and voucher outstanding using Common Table Expression
@@ -2026,25 +2246,28 @@ class QueryPaymentLedger:
 		)
 
 		# build query for voucher outstanding
-		query_voucher_outstanding = (
-			qb.from_(ple)
-			.select(
-				ple.account,
-				ple.against_voucher_type.as_("voucher_type"),
-				ple.against_voucher_no.as_("voucher_no"),
-				ple.party_type,
-				ple.party,
-				ple.posting_date,
-				ple.due_date,
-				ple.account_currency.as_("currency"),
-				Sum(ple.amount).as_("amount"),
-				Sum(ple.amount_in_account_currency).as_("amount_in_account_currency"),
+		if self.can_use_outstanding_summary(filter_on_against_voucher_no):
+			query_voucher_outstanding = self.query_outstanding_summary(filter_on_against_voucher_no)
+		else:
+			query_voucher_outstanding = (
+				qb.from_(ple)
+				.select(
+					ple.account,
+					ple.against_voucher_type.as_("voucher_type"),
+					ple.against_voucher_no.as_("voucher_no"),
+					ple.party_type,
+					ple.party,
+					ple.posting_date,
+					ple.due_date,
+					ple.account_currency.as_("currency"),
+					Sum(ple.amount).as_("amount"),
+					Sum(ple.amount_in_account_currency).as_("amount_in_account_currency"),
+				)
+				.where(ple.delinked == 0)
+				.where(Criterion.all(filter_on_against_voucher_no))
+				.where(Criterion.all(self.common_filter))
+				.groupby(ple.against_voucher_type, ple.against_voucher_no, ple.party_type, ple.party)
 			)
-			.where(ple.delinked == 0)
-			.where(Criterion.all(filter_on_against_voucher_no))
-			.where(Criterion.all(self.common_filter))
-			.groupby(ple.against_voucher_type, ple.against_voucher_no, ple.party_type, ple.party)
-		)
 
 		# build CTE for combining voucher amount and outstanding
 		self.cte_query_voucher_amount_and_outstanding = (
@@ -44,9 +44,13 @@ def update_last_purchase_rate(doc, is_submit) -> None:
 
 
 def validate_for_items(doc) -> None:
+	from erpnext.stock.get_item_details import get_bin_details_map
+
 	items = []
+	bin_details = get_bin_details_map([(d.item_code, d.warehouse) for d in doc.get("items")])
 	for d in doc.get("items"):
-		set_stock_levels(row=d)  # update with latest quantities
+		# update with latest quantities
+		set_stock_levels(row=d, projected_qty=bin_details[(d.item_code, d.warehouse)]["projected_qty"])
 		item = validate_item_and_get_basic_data(row=d)
 		validate_stock_item_warehouse(row=d, item=item)
 		validate_end_of_life(d.item_code, item.end_of_life, item.disabled)
@@ -61,15 +65,16 @@ def validate_for_items(doc) -> None:
 		frappe.throw(_("Same item cannot be entered multiple times."))
 
 
-def set_stock_levels(row) -> None:
-	projected_qty = frappe.db.get_value(
-		"Bin",
-		{
-			"item_code": row.item_code,
-			"warehouse": row.warehouse,
-		},
-		"projected_qty",
-	)
+def set_stock_levels(row, projected_qty=None) -> None:
+	if projected_qty is None:
+		projected_qty = frappe.db.get_value(
+			"Bin",
+			{
+				"item_code": row.item_code,
+				"warehouse": row.warehouse,
+			},
+			"projected_qty",
+		)
 
 	qty_data = {
 		"projected_qty": flt(projected_qty),
@@ -9,7 +9,7 @@ from frappe.utils import cint, flt, getdate
 from frappe.utils.data import nowtime
 
 import erpnext
-from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
+from erpnext.accounts.doctype.budget.budget import validate_lines_against_budget
 from erpnext.accounts.party import get_party_details
 from erpnext.buying.utils import update_last_purchase_rate, validate_for_items
 from erpnext.controllers.sales_and_purchase_return import get_rate_for_return
@@ -717,6 +717,7 @@ class BuyingController(SubcontractingController):
 
 	def validate_budget(self):
 		if self.docstatus == 1:
+			lines = []
 			for data in self.get("items"):
 				args = data.as_dict()
 				args.update(
@@ -730,8 +731,9 @@ class BuyingController(SubcontractingController):
 						),
 					}
 				)
+				lines.append(args)
 
-				validate_expense_against_budget(args)
+			validate_lines_against_budget(lines)
 
 	def process_fixed_asset(self):
 		if self.doctype == "Purchase Invoice" and not self.update_stock:
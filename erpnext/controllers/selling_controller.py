@@ -11,7 +11,7 @@ from erpnext.controllers.accounts_controller import get_taxes_and_charges
 from erpnext.controllers.sales_and_purchase_return import get_rate_for_return
 from erpnext.controllers.stock_controller import StockController
 from erpnext.stock.doctype.item.item import set_item_default
-from erpnext.stock.get_item_details import get_bin_details, get_conversion_factor
+from erpnext.stock.get_item_details import get_bin_details_map, get_conversion_factor
 from erpnext.stock.utils import get_incoming_rate, get_valuation_method
 
 
@@ -22,8 +22,12 @@ class SellingController(StockController):
 	def onload(self):
 		super().onload()
 		if self.doctype in ("Sales Order", "Delivery Note", "Sales Invoice"):
-			for item in self.get("items") + (self.get("packed_items") or []):
-				item.update(get_bin_details(item.item_code, item.warehouse, include_child_warehouses=True))
+			items = self.get("items") + (self.get("packed_items") or [])
+			bin_details = get_bin_details_map(
+				[(item.item_code, item.warehouse) for item in items], include_child_warehouses=True
+			)
+			for item in items:
+				item.update(bin_details[(item.item_code, item.warehouse)])
 
 	def validate(self):
 		super().validate()
@@ -5,7 +5,7 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import comma_or, flt, get_link_to_form, getdate, now, nowdate
+from frappe.utils import comma_or, flt, get_link_to_form, getdate, nowdate
 
 
 class OverAllowanceError(frappe.ValidationError):
@@ -247,11 +247,39 @@ class StatusUpdater(Document):
 		self.global_qty_allowance = None
 		self.global_amount_allowance = None
 
+		allow_negative_rates = None
 		for args in self.status_updater:
 			if "target_ref_field" not in args:
 				# if target_ref_field is not specified, the programmer does not want to validate qty / amount
 				continue
 
+			if allow_negative_rates is None:
+				allow_negative_rates = frappe.db.get_single_value(
+					"Selling Settings", "allow_negative_rates_for_items"
+				)
+
+			# get all qty where qty > target_field, for all the rows at once
+			names = {
+				d.get(args["join_field"])
+				for d in self.get_all_children()
+				if d.doctype == args["source_dt"] and d.get(args["join_field"])
+			}
+			items = (
+				{
+					item.name: item
+					for item in frappe.db.sql(
+						"""select name, item_code, `{target_ref_field}`,
+						`{target_field}`, parenttype, parent from `tab{target_dt}`
+						where `{target_ref_field}` < `{target_field}`
+						and name in %(names)s and docstatus=1""".format(**args),
+						{"names": list(names)},
+						as_dict=1,
+					)
+				}
+				if names
+				else {}
+			)
+
 			# get unique transactions to update
 			for d in self.get_all_children():
 				if hasattr(d, "qty") and d.qty < 0 and not self.get("is_return"):
@@ -260,7 +288,7 @@ class StatusUpdater(Document):
 				if hasattr(d, "qty") and d.qty > 0 and self.get("is_return"):
 					frappe.throw(_("For an item {0}, quantity must be negative number").format(d.item_code))
 
-				if not frappe.db.get_single_value("Selling Settings", "allow_negative_rates_for_items"):
+				if not allow_negative_rates:
 					if hasattr(d, "item_code") and hasattr(d, "rate") and flt(d.rate) < 0:
 						frappe.throw(
 							_(
@@ -272,32 +300,21 @@ class StatusUpdater(Document):
 							),
 						)
 
-				if d.doctype == args["source_dt"] and d.get(args["join_field"]):
-					args["name"] = d.get(args["join_field"])
+				if d.doctype == args["source_dt"] and d.get(args["join_field"]) in items:
+					item = items[d.get(args["join_field"])].copy()
+					del item["name"]
+					item["idx"] = d.idx
+					item["target_ref_field"] = args["target_ref_field"].replace("_", " ")
 
-					# get all qty where qty > target_field
-					item = frappe.db.sql(
-						"""select item_code, `{target_ref_field}`,
-						`{target_field}`, parenttype, parent from `tab{target_dt}`
-						where `{target_ref_field}` < `{target_field}`
-						and name=%s and docstatus=1""".format(**args),
-						args["name"],
-						as_dict=1,
-					)
-					if item:
-						item = item[0]
-						item["idx"] = d.idx
-						item["target_ref_field"] = args["target_ref_field"].replace("_", " ")
+					# if not item[args['target_ref_field']]:
+					# 	msgprint(_("Note: System will not check over-delivery and over-booking for Item {0} as quantity or amount is 0").format(item.item_code))
+					if args.get("no_allowance"):
+						item["reduce_by"] = item[args["target_field"]] - item[args["target_ref_field"]]
+						if item["reduce_by"] > 0.01:
+							self.limits_crossed_error(args, item, "qty")
 
-						# if not item[args['target_ref_field']]:
-						# 	msgprint(_("Note: System will not check over-delivery and over-booking for Item {0} as quantity or amount is 0").format(item.item_code))
-						if args.get("no_allowance"):
-							item["reduce_by"] = item[args["target_field"]] - item[args["target_ref_field"]]
-							if item["reduce_by"] > 0.01:
-								self.limits_crossed_error(args, item, "qty")
-
-						elif item[args["target_ref_field"]]:
-							self.check_overflow_with_allowance(item, args)
+					elif item[args["target_ref_field"]]:
+						self.check_overflow_with_allowance(item, args)
 
 	def check_overflow_with_allowance(self, item, args):
 		"""
@@ -417,55 +434,60 @@ class StatusUpdater(Document):
 
 	def _update_children(self, args, update_modified):
 		"""Update quantities or amount in child table"""
-		for d in self.get_all_children():
-			if d.doctype != args["source_dt"]:
-				continue
-
-			self._update_modified(args, update_modified)
-
-			# updates qty in the child table
-			args["detail_id"] = d.get(args["join_field"])
+		detail_ids = list(
+			{
+				d.get(args["join_field"])
+				for d in self.get_all_children()
+				if d.doctype == args["source_dt"] and d.get(args["join_field"])
+			}
+		)
+		if not detail_ids:
+			return
 
-			args["second_source_condition"] = ""
-			if (
-				args.get("second_source_dt")
-				and args.get("second_source_field")
-				and args.get("second_join_field")
-			):
-				if not args.get("second_source_extra_cond"):
-					args["second_source_extra_cond"] = ""
+		second_source_values = {}
+		if args.get("second_source_dt") and args.get("second_source_field") and args.get("second_join_field"):
+			if not args.get("second_source_extra_cond"):
+				args["second_source_extra_cond"] = ""
 
-				args["second_source_condition"] = frappe.db.sql(
-					""" select ifnull((select sum({second_source_field})
+			second_source_values = dict(
+				frappe.db.sql(
+					""" select `{second_join_field}`, sum({second_source_field})
 					from `tab{second_source_dt}`
-					where `{second_join_field}`='{detail_id}'
+					where `{second_join_field}` in %(detail_ids)s
 					and (`tab{second_source_dt}`.docstatus=1)
-					{second_source_extra_cond}), 0) """.format(**args)
-				)[0][0]
-
-			if args["detail_id"]:
-				if not args.get("extra_cond"):
-					args["extra_cond"] = ""
-
-				args["source_dt_value"] = (
-					frappe.db.sql(
-						"""
-						(select ifnull(sum({source_field}), 0)
-							from `tab{source_dt}` where `{join_field}`='{detail_id}'
-							and (docstatus=1 {cond}) {extra_cond})
-				""".format(**args)
-					)[0][0]
-					or 0.0
+					{second_source_extra_cond}
+					group by `{second_join_field}` """.format(**args),
+					{"detail_ids": detail_ids},
 				)
+			)
 
-				if args["second_source_condition"]:
-					args["source_dt_value"] += flt(args["second_source_condition"])
+		if not args.get("extra_cond"):
+			args["extra_cond"] = ""
+
+		source_values = dict(
+			frappe.db.sql(
+				"""
+				select `{join_field}`, ifnull(sum({source_field}), 0)
+					from `tab{source_dt}` where `{join_field}` in %(detail_ids)s
+					and (docstatus=1 {cond}) {extra_cond}
+					group by `{join_field}`
+			""".format(**args),
+				{"detail_ids": detail_ids},
+			)
+		)
 
-				frappe.db.sql(
-					"""update `tab{target_dt}`
-					set {target_field} = {source_dt_value} {update_modified}
-					where name='{detail_id}'""".format(**args)
-				)
+		# updates qty in the child table
+		frappe.db.bulk_update(
+			args["target_dt"],
+			{
+				detail_id: {
+					args["target_field"]: flt(source_values.get(detail_id))
+					+ flt(second_source_values.get(detail_id))
+				}
+				for detail_id in detail_ids
+			},
+			update_modified=update_modified,
+		)
 
 	@staticmethod
 	def _calculate_target_parent_percentage(
@@ -543,15 +565,6 @@ class StatusUpdater(Document):
 			update_data.update(status)
 			target.db_set(update_data, update_modified=update_modified, notify=True)
 
-	def _update_modified(self, args, update_modified):
-		if not update_modified:
-			args["update_modified"] = ""
-			return
-
-		args["update_modified"] = ", modified = {}, modified_by = {}".format(
-			frappe.db.escape(now()), frappe.db.escape(frappe.session.user)
-		)
-
 	def update_billing_status_for_zero_amount_refdoc(self, ref_dt):
 		ref_fieldname = frappe.scrub(ref_dt)
 
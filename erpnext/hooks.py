@@ -388,6 +388,22 @@ doc_events = {
 	"Integration Request": {
 		"validate": "erpnext.accounts.doctype.payment_request.payment_request.validate_payment"
 	},
+	"Holiday List": {
+		"on_update": "erpnext.manufacturing.doctype.workstation.workstation_calendar.clear_workstation_calendars",
+		"on_trash": "erpnext.manufacturing.doctype.workstation.workstation_calendar.clear_workstation_calendars",
+	},
+	("Purchase Invoice", "Sales Invoice", "Journal Entry", "Payment Entry"): {
+		"on_submit": "erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger.update_tax_withholding_ledger",
+		"before_cancel": "erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger.update_tax_withholding_ledger",
+	},
+	("Purchase Invoice", "Sales Invoice"): {
+		"on_update_after_submit": "erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger.update_tax_withholding_ledger",
+	},
+	("Customer", "Supplier", "Employee", "Bank Account"): {
+		"on_update": "erpnext.accounts.doctype.bank_transaction.auto_match_party.clear_party_match_index",
+		"on_trash": "erpnext.accounts.doctype.bank_transaction.auto_match_party.clear_party_match_index",
+		"after_rename": "erpnext.accounts.doctype.bank_transaction.auto_match_party.clear_party_match_index",
+	},
 }
 
 # function should expect the variable and doc as arguments
@@ -463,6 +479,7 @@ scheduler_events = {
 		"erpnext.accounts.doctype.process_subscription.process_subscription.create_subscription_process",
 		"erpnext.setup.doctype.email_digest.email_digest.send",
 		"erpnext.manufacturing.doctype.bom_update_tool.bom_update_tool.auto_update_latest_price_in_all_boms",
+		"erpnext.stock.doctype.closing_stock_balance.closing_stock_balance.create_auto_closing_stock_balance",
 		"erpnext.crm.utils.open_leads_opportunities_based_on_todays_event",
 		"erpnext.assets.doctype.asset.depreciation.post_depreciation_entries",
 	],
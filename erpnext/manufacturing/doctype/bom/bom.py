@@ -14,6 +14,14 @@ from frappe.utils import cint, cstr, flt, parse_json, today
 from frappe.website.website_generator import WebsiteGenerator
 
 import erpnext
+from erpnext.manufacturing.doctype.bom.bom_graph import clear_bom_graph, get_bom_graph
+from erpnext.manufacturing.doctype.bom_closure.bom_closure import (
+	build_bom_closure,
+	delete_bom_closure,
+	get_bom_closure,
+	update_ancestor_closures,
+	update_bom_closure,
+)
 from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_item_details
 from erpnext.stock.get_item_details import ItemDetailsCtx, get_conversion_factor, get_price_list_rate
@@ -45,7 +53,7 @@ class BOMTree:
 			self.__create_tree()
 
 	def __create_tree(self):
-		bom = frappe.get_cached_doc("BOM", self.name)
+		bom = get_bom_graph().get_bom(self.name) or frappe.get_cached_doc("BOM", self.name)
 		self.item_code = bom.item
 		self.bom_qty = bom.quantity
 
@@ -269,12 +277,14 @@ class BOM(WebsiteGenerator):
 		context.parents = [{"name": "boms", "title": _("All BOMs")}]
 
 	def on_update(self):
-		frappe.cache().hdel("bom_children", self.name)
+		clear_bom_graph()
 		self.check_recursion()
 
 	def on_submit(self):
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		update_bom_closure(self.name)
+		clear_bom_graph()
 
 	def on_cancel(self):
 		self.db_set("is_active", 0)
@@ -284,6 +294,10 @@ class BOM(WebsiteGenerator):
 		self.validate_bom_links()
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		delete_bom_closure(self.name)
+		# inactive BOMs using this BOM can still be submitted, their trees no longer expand it
+		update_ancestor_closures(self.name)
+		clear_bom_graph()
 
 	def update_bom_creator_status(self):
 		if not self.bom_creator:
@@ -304,6 +318,7 @@ class BOM(WebsiteGenerator):
 	def on_update_after_submit(self):
 		self.validate_bom_links()
 		self.manage_default_bom()
+		clear_bom_graph()
 
 	def get_item_det(self, item_code):
 		item = get_item_details(item_code)
@@ -444,9 +459,9 @@ class BOM(WebsiteGenerator):
 			rate = get_valuation_rate(arg)
 		elif arg:
 			# Customer Provided parts and Supplier sourced parts will have zero rate
-			if not frappe.db.get_value("Item", arg["item_code"], "is_customer_provided_item") and not arg.get(
-				"sourced_by_supplier"
-			):
+			if not frappe.get_cached_value(
+				"Item", arg["item_code"], "is_customer_provided_item"
+			) and not arg.get("sourced_by_supplier"):
 				if arg.get("bom_no") and self.set_rate_of_sub_assembly_item_based_on_bom:
 					rate = flt(self.get_bom_unitcost(arg["bom_no"])) * (arg.get("conversion_factor") or 1)
 				else:
@@ -482,6 +497,7 @@ class BOM(WebsiteGenerator):
 
 		if save:
 			self.db_update()
+			clear_bom_graph()
 
 		# update parent BOMs
 		if self.total_cost != existing_bom_cost and update_parent:
@@ -510,15 +526,14 @@ class BOM(WebsiteGenerator):
 				where bom_no = %s and docstatus < 2 and parenttype='BOM'""",
 				(cost, cost, self.name),
 			)
+			clear_bom_graph()
 
 	def get_bom_unitcost(self, bom_no):
-		bom = frappe.db.sql(
-			"""select name, base_total_cost/quantity as unit_cost from `tabBOM`
-			where is_active = 1 and name = %s""",
-			bom_no,
-			as_dict=1,
-		)
-		return bom and bom[0]["unit_cost"] or 0
+		bom = get_bom_graph().get_bom(bom_no, with_children=False)
+		if not bom or not bom.is_active or not bom.quantity:
+			return 0
+
+		return flt(bom.base_total_cost) / flt(bom.quantity)
 
 	def manage_default_bom(self):
 		"""Uncheck others if current one is selected as default or
@@ -634,14 +649,7 @@ class BOM(WebsiteGenerator):
 				exc=BOMRecursionError,
 			)
 
-		bom_list = self.traverse_tree()
-		child_items = frappe.get_all(
-			"BOM Item",
-			fields=["bom_no", "item_code"],
-			filters={"parent": ("in", bom_list), "parenttype": "BOM"},
-		)
-
-		for item in child_items:
+		for item in build_bom_closure(self.name):
 			if self.name == item.bom_no:
 				_throw_error(self.name)
 			if self.item == item.item_code and item.bom_no:
@@ -696,29 +704,18 @@ class BOM(WebsiteGenerator):
 			self.append("items", row)
 
 	def traverse_tree(self, bom_list=None):
-		def _get_children(bom_no):
-			children = frappe.cache().hget("bom_children", bom_no)
-			if children is None:
-				children = frappe.db.sql_list(
-					"""SELECT `bom_no` FROM `tabBOM Item`
-					WHERE `parent`=%s AND `bom_no`!='' AND `parenttype`='BOM'""",
-					bom_no,
-				)
-				frappe.cache().hset("bom_children", bom_no, children)
-			return children
-
-		count = 0
 		if not bom_list:
 			bom_list = []
 
 		if self.name not in bom_list:
 			bom_list.append(self.name)
 
-		while count < len(bom_list):
-			for child_bom in _get_children(bom_list[count]):
-				if child_bom not in bom_list:
-					bom_list.append(child_bom)
-			count += 1
+		closure = get_bom_closure(bom_list)
+		for bom_no in list(bom_list):
+			for row in sorted(closure.get(bom_no, []), key=lambda d: d.depth):
+				if row.bom_no and row.bom_no not in bom_list:
+					bom_list.append(row.bom_no)
+
 		bom_list.reverse()
 		return bom_list
 
@@ -782,7 +779,7 @@ class BOM(WebsiteGenerator):
 			row.cost_per_unit = row.operating_cost / (row.batch_size or 1.0)
 			row.base_cost_per_unit = row.base_operating_cost / (row.batch_size or 1.0)
 
-		if update_hour_rate:
+		if update_hour_rate and not self.flags.defer_cost_updates:
 			row.db_update()
 
 	def calculate_rm_cost(self, save=False):
@@ -843,7 +840,7 @@ class BOM(WebsiteGenerator):
 		self.scrap_material_cost = total_sm_cost
 		self.base_scrap_material_cost = base_total_sm_cost
 
-	def calculate_exploded_cost(self):
+	def calculate_exploded_cost(self, save=True):
 		"Set exploded row cost from it's parent BOM."
 		rm_rate_map = self.get_rm_rate_map()
 
@@ -852,7 +849,7 @@ class BOM(WebsiteGenerator):
 			row.rate = rm_rate_map.get(row.item_code)
 			row.amount = flt(row.stock_qty) * flt(row.rate)
 
-			if old_rate != row.rate:
+			if save and old_rate != row.rate:
 				# Only db_update if changed
 				row.db_update()
 
@@ -863,12 +860,7 @@ class BOM(WebsiteGenerator):
 		for item in self.get("items"):
 			if item.bom_no:
 				# Get Item-Rate from Subassembly BOM
-				explosion_items = frappe.get_all(
-					"BOM Explosion Item",
-					filters={"parent": item.bom_no},
-					fields=["item_code", "rate"],
-					order_by=None,  # to avoid sort index creation at db level (granular change)
-				)
+				explosion_items = get_bom_graph().get_exploded_items(item.bom_no)
 				explosion_item_rate = {item.item_code: flt(item.rate) for item in explosion_items}
 				rm_rate_map.update(explosion_item_rate)
 			else:
@@ -917,30 +909,14 @@ class BOM(WebsiteGenerator):
 
 	def get_child_exploded_items(self, bom_no, stock_qty):
 		"""Add all items from Flat BOM of child BOM"""
-		# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
-		child_fb_items = frappe.db.sql(
-			"""
-			SELECT
-				bom_item.item_code,
-				bom_item.item_name,
-				bom_item.description,
-				bom_item.source_warehouse,
-				bom_item.operation,
-				bom_item.stock_uom,
-				bom_item.stock_qty,
-				bom_item.rate,
-				bom_item.include_item_in_manufacturing,
-				bom_item.sourced_by_supplier,
-				bom_item.stock_qty / ifnull(bom.quantity, 1) AS qty_consumed_per_unit
-			FROM `tabBOM Explosion Item` bom_item, `tabBOM` bom
-			WHERE
-				bom_item.parent = bom.name
-				AND bom.name = %s
-				AND bom.docstatus = 1
-		""",
-			bom_no,
-			as_dict=1,
-		)
+		graph = get_bom_graph()
+		bom = graph.get_bom(bom_no)
+		if not bom or bom.docstatus != 1:
+			return
+
+		# Did not use qty_consumed_per_unit from the table, as it leads to rounding loss
+		child_fb_items = graph.get_exploded_items(bom_no)
+		bom_quantity = flt(bom.quantity) or 1
 
 		for d in child_fb_items:
 			self.add_to_cur_exploded_items(
@@ -952,7 +928,7 @@ class BOM(WebsiteGenerator):
 						"operation": d["operation"],
 						"description": d["description"],
 						"stock_uom": d["stock_uom"],
-						"stock_qty": d["qty_consumed_per_unit"] * stock_qty,
+						"stock_qty": flt(d["stock_qty"]) / bom_quantity * stock_qty,
 						"rate": flt(d["rate"]),
 						"include_item_in_manufacturing": d.get("include_item_in_manufacturing", 0),
 						"sourced_by_supplier": d.get("sourced_by_supplier", 0),
@@ -1043,7 +1019,18 @@ class BOM(WebsiteGenerator):
 
 def get_bom_item_rate(args, bom_doc):
 	if bom_doc.rm_cost_as_per == "Valuation Rate":
-		rate = get_valuation_rate(args) * (args.get("conversion_factor") or 1)
+		# BOM cost updates share the valuation rates across all the BOMs being updated
+		valuation_rates = bom_doc.flags.valuation_rate_cache
+		if valuation_rates is None:
+			rate = get_valuation_rate(args)
+		else:
+			key = (args.get("item_code"), args.get("company"), args.get("warehouse"))
+			if key not in valuation_rates:
+				valuation_rates[key] = get_valuation_rate(args)
+
+			rate = valuation_rates[key]
+
+		rate *= args.get("conversion_factor") or 1
 	elif bom_doc.rm_cost_as_per == "Last Purchase Rate":
 		rate = (
 			flt(args.get("last_purchase_rate"))
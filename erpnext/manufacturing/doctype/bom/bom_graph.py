@@ -0,0 +1,268 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import create_batch, flt
+
+BOM_FIELDS = ["name", "item", "quantity", "docstatus", "is_active", "company", "base_total_cost"]
+
+BOM_ITEM_FIELDS = [
+	"name",
+	"parent",
+	"idx",
+	"item_code",
+	"item_name",
+	"bom_no",
+	"qty",
+	"stock_qty",
+	"stock_uom",
+	"description",
+	"source_warehouse",
+	"docstatus",
+]
+
+BOM_EXPLOSION_ITEM_FIELDS = [
+	"parent",
+	"idx",
+	"item_code",
+	"item_name",
+	"description",
+	"source_warehouse",
+	"operation",
+	"stock_uom",
+	"stock_qty",
+	"rate",
+	"include_item_in_manufacturing",
+	"sourced_by_supplier",
+	"docstatus",
+]
+
+ITEM_FIELDS = [
+	"name",
+	"item_name",
+	"description",
+	"image",
+	"stock_uom",
+	"is_stock_item",
+	"is_sub_contracted_item",
+	"default_bom",
+	"default_material_request_type",
+	"min_order_qty",
+	"safety_stock",
+	"purchase_uom",
+]
+
+
+class BOMGraph:
+	"""BOMs, their items and explosions loaded in bulk and shared within a request.
+
+	BOMs are loaded one level of the tree at a time, so exploding a multi level BOM
+	takes one query per level instead of one per node. Use `get_bom_graph` to get the
+	shared instance, it is cleared whenever a BOM or an Item is changed.
+	"""
+
+	def __init__(self) -> None:
+		self.boms: dict[str, frappe._dict | None] = {}
+		self.expanded_boms: set[str] = set()
+		self.exploded_items: dict[str, list[frappe._dict]] = {}
+		self.items: dict[tuple[str, str | None], frappe._dict] = {}
+		self.explosions: dict[tuple, list[tuple[frappe._dict, float]]] = {}
+
+	def get_bom(self, bom_no: str, with_children: bool = True) -> frappe._dict | None:
+		self.load_boms([bom_no], with_children=with_children)
+		return self.boms.get(bom_no)
+
+	def load_boms(self, bom_nos: list[str], with_children: bool = True) -> None:
+		"""Load the given BOMs with their BOM Items and, if `with_children` is set, all their child BOMs."""
+
+		to_load = {bom_no for bom_no in bom_nos if bom_no}
+		while to_load:
+			if missing := [bom_no for bom_no in to_load if bom_no not in self.boms]:
+				self.fetch_boms(missing)
+
+			if not with_children:
+				break
+
+			child_boms = set()
+			for bom_no in to_load - self.expanded_boms:
+				self.expanded_boms.add(bom_no)
+				if bom := self.boms.get(bom_no):
+					child_boms.update(row.bom_no for row in bom.items if row.bom_no)
+
+			to_load = child_boms - self.expanded_boms
+
+	def fetch_boms(self, bom_nos: list[str]) -> None:
+		for names in create_batch(bom_nos, 1000):
+			for name in names:
+				self.boms[name] = None
+
+			for bom in frappe.get_all("BOM", filters={"name": ("in", names)}, fields=BOM_FIELDS):
+				bom.items = []
+				self.boms[bom.name] = bom
+
+			bom_items = frappe.get_all(
+				"BOM Item",
+				filters={"parent": ("in", names), "parenttype": "BOM"},
+				fields=BOM_ITEM_FIELDS,
+				order_by="idx",
+			)
+
+			for row in bom_items:
+				if bom := self.boms.get(row.parent):
+					bom.items.append(row)
+
+	def get_exploded_items(self, bom_no: str) -> list[frappe._dict]:
+		self.load_exploded_items([bom_no])
+		return self.exploded_items[bom_no]
+
+	def load_exploded_items(self, bom_nos: list[str]) -> None:
+		to_load = list({bom_no for bom_no in bom_nos if bom_no and bom_no not in self.exploded_items})
+		for names in create_batch(to_load, 1000):
+			for name in names:
+				self.exploded_items[name] = []
+
+			for row in frappe.get_all(
+				"BOM Explosion Item",
+				filters={"parent": ("in", names), "parenttype": "BOM"},
+				fields=BOM_EXPLOSION_ITEM_FIELDS,
+				order_by="idx",
+			):
+				self.exploded_items[row.parent].append(row)
+
+	def update_costs(self, bom_doc) -> None:
+		"""Set the recalculated cost of a BOM on the loaded BOM and its explosion, so that
+		the BOMs using it read the new cost before it is written to the database."""
+
+		if bom := self.boms.get(bom_doc.name):
+			bom.base_total_cost = bom_doc.base_total_cost
+
+		if bom_doc.name in self.exploded_items:
+			rates = {row.idx: row.rate for row in bom_doc.get("exploded_items")}
+			for row in self.exploded_items[bom_doc.name]:
+				row.rate = rates.get(row.idx, row.rate)
+
+	def get_items(self, item_codes: list[str], company: str | None = None) -> dict[str, frappe._dict]:
+		"""Item details along with the company's default warehouse and the purchase UOM conversion factor."""
+
+		to_load = list({item_code for item_code in item_codes if (item_code, company) not in self.items})
+		for names in create_batch(to_load, 1000):
+			items = frappe.get_all("Item", filters={"name": ("in", names)}, fields=ITEM_FIELDS)
+
+			default_warehouses = {}
+			if company:
+				default_warehouses = frappe._dict(
+					frappe.get_all(
+						"Item Default",
+						filters={"parent": ("in", names), "parenttype": "Item", "company": company},
+						fields=["parent", "default_warehouse"],
+						as_list=True,
+					)
+				)
+
+			conversion_factors = {}
+			for row in frappe.get_all(
+				"UOM Conversion Detail",
+				filters={"parent": ("in", names), "parenttype": "Item"},
+				fields=["parent", "uom", "conversion_factor"],
+			):
+				conversion_factors.setdefault((row.parent, row.uom), row.conversion_factor)
+
+			for item in items:
+				item.default_warehouse = default_warehouses.get(item.name)
+				item.conversion_factor = conversion_factors.get((item.name, item.purchase_uom))
+				self.items[(item.name, company)] = item
+
+		return {
+			item_code: self.items[(item_code, company)]
+			for item_code in item_codes
+			if (item_code, company) in self.items
+		}
+
+	def get_bom_item_details(
+		self,
+		bom_no: str,
+		company: str,
+		include_non_stock_items: bool,
+		include_subcontracted_items: bool,
+		include_exploded_items: bool,
+	) -> list[tuple[frappe._dict, float]]:
+		"""Raw materials of a BOM as (details, qty per unit of the BOM) in the order they are found.
+
+		Sub assemblies having a default BOM are replaced by their own raw materials if
+		`include_exploded_items` is set, as done by the Production Plan.
+		"""
+
+		key = (bom_no, company, include_non_stock_items, include_subcontracted_items, include_exploded_items)
+		if key in self.explosions:
+			return self.explosions[key]
+
+		self.explosions[key] = result = []
+		bom = self.get_bom(bom_no)
+		if not bom:
+			return result
+
+		items = self.get_items([row.item_code for row in bom.items], company)
+		bom_quantity = flt(bom.quantity) or 1
+
+		grouped_rows = {}
+		qty_per_unit = defaultdict(float)
+		for row in bom.items:
+			item = items.get(row.item_code)
+			if row.docstatus > 1 or not item or (not include_non_stock_items and not item.is_stock_item):
+				continue
+
+			grouped_rows.setdefault(row.item_code, (row, item))
+			qty_per_unit[row.item_code] += flt(row.stock_qty) / bom_quantity
+
+		for item_code, (row, item) in grouped_rows.items():
+			details = frappe._dict(
+				{
+					"item_code": item_code,
+					"default_material_request_type": item.default_material_request_type,
+					"item_name": item.item_name,
+					"is_sub_contracted": item.is_sub_contracted_item,
+					"source_warehouse": row.source_warehouse,
+					"default_bom": item.default_bom,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"min_order_qty": item.min_order_qty,
+					"safety_stock": item.safety_stock,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+				}
+			)
+
+			qty = qty_per_unit[item_code]
+			if not include_exploded_items or not item.default_bom:
+				result.append((details, qty))
+				continue
+
+			if (
+				item.default_material_request_type in ["Manufacture", "Purchase"]
+				and not item.is_sub_contracted_item
+			) or (item.is_sub_contracted_item and include_subcontracted_items):
+				if qty > 0:
+					for child, child_qty in self.get_bom_item_details(
+						item.default_bom,
+						company,
+						include_non_stock_items,
+						include_subcontracted_items,
+						include_exploded_items,
+					):
+						result.append((child, qty * child_qty))
+
+		return result
+
+
+def get_bom_graph() -> BOMGraph:
+	if not hasattr(frappe.local, "bom_graph") or frappe.local.bom_graph is None:
+		frappe.local.bom_graph = BOMGraph()
+
+	return frappe.local.bom_graph
+
+
+def clear_bom_graph() -> None:
+	frappe.local.bom_graph = None
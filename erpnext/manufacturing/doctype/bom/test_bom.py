@@ -4,6 +4,7 @@
 
 from collections import deque
 from functools import partial
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase, UnitTestCase, timeout
@@ -111,6 +112,33 @@ class TestBOM(IntegrationTestCase):
 		):
 			self.assertEqual(d.base_rate, rm_base_rate + 10)
 
+	def test_update_cost_in_boms_skips_unchanged_boms(self):
+		from erpnext.manufacturing.doctype.bom_update_log import bom_updation_utils
+
+		bom_tree = {"Cost Item A": {"Cost Item B": {"Cost Item C": {}}, "Cost Item D": {}}}
+		for item_code in ("Cost Item C", "Cost Item D"):
+			make_item(item_code, {"is_stock_item": 1, "valuation_rate": 100})
+		root_bom = create_nested_bom(bom_tree, prefix="")
+		child_bom = frappe.db.get_value("BOM", {"item": "Cost Item B", "docstatus": 1})
+
+		# nothing to update when rates are unchanged
+		bom_updation_utils.update_cost_in_boms([child_bom, root_bom.name])
+		with patch.object(bom_updation_utils, "bulk_update_cost_fields") as bulk_update:
+			bom_updation_utils.update_cost_in_boms([child_bom, root_bom.name])
+			bulk_update.assert_not_called()
+
+		old_cost = frappe.db.get_value("BOM", root_bom.name, "total_cost")
+		reset_item_valuation_rate(item_code="Cost Item C", qty=10, rate=300)
+		bom_updation_utils.update_cost_in_boms([child_bom, root_bom.name])
+
+		child_cost = frappe.db.get_value("BOM", child_bom, "total_cost")
+		self.assertEqual(frappe.db.get_value("BOM Item", {"parent": child_bom}, "rate"), 300)
+		self.assertEqual(
+			frappe.db.get_value("BOM Item", {"parent": root_bom.name, "bom_no": child_bom}, "rate"),
+			child_cost,
+		)
+		self.assertGreater(frappe.db.get_value("BOM", root_bom.name, "total_cost"), old_cost)
+
 	@timeout
 	def test_bom_cost(self):
 		bom = frappe.copy_doc(self.globalTestRecords["BOM"][2])
@@ -352,6 +380,41 @@ class TestBOM(IntegrationTestCase):
 		for reqd_item, created_item in zip(reqd_order, created_order, strict=False):
 			self.assertEqual(reqd_item, created_item.item_code)
 
+	@timeout
+	def test_bom_graph_explosion(self):
+		from erpnext.manufacturing.doctype.bom.bom_graph import get_bom_graph
+
+		bom_tree = {
+			"Assembly": {
+				"SubAssembly1": {"ChildPart1": {}, "ChildPart2": {}},
+				"SubAssembly2": {"SubSubAssy1": {"ChildPart3": {}}},
+				"ChildPart4": {},
+			}
+		}
+		prefix = "_Test BOM Graph "
+		parent_bom = create_nested_bom(bom_tree, prefix=prefix)
+
+		graph = get_bom_graph()
+		graph.get_bom(parent_bom.name)
+
+		# all the sub assembly BOMs are loaded along with the parent BOM
+		sub_assembly_boms = [d.bom_no for d in parent_bom.items if d.bom_no]
+		self.assertEqual(len(sub_assembly_boms), 2)
+		for bom_no in sub_assembly_boms:
+			self.assertTrue(graph.boms.get(bom_no))
+
+		exploded_items = graph.get_bom_item_details(parent_bom.name, "_Test Company", 1, 1, 1)
+		self.assertEqual(
+			sorted((d.item_code, qty) for d, qty in exploded_items),
+			[(prefix + f"ChildPart{i}", 1.0) for i in range(1, 5)],
+		)
+		self.assertIs(exploded_items, graph.get_bom_item_details(parent_bom.name, "_Test Company", 1, 1, 1))
+
+		# the graph is rebuilt after a BOM is updated
+		parent_bom.reload()
+		parent_bom.save()
+		self.assertIsNot(graph, get_bom_graph())
+
 	@timeout
 	def test_generated_variant_bom(self):
 		from erpnext.controllers.item_variant import create_variant
@@ -0,0 +1,153 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Max
+from frappe.utils import cint, create_batch, flt, now
+
+CLOSURE_FIELDS = ["bom", "parent_bom", "bom_item", "item_code", "bom_no", "depth", "qty", "sort_key"]
+
+
+class BOMClosure(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		bom: DF.Link
+		bom_item: DF.Data | None
+		bom_no: DF.Link | None
+		depth: DF.Int
+		item_code: DF.Link | None
+		parent_bom: DF.Link | None
+		qty: DF.Float
+		sort_key: DF.SmallText | None
+	# end: auto-generated types
+
+	pass
+
+
+def get_bom_closure(
+	bom_nos: list[str], closure: dict | None = None, visiting: frozenset = frozenset()
+) -> dict[str, list[frappe._dict]]:
+	"""Returns the flattened tree of each BOM, ordered as per the BOM tree.
+
+	Each row is a BOM Item found at any depth under the BOM, with its quantity multiplied
+	by the quantities of the sub assemblies above it. BOMs which are not submitted have no
+	closure stored, it is built from their BOM Items instead. Cancelled BOMs are not expanded.
+	"""
+
+	closure = closure if closure is not None else {}
+	to_load = list(
+		{bom_no for bom_no in bom_nos if bom_no and bom_no not in closure and bom_no not in visiting}
+	)
+
+	for names in create_batch(to_load, 500):
+		for row in frappe.get_all(
+			"BOM Closure",
+			filters={"bom": ("in", names)},
+			fields=CLOSURE_FIELDS,
+			order_by="sort_key",
+		):
+			closure.setdefault(row.bom, []).append(row)
+
+	to_build = [bom_no for bom_no in to_load if bom_no not in closure]
+	cancelled = set(
+		frappe.get_all("BOM", filters={"name": ("in", to_build), "docstatus": 2}, pluck="name")
+		if to_build
+		else []
+	)
+
+	for bom_no in to_build:
+		closure[bom_no] = [] if bom_no in cancelled else build_bom_closure(bom_no, closure, visiting)
+
+	return closure
+
+
+def build_bom_closure(
+	bom_no: str, closure: dict | None = None, visiting: frozenset = frozenset()
+) -> list[frappe._dict]:
+	"""Builds the flattened tree of the BOM from its BOM Items and the closure of its sub
+	assembly BOMs. A BOM already being expanded is not expanded again, to stop at recursion."""
+
+	closure = closure if closure is not None else {}
+	visiting = visiting | {bom_no}
+
+	items = frappe.get_all(
+		"BOM Item",
+		filters={"parent": bom_no, "parenttype": "BOM"},
+		fields=["name", "idx", "item_code", "bom_no", "qty"],
+		order_by="idx",
+	)
+
+	get_bom_closure([d.bom_no for d in items], closure, visiting)
+
+	rows = []
+	for item in items:
+		sort_key = f"{cint(item.idx):05d}"
+		rows.append(
+			frappe._dict(
+				bom=bom_no,
+				parent_bom=bom_no,
+				bom_item=item.name,
+				item_code=item.item_code,
+				bom_no=item.bom_no,
+				depth=0,
+				qty=flt(item.qty),
+				sort_key=sort_key,
+			)
+		)
+
+		for child in closure.get(item.bom_no, []) if item.bom_no else []:
+			rows.append(
+				frappe._dict(
+					child,
+					bom=bom_no,
+					depth=cint(child.depth) + 1,
+					qty=flt(item.qty) * flt(child.qty),
+					sort_key=f"{sort_key}/{child.sort_key}",
+				)
+			)
+
+	return rows
+
+
+def update_bom_closure(bom_no: str) -> None:
+	delete_bom_closure(bom_no)
+
+	timestamp, user = now(), frappe.session.user
+	values = [
+		(frappe.generate_hash(length=10), timestamp, timestamp, user, user, *(row[f] for f in CLOSURE_FIELDS))
+		for row in build_bom_closure(bom_no)
+	]
+
+	frappe.db.bulk_insert(
+		"BOM Closure",
+		fields=["name", "creation", "modified", "owner", "modified_by", *CLOSURE_FIELDS],
+		values=values,
+	)
+
+
+def delete_bom_closure(bom_no: str) -> None:
+	frappe.db.delete("BOM Closure", {"bom": bom_no})
+
+
+def update_ancestor_closures(bom_no: str) -> None:
+	"Rebuild the closure of the BOMs having the given BOM in their tree, the lower levels first."
+
+	closure = frappe.qb.DocType("BOM Closure")
+	ancestors = (
+		frappe.qb.from_(closure)
+		.select(closure.bom, Max(closure.depth).as_("depth"))
+		.where(closure.bom_no == bom_no)
+		.groupby(closure.bom)
+		.orderby(Max(closure.depth))
+		.run(as_dict=True)
+	)
+
+	for row in ancestors:
+		update_bom_closure(row.bom)
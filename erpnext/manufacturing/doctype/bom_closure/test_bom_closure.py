@@ -0,0 +1,68 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from erpnext.manufacturing.doctype.bom.test_bom import create_nested_bom
+from erpnext.manufacturing.doctype.bom_closure.bom_closure import build_bom_closure, get_bom_closure
+from erpnext.manufacturing.doctype.bom_update_tool.bom_update_tool import enqueue_replace_bom
+
+
+class UnitTestBOMClosure(UnitTestCase):
+	"""
+	Unit tests for BOMClosure.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class TestBOMClosure(IntegrationTestCase):
+	def test_closure_on_submit_and_cancel(self):
+		bom_tree = {"Closure Item A": {"Closure Item B": {"Closure Item C": {}}, "Closure Item D": {}}}
+		root_bom = create_nested_bom(bom_tree, prefix="")
+
+		closure = get_bom_closure([root_bom.name])[root_bom.name]
+		self.assertEqual(
+			[(row.item_code, row.depth) for row in closure],
+			[("Closure Item B", 0), ("Closure Item C", 1), ("Closure Item D", 0)],
+		)
+		self.assertEqual(frappe.db.count("BOM Closure", {"bom": root_bom.name}), 3)
+
+		# stored closure matches the one built from the BOM Items
+		self.assertEqual(
+			[(row.item_code, row.depth, row.qty) for row in closure],
+			[(row.item_code, row.depth, row.qty) for row in build_bom_closure(root_bom.name)],
+		)
+
+		root_bom.cancel()
+		self.assertFalse(frappe.db.exists("BOM Closure", {"bom": root_bom.name}))
+
+	def test_closure_on_replace_bom(self):
+		bom_tree = {"Closure Item E": {"Closure Item F": {"Closure Item G": {}}}}
+		root_bom = create_nested_bom(bom_tree, prefix="")
+		old_bom = frappe.db.get_value("BOM", {"item": "Closure Item F", "docstatus": 1})
+
+		new_bom = create_nested_bom({"Closure Item F": {"Closure Item H": {}}}, prefix="")
+		enqueue_replace_bom(boms=frappe._dict(current_bom=old_bom, new_bom=new_bom.name))
+
+		closure = get_bom_closure([root_bom.name])[root_bom.name]
+		self.assertEqual(
+			[(row.item_code, row.bom_no or None) for row in closure],
+			[("Closure Item F", new_bom.name), ("Closure Item H", None)],
+		)
+
+	def test_closure_on_cancel_of_sub_assembly(self):
+		bom_tree = {"Closure Item J": {"Closure Item K": {"Closure Item L": {}}}}
+		root_bom = create_nested_bom(bom_tree, prefix="")
+		sub_assembly_bom = frappe.get_doc("BOM", root_bom.items[0].bom_no)
+
+		# an inactive BOM does not stop the cancellation of its sub assembly BOM
+		root_bom.db_set("is_active", 0)
+		sub_assembly_bom.flags.ignore_links = True
+		sub_assembly_bom.cancel()
+
+		closure = get_bom_closure([root_bom.name])[root_bom.name]
+		self.assertEqual([row.item_code for row in closure], ["Closure Item K"])
+		self.assertEqual(frappe.db.count("BOM Closure", {"bom": root_bom.name}), 1)
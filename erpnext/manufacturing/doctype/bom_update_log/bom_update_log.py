@@ -181,15 +181,15 @@ def process_boms_cost_level_wise(
 
 
 def queue_bom_cost_jobs(current_boms_list: list[str], update_doc: "BOMUpdateLog", current_level: int) -> None:
-	"Queue batches of 20k BOMs of the same level to process parallelly"
+	"Queue batches of 1k BOMs of the same level to process parallelly"
 	batch_no = 0
 
 	while current_boms_list:
 		batch_no += 1
-		batch_size = 7_000
-		boms_to_process = current_boms_list[:batch_size]  # slice out batch of 20k BOMs
+		batch_size = 1_000
+		boms_to_process = current_boms_list[:batch_size]  # slice out batch of 1k BOMs
 
-		# update list to exclude 20K (queued) BOMs
+		# update list to exclude 1K (queued) BOMs
 		current_boms_list = current_boms_list[batch_size:] if len(current_boms_list) > batch_size else []
 
 		batch_row = update_doc.append(
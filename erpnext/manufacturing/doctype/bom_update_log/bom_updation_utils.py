@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
 import frappe
 from frappe import _
+from frappe.utils import create_batch, flt
+from pypika import Case
+
+from erpnext.manufacturing.doctype.bom.bom_graph import clear_bom_graph, get_bom_graph
+from erpnext.manufacturing.doctype.bom_closure.bom_closure import update_ancestor_closures
 
 
 def replace_bom(boms: dict, log_name: str) -> None:
@@ -22,7 +27,8 @@ def replace_bom(boms: dict, log_name: str) -> None:
 	unit_cost = get_bom_unit_cost(new_bom)
 	update_new_bom_in_bom_items(unit_cost, current_bom, new_bom)
 
-	frappe.cache().delete_key("bom_children")
+	update_ancestor_closures(current_bom)
+	clear_bom_graph()
 	parent_boms = get_ancestor_boms(new_bom)
 
 	for bom in parent_boms:
@@ -35,6 +41,7 @@ def replace_bom(boms: dict, log_name: str) -> None:
 		bom_obj.calculate_cost()
 		bom_obj.update_parent_cost()
 		bom_obj.db_update()
+		clear_bom_graph()
 		bom_obj.flags.updater_reference = {
 			"doctype": "BOM Update Log",
 			"docname": log_name,
@@ -112,17 +119,116 @@ def get_bom_unit_cost(bom_name: str) -> float:
 	return frappe.utils.flt(new_bom_unitcost[0][0])
 
 
-def update_cost_in_boms(bom_list: list[str]) -> None:
-	"Updates cost in given BOMs. Returns current and total updated BOMs."
+# Cost fields recalculated by `BOM.calculate_cost`
+BOM_COST_FIELDS = {
+	"BOM": [
+		"operating_cost",
+		"base_operating_cost",
+		"raw_material_cost",
+		"base_raw_material_cost",
+		"scrap_material_cost",
+		"base_scrap_material_cost",
+		"total_cost",
+		"base_total_cost",
+	],
+	"BOM Item": ["rate", "base_rate", "amount", "base_amount", "qty_consumed_per_unit"],
+	"BOM Scrap Item": ["base_rate", "amount", "base_amount"],
+	"BOM Explosion Item": ["rate", "amount"],
+	"BOM Operation": [
+		"hour_rate",
+		"base_hour_rate",
+		"operating_cost",
+		"base_operating_cost",
+		"cost_per_unit",
+		"base_cost_per_unit",
+	],
+}
 
-	for index, bom in enumerate(bom_list):
-		bom_doc = frappe.get_doc("BOM", bom, for_update=True)
-		bom_doc.calculate_cost(save_updates=True, update_hour_rate=True)
-		bom_doc.db_update()
 
-		if (index % 50 == 0) and not frappe.flags.in_test:
+def update_cost_in_boms(bom_list: list[str]) -> None:
+	"""Updates cost in given BOMs. Only the changed cost fields are written, with bulk updates.
+
+	BOMs must be listed after their sub assemblies, the cost of a sub assembly recalculated
+	earlier in the same call is used by the BOMs after it."""
+
+	clear_bom_graph()
+	graph = get_bom_graph()
+	valuation_rates = {}
+
+	for batch in create_batch(bom_list, 50):
+		# rates of the sub assemblies, already updated in the previous level or earlier in this batch
+		bom_nos = list(set(batch) | set(get_child_boms(batch)))
+		graph.load_boms(bom_nos, with_children=False)
+		graph.load_exploded_items(bom_nos)
+
+		cost_updates = defaultdict(dict)
+		for bom in batch:
+			bom_doc = frappe.get_doc("BOM", bom, for_update=True)
+			bom_doc.flags.defer_cost_updates = True
+			bom_doc.flags.valuation_rate_cache = valuation_rates
+
+			old_values = get_cost_values(bom_doc)
+			bom_doc.calculate_cost(update_hour_rate=True)
+			bom_doc.calculate_exploded_cost(save=False)
+			graph.update_costs(bom_doc)
+
+			for key, values in get_cost_values(bom_doc).items():
+				if changed := {
+					field: value
+					for field, value in values.items()
+					if flt(value) != flt(old_values[key][field])
+				}:
+					doctype, name = key
+					cost_updates[doctype][name] = changed
+
+		for doctype, updates in cost_updates.items():
+			bulk_update_cost_fields(doctype, updates)
+
+		if not frappe.flags.in_test:
 			frappe.db.commit()  # nosemgrep
 
+	clear_bom_graph()
+
+
+def get_child_boms(bom_list: list[str]) -> list[str]:
+	return frappe.get_all(
+		"BOM Item",
+		filters={"parent": ("in", bom_list), "parenttype": "BOM", "bom_no": ("is", "set")},
+		pluck="bom_no",
+		distinct=True,
+	)
+
+
+def get_cost_values(bom_doc) -> dict[tuple[str, str], dict[str, Any]]:
+	"Returns the cost fields of the BOM and its rows, keyed by (doctype, name)."
+
+	rows = [bom_doc]
+	for table in ("items", "scrap_items", "exploded_items", "operations"):
+		rows.extend(bom_doc.get(table))
+
+	return {
+		(row.doctype, row.name): {field: row.get(field) for field in BOM_COST_FIELDS[row.doctype]}
+		for row in rows
+	}
+
+
+def bulk_update_cost_fields(doctype: str, updates: dict[str, dict[str, Any]]) -> None:
+	"Update the changed fields of many records with one query per field."
+
+	values_by_field = defaultdict(dict)
+	for name, values in updates.items():
+		for field, value in values.items():
+			values_by_field[field][name] = value
+
+	table = frappe.qb.DocType(doctype)
+	for field, values in values_by_field.items():
+		for names in create_batch(list(values), 500):
+			case = Case()
+			for name in names:
+				case = case.when(table.name == name, values[name])
+
+			frappe.qb.update(table).set(table[field], case).where(table.name.isin(names)).run()
+
 
 def get_next_higher_level_boms(child_boms: list[str], processed_boms: dict[str, bool]) -> list[str]:
 	"Generate immediate higher level dependants with no unresolved dependencies (children)."
@@ -0,0 +1,225 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import datetime
+from bisect import bisect_right
+
+import frappe
+from frappe.utils import cint, flt, get_datetime
+
+from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
+	get_mins_between_operations,
+)
+from erpnext.manufacturing.doctype.workstation.workstation_calendar import (
+	WorkstationCalendar,
+	get_workstation_calendar,
+)
+
+
+class WorkstationCapacity:
+	"""Capacity of a workstation used over time.
+
+	Kept as a step function: `times` are the sorted points at which the usage changes and
+	`usage[i]` is the number of operations running from `times[i]` until `times[i + 1]`, so
+	that free slots are found with a binary search instead of a query per slot.
+	"""
+
+	def __init__(self, production_capacity: int = 1) -> None:
+		self.production_capacity = max(cint(production_capacity), 1)
+		self.times: list[datetime.datetime] = []
+		self.usage: list[int] = []
+
+	def reserve(self, from_time: datetime.datetime, to_time: datetime.datetime) -> None:
+		if from_time >= to_time:
+			return
+
+		start, end = self.add_point(from_time), self.add_point(to_time)
+		for idx in range(start, end):
+			self.usage[idx] += 1
+
+	def add_point(self, time: datetime.datetime) -> int:
+		idx = bisect_right(self.times, time)
+		if idx and self.times[idx - 1] == time:
+			return idx - 1
+
+		self.times.insert(idx, time)
+		self.usage.insert(idx, self.usage[idx - 1] if idx else 0)
+		return idx
+
+	def get_free_slot(
+		self, from_time: datetime.datetime
+	) -> tuple[datetime.datetime, datetime.datetime | None]:
+		"""Returns the earliest (start, end) period at or after `from_time` with spare capacity.
+		End is None if the workstation has spare capacity from start onwards."""
+
+		idx = bisect_right(self.times, from_time) - 1
+		# usage after the last point is always zero, so this stops within the list
+		while idx >= 0 and self.usage[idx] >= self.production_capacity:
+			idx += 1
+
+		start = max(from_time, self.times[idx]) if idx >= 0 else from_time
+
+		idx += 1
+		while idx < len(self.times) and self.usage[idx] < self.production_capacity:
+			idx += 1
+
+		return start, self.times[idx] if idx < len(self.times) else None
+
+
+class CapacityPlanner:
+	"""Places operations on workstations as per their free capacity.
+
+	The working hours, holidays and scheduled Job Cards of the workstations are loaded once,
+	so the operations of many Job Cards are planned without querying again for every slot.
+	Reserve the slots of every planned operation so that the next ones are planned after it.
+	"""
+
+	def __init__(self, plan_days: int | None = None) -> None:
+		self.plan_days = plan_days or (
+			cint(frappe.db.get_single_value("Manufacturing Settings", "capacity_planning_for_days")) or 30
+		)
+		self.allow_overtime = cint(frappe.db.get_single_value("Manufacturing Settings", "allow_overtime"))
+		self.mins_between_operations = get_mins_between_operations()
+
+		self.workstations: dict[str, frappe._dict] = {}
+		self.calendars: dict[str, WorkstationCalendar] = {}
+		self.capacities: dict[str, WorkstationCapacity] = {}
+		self.loaded_from: dict[str, datetime.datetime] = {}
+
+	def load_workstations(self, workstations: list[str], from_time) -> None:
+		"""Load the workstations along with the time logs of the Job Cards which end after `from_time`."""
+
+		from_time = get_datetime(from_time)
+		to_load = list(
+			{
+				workstation
+				for workstation in workstations
+				if workstation
+				and (workstation not in self.loaded_from or from_time < self.loaded_from[workstation])
+			}
+		)
+
+		if not to_load:
+			return
+
+		for workstation in frappe.get_all(
+			"Workstation",
+			filters={"name": ("in", to_load)},
+			fields=["name", "production_capacity"],
+		):
+			self.workstations[workstation.name] = workstation
+			self.calendars[workstation.name] = get_workstation_calendar(workstation.name, from_time)
+
+		for workstation in to_load:
+			details = self.workstations.get(workstation)
+			self.capacities[workstation] = WorkstationCapacity(details.production_capacity if details else 1)
+			self.loaded_from[workstation] = from_time
+
+		for row in get_scheduled_time_logs(to_load, from_time - self.mins_between_operations):
+			self.capacities[row.workstation].reserve(
+				row.from_time, row.to_time + self.mins_between_operations
+			)
+
+	def get_working_periods(self, workstation: str, from_time: datetime.datetime):
+		"""Yields the (start, end) periods in which the workstation works from `from_time` onwards.
+		End is None if the workstation works round the clock."""
+
+		calendar = self.calendars.get(workstation)
+		if not calendar or self.allow_overtime:
+			yield from_time, None
+			return
+
+		yield from calendar.get_periods(from_time)
+
+	def get_slots(self, workstation: str, from_time, time_in_mins: float) -> list[tuple]:
+		"""Returns the (from_time, to_time) slots in which an operation can run on the workstation,
+		starting at or after `from_time`. Empty if it does not fit in the planning horizon."""
+
+		from_time = get_datetime(from_time)
+		self.load_workstations([workstation], from_time)
+
+		capacity = self.capacities[workstation]
+		horizon = from_time + datetime.timedelta(days=self.plan_days + 1)
+		remaining_time = datetime.timedelta(minutes=flt(time_in_mins))
+
+		slots = []
+		for period_start, period_end in self.get_working_periods(workstation, from_time):
+			if period_start > horizon:
+				return []
+
+			start = period_start
+			while True:
+				start, free_till = capacity.get_free_slot(start)
+				if (period_end and start >= period_end) or start > horizon:
+					break
+
+				end = start + remaining_time
+				if period_end:
+					end = min(end, period_end)
+
+				if not free_till or free_till >= end:
+					slots.append((start, end))
+					remaining_time -= end - start
+					break
+
+				# the slot is too short, an operation is not split to run around another one
+				start = free_till
+
+			if remaining_time <= datetime.timedelta(0):
+				return slots
+
+		return []
+
+	def schedule(self, workstations: list[str], from_time, time_in_mins: float) -> tuple[str | None, list]:
+		"""Returns the workstation, out of the given ones, on which the operation can be started
+		the earliest, along with its slots."""
+
+		if not workstations:
+			from_time = get_datetime(from_time)
+			return None, [(from_time, from_time + datetime.timedelta(minutes=flt(time_in_mins)))]
+
+		self.load_workstations(workstations, from_time)
+
+		workstation, slots = workstations[0], []
+		for name in workstations:
+			if (name_slots := self.get_slots(name, from_time, time_in_mins)) and (
+				not slots or name_slots[0][0] < slots[0][0]
+			):
+				workstation, slots = name, name_slots
+
+		return workstation, slots
+
+	def reserve(self, workstation: str, slots: list[tuple]) -> None:
+		if capacity := self.capacities.get(workstation):
+			for from_time, to_time in slots:
+				capacity.reserve(from_time, to_time + self.mins_between_operations)
+
+
+def get_scheduled_time_logs(workstations: list[str], from_time: datetime.datetime) -> list[frappe._dict]:
+	"""Time logs of the workstations ending after `from_time`, along with the scheduled time of the
+	Job Cards which are not started yet."""
+
+	jc = frappe.qb.DocType("Job Card")
+
+	time_logs = []
+	for doctype in ("Job Card Time Log", "Job Card Scheduled Time"):
+		jctl = frappe.qb.DocType(doctype)
+		query = (
+			frappe.qb.from_(jctl)
+			.inner_join(jc)
+			.on(jctl.parent == jc.name)
+			.select(jc.workstation, jctl.from_time, jctl.to_time)
+			.where(
+				(jc.workstation.isin(workstations))
+				& (jc.docstatus < 2)
+				& (jctl.from_time.isnotnull())
+				& (jctl.to_time > from_time)
+			)
+		)
+
+		if doctype == "Job Card Scheduled Time":
+			query = query.where(jc.total_time_in_mins == 0)
+
+		time_logs.extend(query.run(as_dict=True))
+
+	return time_logs
@@ -5,10 +5,11 @@
 from typing import Literal
 
 import frappe
-from frappe.tests import IntegrationTestCase, UnitTestCase
-from frappe.utils import random_string
+from frappe.tests import IntegrationTestCase, UnitTestCase, timeout
+from frappe.utils import get_datetime, random_string
 from frappe.utils.data import add_to_date, now, today
 
+from erpnext.manufacturing.doctype.job_card.capacity_planner import CapacityPlanner
 from erpnext.manufacturing.doctype.job_card.job_card import (
 	JobCardOverTransferError,
 	OperationMismatchError,
@@ -194,6 +195,59 @@ class TestJobCard(IntegrationTestCase):
 		jc2.save()
 		self.assertTrue(jc2.name)
 
+	def test_capacity_planner_with_working_hours(self):
+		frappe.db.set_single_value("Manufacturing Settings", "allow_overtime", 0)
+
+		workstation = frappe.get_doc(
+			{
+				"doctype": "Workstation",
+				"workstation_name": random_string(5),
+				"production_capacity": 1,
+				"working_hours": [
+					{"start_time": "09:00:00", "end_time": "13:00:00"},
+					{"start_time": "14:00:00", "end_time": "18:00:00"},
+				],
+			}
+		).insert()
+
+		planner = CapacityPlanner(plan_days=30)
+		gap = planner.mins_between_operations
+
+		# operation is split as per the working hours
+		name, slots = planner.schedule([workstation.name], "2024-01-01 08:00:00", 600)
+		planner.reserve(name, slots)
+		self.assertEqual(
+			slots,
+			[
+				(get_datetime("2024-01-01 09:00:00"), get_datetime("2024-01-01 13:00:00")),
+				(get_datetime("2024-01-01 14:00:00"), get_datetime("2024-01-01 18:00:00")),
+				(get_datetime("2024-01-02 09:00:00"), get_datetime("2024-01-02 11:00:00")),
+			],
+		)
+
+		# next operation starts after the first one, the gap before the breaks is too short
+		name, slots = planner.schedule([workstation.name], "2024-01-01 08:00:00", 60)
+		start = get_datetime("2024-01-02 11:00:00") + gap
+		self.assertEqual(slots, [(start, add_to_date(start, minutes=60))])
+
+	@timeout(seconds=60)
+	def test_capacity_planner_benchmark(self):
+		workstation = make_workstation(workstation_name=random_string(5)).name
+		frappe.db.set_value("Workstation", workstation, "production_capacity", 2)
+
+		planner = CapacityPlanner(plan_days=365)
+		from_time = get_datetime("2024-01-01 00:00:00")
+		gap = planner.mins_between_operations
+
+		end_times = []
+		for _i in range(2000):
+			name, slots = planner.schedule([workstation], from_time, 30)
+			planner.reserve(name, slots)
+			end_times.append(slots[-1][1])
+
+		# two operations run in parallel, one after the other
+		self.assertEqual(max(end_times), add_to_date(from_time + gap * 999, minutes=999 * 30 + 30))
+
 	def test_job_card_multiple_materials_transfer(self):
 		"Test transferring RMs separately against Job Card with multiple RMs."
 		self.transfer_material_against = "Job Card"
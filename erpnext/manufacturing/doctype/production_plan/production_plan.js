@@ -124,6 +124,10 @@ frappe.ui.form.on("Production Plan", {
 						},
 						__("Create")
 					);
+
+					frm.add_custom_button(__("Schedule Work Orders"), () => {
+						frm.trigger("schedule_work_orders");
+					});
 				}
 
 				if (
@@ -216,6 +220,14 @@ frappe.ui.form.on("Production Plan", {
 		});
 	},
 
+	schedule_work_orders(frm) {
+		frappe.call({
+			method: "schedule_work_orders",
+			freeze: true,
+			doc: frm.doc,
+		});
+	},
+
 	make_material_request(frm) {
 		frappe.confirm(
 			__("Do you want to submit the material request"),
@@ -4,29 +4,34 @@
 
 import copy
 import json
+from collections import defaultdict
 
 import frappe
 from frappe import _, msgprint
 from frappe.model.document import Document
-from frappe.query_builder.functions import IfNull, Sum
+from frappe.query_builder.functions import IfNull, Max, Min, Sum
 from frappe.utils import (
 	add_days,
 	ceil,
 	cint,
 	comma_and,
+	create_batch,
 	flt,
+	get_datetime,
 	get_link_to_form,
 	getdate,
 	now_datetime,
 	nowdate,
+	time_diff_in_hours,
 )
 from frappe.utils.csvutils import build_csv_response
 from pypika.terms import ExistsCriterion
 
-from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
 from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
+from erpnext.manufacturing.doctype.bom.bom_graph import get_bom_graph
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
+from erpnext.stock.doctype.warehouse.warehouse import get_warehouse_subtree
 from erpnext.stock.get_item_details import get_conversion_factor
 from erpnext.stock.utils import get_or_make_bin
 from erpnext.utilities.transaction_base import validate_uom_is_integer
@@ -849,6 +854,101 @@ class ProductionPlan(Document):
 		except OverProductionError:
 			pass
 
+	@frappe.whitelist()
+	def schedule_work_orders(self):
+		self.check_permission("write")
+		if not frappe.db.exists("Work Order", {"production_plan": self.name, "docstatus": 0}):
+			frappe.throw(_("There are no draft Work Orders to schedule"))
+
+		frappe.enqueue(
+			self.submit_and_schedule_work_orders,
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+		)
+
+		frappe.msgprint(
+			_("Work Orders scheduling has been enqueued, kindly check the comments after some time"),
+			alert=True,
+		)
+
+	def submit_and_schedule_work_orders(self):
+		"""Submit the draft Work Orders of the plan, planning their Job Cards against the shared
+		capacity of the workstations.
+
+		Sub assemblies of the deepest BOM level are planned first, then the Work Orders with the
+		earliest expected delivery date and planned start date, so that each Work Order gets the
+		slots left by the ones planned before it.
+		"""
+		from erpnext.manufacturing.doctype.job_card.capacity_planner import CapacityPlanner
+
+		work_orders = self.get_work_orders_to_schedule()
+		if not work_orders:
+			return
+
+		planner = CapacityPlanner()
+		scheduled, failed = [], []
+
+		for index, work_order in enumerate(work_orders, start=1):
+			doc = frappe.get_doc("Work Order", work_order.name)
+			doc.flags.capacity_planner = planner
+
+			try:
+				frappe.db.savepoint("schedule_work_order")
+				doc.submit()
+				scheduled.append(doc.name)
+			except Exception:
+				frappe.db.rollback(save_point="schedule_work_order")
+				doc.log_error(_("Work Order scheduling failed"))
+				failed.append(doc.name)
+				# slots reserved for the failed Work Order are released by reloading the capacity
+				planner = CapacityPlanner()
+
+			frappe.publish_progress(
+				index * 100 / len(work_orders),
+				title=_("Scheduling Work Orders..."),
+				doctype=self.doctype,
+				docname=self.name,
+			)
+
+		summary = get_schedule_summary(scheduled)
+		message = _(
+			"{0} Work Orders scheduled with a makespan of {1} hours and a workstation utilisation of {2}%."
+		).format(len(scheduled), flt(summary.makespan, 2), flt(summary.utilisation, 2))
+
+		if failed:
+			message += " " + _("Failed to schedule the Work Orders {0}, check the Error Log.").format(
+				comma_and(failed)
+			)
+
+		self.add_comment("Comment", message)
+		return summary
+
+	def get_work_orders_to_schedule(self):
+		bom_levels = {row.name: cint(row.bom_level) + 1 for row in self.sub_assembly_items}
+
+		work_orders = frappe.get_all(
+			"Work Order",
+			filters={"production_plan": self.name, "docstatus": 0},
+			fields=[
+				"name",
+				"production_plan_sub_assembly_item",
+				"expected_delivery_date",
+				"planned_start_date",
+				"creation",
+			],
+		)
+
+		return sorted(
+			work_orders,
+			key=lambda d: (
+				-bom_levels.get(d.production_plan_sub_assembly_item, 0),
+				getdate(d.expected_delivery_date or "9999-12-31"),
+				get_datetime(d.planned_start_date or "9999-12-31"),
+				d.creation,
+			),
+		)
+
 	@frappe.whitelist()
 	def make_material_request(self):
 		"""Create Material Requests grouped by Sales Order and Material Request Type"""
@@ -1128,48 +1228,44 @@ def download_raw_materials(doc, warehouses=None):
 
 
 def get_exploded_items(item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None):
-	bei = frappe.qb.DocType("BOM Explosion Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	data = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
-		.left_join(item_default)
-		.on((item_default.parent == item.name) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
-			item.item_name,
-			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
-			item.min_order_qty,
-			bei.source_warehouse,
-			item.default_material_request_type,
-			item.min_order_qty,
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-			item.safety_stock,
-		)
-		.where(
-			(bei.docstatus < 2)
-			& (bom.name == bom_no)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bei.item_code, bei.stock_uom)
-	).run(as_dict=True)
+	graph = get_bom_graph()
+	bom = graph.get_bom(bom_no)
+	if not bom:
+		return item_details
+
+	exploded_items = [d for d in graph.get_exploded_items(bom_no) if d.docstatus < 2]
+	items = graph.get_items([d.item_code for d in exploded_items], company)
+	bom_quantity = flt(bom.quantity) or 1
+
+	data = {}
+	for row in exploded_items:
+		item = items.get(row.item_code)
+		if not item or (not include_non_stock_items and not item.is_stock_item):
+			continue
+
+		key = (row.item_code, row.stock_uom)
+		if key not in data:
+			data[key] = frappe._dict(
+				{
+					"qty": 0.0,
+					"item_name": item.item_name,
+					"item_code": item.name,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"min_order_qty": item.min_order_qty,
+					"source_warehouse": row.source_warehouse,
+					"default_material_request_type": item.default_material_request_type,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+					"safety_stock": item.safety_stock,
+				}
+			)
 
-	for d in data:
-		if not d.conversion_factor and d.purchase_uom:
-			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+		data[key].qty += flt(row.stock_qty) / bom_quantity
+
+	for d in data.values():
+		d.qty *= planned_qty
 		item_details.setdefault(d.get("item_code"), d)
 
 	return item_details
@@ -1192,73 +1288,21 @@ def get_subitems(
 	parent_qty,
 	planned_qty=1,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
-		.left_join(item_default)
-		.on((item.name == item_default.parent) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			bom_item.item_code,
-			item.default_material_request_type,
-			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
-			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
-			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
-			item.min_order_qty.as_("min_order_qty"),
-			item.safety_stock.as_("safety_stock"),
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-		)
-		.where(
-			(bom.name == bom_no)
-			& (bom_item.docstatus < 2)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bom_item.item_code)
-	).run(as_dict=True)
-
-	for d in items:
-		if not data.get("include_exploded_items") or not d.default_bom:
-			if d.item_code in item_details:
-				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
-			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+	bom_items = get_bom_graph().get_bom_item_details(
+		bom_no,
+		company,
+		cint(include_non_stock_items),
+		cint(include_subcontracted_items),
+		cint(data.get("include_exploded_items")),
+	)
 
-				item_details[d.item_code] = d
+	for d, qty in bom_items:
+		qty = parent_qty * qty * planned_qty
+		if d.item_code in item_details:
+			item_details[d.item_code].qty = item_details[d.item_code].qty + qty
+		else:
+			item_details[d.item_code] = frappe._dict(d, qty=qty)
 
-		if data.get("include_exploded_items") and d.default_bom:
-			if (
-				d.default_material_request_type in ["Manufacture", "Purchase"] and not d.is_sub_contracted
-			) or (d.is_sub_contracted and include_subcontracted_items):
-				if d.qty > 0:
-					get_subitems(
-						doc,
-						data,
-						item_details,
-						d.default_bom,
-						company,
-						include_non_stock_items,
-						include_subcontracted_items,
-						d.qty,
-					)
 	return item_details
 
 
@@ -1298,7 +1342,7 @@ def get_material_request_items(
 
 			required_qty = required_qty / row["conversion_factor"]
 
-	if frappe.db.get_value("UOM", row["purchase_uom"], "must_be_whole_number"):
+	if frappe.get_cached_value("UOM", row["purchase_uom"], "must_be_whole_number"):
 		required_qty = ceil(required_qty)
 
 	if include_safety_stock:
@@ -1415,18 +1459,52 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 	if isinstance(row, str):
 		row = frappe._dict(json.loads(row))
 
-	bin = frappe.qb.DocType("Bin")
-	wh = frappe.qb.DocType("Warehouse")
-
-	subquery = frappe.qb.from_(wh).select(wh.name).where(wh.company == company)
-
 	warehouse = ""
 	if not all_warehouse:
 		warehouse = for_warehouse or row.get("source_warehouse") or row.get("default_warehouse")
 
-	if warehouse:
-		lft, rgt = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"])
-		subquery = subquery.where((wh.lft >= lft) & (wh.rgt <= rgt) & (wh.name == bin.warehouse))
+	bin = frappe.qb.DocType("Bin")
+	query = get_bin_details_query(company, warehouse).where(bin.item_code == row["item_code"])
+
+	return query.run(as_dict=True)
+
+
+def get_bin_details_for_rows(rows, company, for_warehouse=None):
+	"""Bin details of all the rows, fetched with one query per warehouse instead of one per row.
+
+	Returns a dict of (item_code, warehouse) -> bin details of each warehouse in the subtree, where
+	warehouse is the one `get_bin_details` would have used for the row. Unlike the totals of
+	`erpnext.stock.get_item_details.get_bin_details_map`, the planning needs the details per warehouse.
+	"""
+
+	item_codes_by_warehouse = defaultdict(set)
+	for row in rows:
+		warehouse = for_warehouse or row.get("source_warehouse") or row.get("default_warehouse") or ""
+		item_codes_by_warehouse[warehouse].add(row.get("item_code"))
+
+	bin = frappe.qb.DocType("Bin")
+	bin_details = defaultdict(list)
+	for warehouse, item_codes in item_codes_by_warehouse.items():
+		for batch in create_batch(list(item_codes), 1000):
+			query = (
+				get_bin_details_query(company, warehouse)
+				.select(bin.item_code)
+				.where(bin.item_code.isin(batch))
+				.orderby(bin.item_code)
+				.orderby(bin.warehouse)
+			)
+
+			for d in query.run(as_dict=True):
+				bin_details[(d.pop("item_code"), warehouse)].append(d)
+
+	return bin_details
+
+
+def get_bin_details_query(company, warehouse=None):
+	bin = frappe.qb.DocType("Bin")
+	wh = frappe.qb.DocType("Warehouse")
+
+	subquery = frappe.qb.from_(wh).select(wh.name).where(wh.company == company)
 
 	query = (
 		frappe.qb.from_(bin)
@@ -1438,11 +1516,14 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 			IfNull(Sum(bin.reserved_qty_for_production), 0).as_("reserved_qty_for_production"),
 			IfNull(Sum(bin.planned_qty), 0).as_("planned_qty"),
 		)
-		.where((bin.item_code == row["item_code"]) & (bin.warehouse.isin(subquery)))
+		.where(bin.warehouse.isin(subquery))
 		.groupby(bin.item_code, bin.warehouse)
 	)
 
-	return query.run(as_dict=True)
+	if warehouse:
+		query = query.where(bin.warehouse.isin(get_warehouse_subtree(warehouse)))
+
+	return query
 
 
 @frappe.whitelist()
@@ -1612,11 +1693,20 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 			else:
 				so_item_details[sales_order][item_code] = details
 
+	bin_details = get_bin_details_for_rows(
+		[details for item_dict in so_item_details.values() for details in item_dict.values()],
+		doc.company,
+		warehouse,
+	)
+
 	mr_items = []
 	for sales_order in so_item_details:
 		item_dict = so_item_details[sales_order]
 		for details in item_dict.values():
-			bin_dict = get_bin_details(details, doc.company, warehouse)
+			bin_warehouse = (
+				warehouse or details.get("source_warehouse") or details.get("default_warehouse") or ""
+			)
+			bin_dict = bin_details.get((details.get("item_code"), bin_warehouse))
 			bin_dict = bin_dict[0] if bin_dict else {}
 
 			if details.qty > 0:
@@ -1634,9 +1724,13 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 					mr_items.append(items)
 
 	if (not ignore_existing_ordered_qty or get_parent_warehouse_data) and warehouses:
+		item_locations = get_item_locations_map([item.get("item_code") for item in mr_items], warehouses)
+
 		new_mr_items = []
 		for item in mr_items:
-			get_materials_from_other_locations(item, warehouses, new_mr_items, company)
+			get_materials_from_other_locations(
+				item, warehouses, new_mr_items, company, locations=item_locations.get(item.get("item_code"))
+			)
 
 		mr_items = new_mr_items
 
@@ -1656,21 +1750,71 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 	return mr_items
 
 
-def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
-	from erpnext.stock.doctype.pick_list.pick_list import get_available_item_locations
+def get_item_locations_map(item_codes, warehouses):
+	"""Available stock in the given warehouses for items without serial and batch nos.
 
-	stock_uom, purchase_uom = frappe.db.get_value(
-		"Item", item.get("item_code"), ["stock_uom", "purchase_uom"]
+	Returns a dict of item_code -> locations in the same order as the Pick List's
+	`get_available_item_locations`, fetched with one query for all the items.
+	"""
+	from erpnext.stock.doctype.pick_list.pick_list import get_rejected_warehouses
+
+	item_codes = list(set(item_codes))
+	if not item_codes or not warehouses:
+		return {}
+
+	bin = frappe.qb.DocType("Bin")
+	query = (
+		frappe.qb.from_(bin)
+		.select(bin.item_code, bin.warehouse, bin.actual_qty.as_("qty"))
+		.where((bin.actual_qty > 0) & (bin.warehouse.isin(warehouses)))
+		.orderby(bin.creation)
 	)
 
-	locations = get_available_item_locations(
-		item.get("item_code"),
-		warehouses,
-		item.get("quantity") * item.get("conversion_factor"),
-		company,
-		ignore_validation=True,
+	if rejected_warehouses := get_rejected_warehouses():
+		query = query.where(bin.warehouse.notin(rejected_warehouses))
+
+	item_locations = {}
+	for batch in create_batch(item_codes, 1000):
+		# serial and batch items are picked serial / batch wise, leave them to the Pick List
+		batch = frappe.get_all(
+			"Item", filters={"name": ("in", batch), "has_serial_no": 0, "has_batch_no": 0}, pluck="name"
+		)
+		if not batch:
+			continue
+
+		for item_code in batch:
+			item_locations[item_code] = []
+
+		for d in query.where(bin.item_code.isin(batch)).run(as_dict=True):
+			item_locations[d.pop("item_code")].append(d)
+
+	return item_locations
+
+
+def get_materials_from_other_locations(item, warehouses, new_mr_items, company, locations=None):
+	from erpnext.stock.doctype.pick_list.pick_list import (
+		get_available_item_locations,
+		get_locations_based_on_required_qty,
 	)
 
+	stock_uom, purchase_uom = frappe.get_cached_value(
+		"Item", item.get("item_code"), ["stock_uom", "purchase_uom"]
+	)
+
+	if locations is not None:
+		# prefetched by get_item_locations_map
+		locations = get_locations_based_on_required_qty(
+			[frappe._dict(d) for d in locations], item.get("quantity") * item.get("conversion_factor")
+		)
+	else:
+		locations = get_available_item_locations(
+			item.get("item_code"),
+			warehouses,
+			item.get("quantity") * item.get("conversion_factor"),
+			company,
+			ignore_validation=True,
+		)
+
 	required_qty = item.get("quantity")
 	if item.get("conversion_factor") and item.get("purchase_uom") != item.get("stock_uom"):
 		# Convert qty to stock UOM
@@ -1703,7 +1847,7 @@ def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
 	if flt(required_qty, precision) > 0:
 		required_qty = required_qty
 
-		if frappe.db.get_value("UOM", purchase_uom, "must_be_whole_number"):
+		if frappe.get_cached_value("UOM", purchase_uom, "must_be_whole_number"):
 			required_qty = ceil(required_qty)
 
 		item["quantity"] = required_qty / item.get("conversion_factor")
@@ -1723,14 +1867,37 @@ def get_item_data(item_code):
 
 
 def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=None, indent=0):
-	data = get_bom_children(parent=bom_no)
-	for d in data:
-		if d.expandable:
-			parent_item_code = frappe.get_cached_value("BOM", bom_no, "item")
-			stock_qty = (d.stock_qty / d.parent_bom_qty) * flt(to_produce_qty)
+	frappe.has_permission("BOM", doc=frappe.get_cached_doc("BOM", bom_no), throw=True)
+
+	graph = get_bom_graph()
+	bom = graph.get_bom(bom_no)
+	items = graph.get_items([row.item_code for row in bom.items])
+
+	bin_details_map = {}
+	if warehouse:
+		bin_details_map = get_bin_details_for_rows(
+			[row for row in bom.items if row.bom_no], company, warehouse
+		)
+
+	for row in bom.items:
+		if row.bom_no and (item := items.get(row.item_code)):
+			d = frappe._dict(
+				{
+					"item_code": row.item_code,
+					"value": row.bom_no,
+					"stock_qty": row.stock_qty,
+					"description": item.description,
+					"stock_uom": item.stock_uom,
+					"item_name": item.item_name,
+					"is_sub_contracted_item": item.is_sub_contracted_item,
+				}
+			)
+
+			parent_item_code = bom.item
+			stock_qty = (d.stock_qty / bom.quantity) * flt(to_produce_qty)
 
 			if warehouse:
-				bin_details = get_bin_details(d, company, for_warehouse=warehouse)
+				bin_details = bin_details_map.get((d.item_code, warehouse), [])
 
 				for _bin_dict in bin_details:
 					if _bin_dict.projected_qty > 0:
@@ -1836,45 +2003,43 @@ def get_non_completed_production_plans():
 def get_raw_materials_of_sub_assembly_items(
 	item_details, company, bom_no, include_non_stock_items, sub_assembly_items, planned_qty=1
 ):
-	bei = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	items = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
-		.left_join(item_default)
-		.on((item_default.parent == item.name) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
-			item.item_name,
-			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
-			bei.bom_no,
-			item.min_order_qty,
-			bei.source_warehouse,
-			item.default_material_request_type,
-			item.min_order_qty,
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-			item.safety_stock,
-		)
-		.where(
-			(bei.docstatus == 1)
-			& (bom.name == bom_no)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bei.item_code, bei.stock_uom)
-	).run(as_dict=True)
+	graph = get_bom_graph()
+	bom = graph.get_bom(bom_no)
+	bom_items = [row for row in bom.items if row.docstatus == 1] if bom else []
+	item_master = graph.get_items([row.item_code for row in bom_items], company)
+	bom_quantity = (flt(bom.quantity) or 1) if bom else 1
+
+	grouped_items = {}
+	for row in bom_items:
+		item = item_master.get(row.item_code)
+		if not item or (not include_non_stock_items and not item.is_stock_item):
+			continue
+
+		key = (row.item_code, row.stock_uom)
+		if key not in grouped_items:
+			grouped_items[key] = frappe._dict(
+				{
+					"qty": 0.0,
+					"item_name": item.item_name,
+					"item_code": item.name,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"bom_no": row.bom_no,
+					"min_order_qty": item.min_order_qty,
+					"source_warehouse": row.source_warehouse,
+					"default_material_request_type": item.default_material_request_type,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+					"safety_stock": item.safety_stock,
+				}
+			)
+
+		grouped_items[key].qty += flt(row.stock_qty) / bom_quantity
+
+	items = list(grouped_items.values())
+	for item in items:
+		item.qty *= planned_qty
 
 	for item in items:
 		key = (item.item_code, item.bom_no)
@@ -1892,9 +2057,6 @@ def get_raw_materials_of_sub_assembly_items(
 				planned_qty=planned_qty,
 			)
 		else:
-			if not item.conversion_factor and item.purchase_uom:
-				item.conversion_factor = get_uom_conversion_factor(item.item_code, item.purchase_uom)
-
 			if details := item_details.get(item.get("item_code")):
 				details.qty += item.get("qty")
 			else:
@@ -1964,3 +2126,60 @@ def get_reserved_qty_for_sub_assembly(item_code, warehouse):
 
 	qty = flt(query[0][0])
 	return qty if qty > 0 else 0.0
+
+
+def get_schedule_summary(work_orders: list[str]) -> frappe._dict:
+	"""Makespan in hours of the Job Cards scheduled for the Work Orders, and the utilisation
+	in percent of the production capacity of their workstations during the makespan."""
+
+	summary = frappe._dict(makespan=0.0, utilisation=0.0)
+	if not work_orders:
+		return summary
+
+	jc = frappe.qb.DocType("Job Card")
+	scheduled_time = frappe.qb.DocType("Job Card Scheduled Time")
+
+	workstations = []
+	for names in create_batch(work_orders, 1000):
+		workstations.extend(
+			frappe.qb.from_(scheduled_time)
+			.inner_join(jc)
+			.on(scheduled_time.parent == jc.name)
+			.select(
+				jc.workstation,
+				Min(scheduled_time.from_time).as_("from_time"),
+				Max(scheduled_time.to_time).as_("to_time"),
+				Sum(scheduled_time.time_in_mins).as_("time_in_mins"),
+			)
+			.where((jc.work_order.isin(names)) & (jc.docstatus < 2))
+			.groupby(jc.workstation)
+			.run(as_dict=True)
+		)
+
+	if not workstations:
+		return summary
+
+	makespan = time_diff_in_hours(
+		max(d.to_time for d in workstations), min(d.from_time for d in workstations)
+	)
+	if makespan <= 0:
+		return summary
+
+	capacities = frappe._dict(
+		frappe.get_all(
+			"Workstation",
+			filters={"name": ("in", list({d.workstation for d in workstations if d.workstation}))},
+			fields=["name", "production_capacity"],
+			as_list=True,
+		)
+	)
+
+	used_hours = sum(flt(d.time_in_mins) for d in workstations) / 60
+	available_hours = sum(
+		makespan * max(cint(capacities.get(workstation)), 1)
+		for workstation in {d.workstation for d in workstations}
+	)
+
+	summary.makespan = makespan
+	summary.utilisation = used_hours * 100 / available_hours
+	return summary
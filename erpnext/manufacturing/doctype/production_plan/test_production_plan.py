@@ -1576,6 +1576,135 @@ class TestProductionPlan(IntegrationTestCase):
 			self.assertEqual(row.get("uom"), "Nos")
 			self.assertEqual(row.get("conversion_factor"), 10.0)
 
+	def test_mr_items_for_large_bom(self):
+		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+
+		fg_item = make_item("Test MRP FG Item", {"is_stock_item": 1}).name
+		raw_materials = [
+			make_item(f"Test MRP RM Item {i}", {"is_stock_item": 1, "valuation_rate": 100}).name
+			for i in range(30)
+		]
+
+		rm_warehouse = create_warehouse("Test MRP RM Warehouse")
+		store_warehouse = create_warehouse("Test MRP Store Warehouse")
+
+		stocked_items = raw_materials[::3]
+		for item_code in stocked_items:
+			make_stock_entry(item_code=item_code, qty=2, rate=100, target=store_warehouse)
+
+		# stock in the planning warehouse reduces the requirement
+		make_stock_entry(item_code=raw_materials[1], qty=4, rate=100, target=rm_warehouse)
+
+		if not frappe.db.get_value("BOM", {"item": fg_item, "docstatus": 1}):
+			make_bom(item=fg_item, raw_materials=raw_materials, rm_qty=5)
+
+		pln = create_production_plan(item_code=fg_item, planned_qty=2, skip_getting_mr_items=1, do_not_save=1)
+		pln.for_warehouse = rm_warehouse
+
+		mr_items = get_items_for_material_requests(pln.as_dict(), warehouses=[{"warehouse": store_warehouse}])
+
+		total_qty = {}
+		transfer_qty = {}
+		for row in mr_items:
+			total_qty[row["item_code"]] = total_qty.get(row["item_code"], 0) + row["quantity"]
+			if row["material_request_type"] == "Material Transfer":
+				self.assertEqual(row["from_warehouse"], store_warehouse)
+				transfer_qty[row["item_code"]] = row["quantity"]
+
+		self.assertEqual(len(total_qty), len(raw_materials))
+		for item_code in raw_materials:
+			self.assertEqual(total_qty[item_code], 6.0 if item_code == raw_materials[1] else 10.0)
+
+		self.assertEqual(transfer_qty, {item_code: 2.0 for item_code in stocked_items})
+
+	@IntegrationTestCase.change_settings(
+		"Manufacturing Settings",
+		{"disable_capacity_planning": 0, "capacity_planning_for_days": 30, "mins_between_operations": 10},
+	)
+	def test_schedule_work_orders_with_shared_capacity(self):
+		from erpnext.manufacturing.doctype.work_order.test_work_order import make_operation, make_workstation
+
+		workstation = "Test Workstation For PP Scheduling"
+		if not frappe.db.exists("Workstation", workstation):
+			make_workstation(workstation=workstation, production_capacity=1)
+
+		operation = "Test Operation For PP Scheduling"
+		if not frappe.db.exists("Operation", operation):
+			make_operation(operation=operation, workstation=workstation)
+
+		fg_items = []
+		for item_code in ("Test PP Scheduling FG Item 1", "Test PP Scheduling FG Item 2"):
+			fg_items.append(make_item(item_code, {"is_stock_item": 1}).name)
+			if not frappe.db.get_value("BOM", {"item": item_code, "docstatus": 1}):
+				bom = make_bom(item=item_code, raw_materials=["Raw Material Item 1"], do_not_save=True)
+				bom.with_operations = 1
+				bom.append(
+					"operations",
+					{
+						"operation": operation,
+						"workstation": workstation,
+						"time_in_mins": 60,
+						"hour_rate": 100,
+					},
+				)
+				bom.insert()
+				bom.submit()
+
+		planned_start_date = add_to_date(now_datetime(), days=2)
+		pln = create_production_plan(
+			item_code=fg_items[0], planned_start_date=planned_start_date, do_not_save=1
+		)
+		pln.append(
+			"po_items",
+			{
+				"use_multi_level_bom": 1,
+				"item_code": fg_items[1],
+				"bom_no": frappe.db.get_value("Item", fg_items[1], "default_bom"),
+				"planned_qty": 2,
+				"planned_start_date": planned_start_date,
+				"stock_uom": "Nos",
+			},
+		)
+		pln.insert()
+		pln.submit()
+		pln.make_work_order()
+
+		work_orders = frappe.get_all("Work Order", filters={"production_plan": pln.name}, pluck="name")
+		for work_order in work_orders:
+			frappe.db.set_value(
+				"Work Order",
+				work_order,
+				{"wip_warehouse": "_Test Warehouse 1 - _TC", "fg_warehouse": "_Test Warehouse - _TC"},
+			)
+
+		summary = pln.submit_and_schedule_work_orders()
+
+		self.assertEqual(
+			frappe.db.count("Work Order", {"production_plan": pln.name, "docstatus": 1}), len(work_orders)
+		)
+
+		time_logs = frappe.get_all(
+			"Job Card Scheduled Time",
+			filters={
+				"parent": (
+					"in",
+					frappe.get_all("Job Card", {"work_order": ("in", work_orders)}, pluck="name"),
+				)
+			},
+			fields=["from_time", "to_time", "time_in_mins"],
+			order_by="from_time",
+		)
+
+		# operations of both Work Orders run one after the other on the workstation
+		self.assertEqual(len(time_logs), 2)
+		self.assertGreaterEqual(time_logs[1].from_time, add_to_date(time_logs[0].to_time, minutes=10))
+
+		makespan = (time_logs[-1].to_time - time_logs[0].from_time).total_seconds() / 3600
+		self.assertAlmostEqual(summary.makespan, makespan, places=2)
+		self.assertAlmostEqual(
+			summary.utilisation, sum(d.time_in_mins for d in time_logs) / 60 * 100 / makespan, places=2
+		)
+
 	def test_unreserve_qty_on_closing_of_pp(self):
 		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
 		from erpnext.stock.utils import get_or_make_bin
@@ -2362,6 +2362,77 @@ class TestWorkOrder(IntegrationTestCase):
 
 		frappe.db.set_single_value("Manufacturing Settings", "validate_components_quantities_per_bom", 0)
 
+	@IntegrationTestCase.change_settings(
+		"Manufacturing Settings",
+		{"backflush_raw_materials_based_on": "Material Transferred for Manufacture"},
+	)
+	def test_complete_work_orders_in_bulk(self):
+		from erpnext.manufacturing.doctype.work_order.work_order import make_stock_entries_for_work_orders
+
+		fg_item = "Test FG Item For Bulk Completion"
+		source_warehouse = "Stores - _TC"
+		raw_materials = ["Test Bulk Completion RM Item 1", "Test Bulk Completion RM Item 2"]
+
+		make_item(fg_item, {"is_stock_item": 1})
+		for item in raw_materials:
+			make_item(item, {"is_stock_item": 1})
+			test_stock_entry.make_stock_entry(
+				item_code=item,
+				target=source_warehouse,
+				qty=100,
+				basic_rate=100,
+			)
+
+		make_bom(item=fg_item, source_warehouse=source_warehouse, raw_materials=raw_materials)
+
+		work_orders = [
+			make_wo_order_test_record(item=fg_item, qty=qty, source_warehouse=source_warehouse).name
+			for qty in (5, 10, 15)
+		]
+		draft_work_order = make_wo_order_test_record(item=fg_item, qty=5, do_not_submit=True).name
+
+		make_stock_entries_for_work_orders(work_orders, "Material Transfer for Manufacture", batch_size=2)
+		make_stock_entries_for_work_orders([*work_orders, draft_work_order], batch_size=2)
+
+		for work_order, qty in zip(work_orders, (5, 10, 15), strict=True):
+			self.assertEqual(frappe.db.get_value("Work Order", work_order, "produced_qty"), qty)
+			self.assertEqual(frappe.db.get_value("Work Order", work_order, "status"), "Completed")
+
+			consumed_qty = frappe.get_all(
+				"Stock Entry Detail",
+				filters={"parent": ("in", get_manufacture_entries(work_order)), "s_warehouse": ("is", "set")},
+				pluck="transfer_qty",
+			)
+			self.assertEqual(sorted(consumed_qty), [qty, qty])
+
+		self.assertEqual(
+			frappe.db.get_value(
+				"Bulk Transaction Log Detail",
+				{"transaction_name": draft_work_order, "to_doctype": "Stock Entry"},
+				"transaction_status",
+			),
+			"Failed",
+		)
+		self.assertEqual(
+			frappe.db.count(
+				"Bulk Transaction Log Detail",
+				{
+					"transaction_name": ("in", work_orders),
+					"to_doctype": "Stock Entry",
+					"transaction_status": "Success",
+				},
+			),
+			6,
+		)
+
+
+def get_manufacture_entries(work_order):
+	return frappe.get_all(
+		"Stock Entry",
+		filters={"work_order": work_order, "purpose": "Manufacture", "docstatus": 1},
+		pluck="name",
+	)
+
 
 def make_operation(**kwargs):
 	kwargs = frappe._dict(kwargs)
@@ -12,6 +12,7 @@ from frappe.query_builder import Case
 from frappe.query_builder.functions import Sum
 from frappe.utils import (
 	cint,
+	create_batch,
 	date_diff,
 	flt,
 	get_datetime,
@@ -28,9 +29,12 @@ from erpnext.manufacturing.doctype.bom.bom import (
 	get_bom_items_as_dict,
 	validate_bom_no,
 )
+from erpnext.manufacturing.doctype.job_card.capacity_planner import CapacityPlanner
 from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
 	get_mins_between_operations,
 )
+from erpnext.manufacturing.doctype.workstation.workstation_calendar import get_workstation_calendar
+from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
 from erpnext.stock.doctype.batch.batch import make_batch
 from erpnext.stock.doctype.item.item import get_item_defaults, validate_end_of_life
 from erpnext.stock.doctype.serial_no.serial_no import get_available_serial_nos, get_serial_nos
@@ -633,29 +637,50 @@ class WorkOrder(Document):
 		enable_capacity_planning = not cint(manufacturing_settings_doc.disable_capacity_planning)
 		plan_days = cint(manufacturing_settings_doc.capacity_planning_for_days) or 30
 
+		planner = None
+		if enable_capacity_planning:
+			# set when many Work Orders are planned together, to share the loaded capacity
+			planner = self.flags.capacity_planner or CapacityPlanner(plan_days)
+			planner.load_workstations(self.get_operation_workstations(), self.planned_start_date)
+
 		for index, row in enumerate(self.operations):
 			qty = self.qty
 			while qty > 0:
 				qty = split_qty_based_on_batch_size(self, row, qty)
 				if row.job_card_qty > 0:
-					self.prepare_data_for_job_card(row, index, plan_days, enable_capacity_planning)
+					self.prepare_data_for_job_card(row, index, plan_days, enable_capacity_planning, planner)
+
+			if enable_capacity_planning:
+				row.db_update()
 
 		planned_end_date = self.operations and self.operations[-1].planned_end_time
 		if planned_end_date:
 			self.db_set("planned_end_date", planned_end_date)
 
-	def prepare_data_for_job_card(self, row, index, plan_days, enable_capacity_planning):
+	def get_operation_workstations(self):
+		workstations = {row.workstation for row in self.operations if row.workstation}
+		for workstation_type in {row.workstation_type for row in self.operations if not row.workstation}:
+			if workstation_type:
+				workstations.update(get_workstations(workstation_type))
+
+		return list(workstations)
+
+	def prepare_data_for_job_card(self, row, index, plan_days, enable_capacity_planning, planner=None):
 		self.set_operation_start_end_time(index, row)
 
 		job_card_doc = create_job_card(
-			self, row, auto_create=True, enable_capacity_planning=enable_capacity_planning
+			self, row, auto_create=True, enable_capacity_planning=enable_capacity_planning, planner=planner
 		)
 
 		if enable_capacity_planning and job_card_doc:
-			row.planned_start_time = job_card_doc.scheduled_time_logs[-1].from_time
-			row.planned_end_time = job_card_doc.scheduled_time_logs[-1].to_time
+			if job_card_doc.scheduled_time_logs:
+				row.planned_start_time = job_card_doc.scheduled_time_logs[-1].from_time
+				row.planned_end_time = job_card_doc.scheduled_time_logs[-1].to_time
 
-			if date_diff(row.planned_end_time, self.planned_start_date) > plan_days:
+			if (
+				not job_card_doc.scheduled_time_logs
+				or date_diff(row.planned_end_time, self.planned_start_date) > plan_days
+			):
 				frappe.message_log.pop()
 				frappe.throw(
 					_(
@@ -668,8 +693,6 @@ class WorkOrder(Document):
 					CapacityError,
 				)
 
-			row.db_update()
-
 	def set_operation_start_end_time(self, idx, row):
 		"""Set start and end time for given operation. If first operation, set start as
 		`planned_start_date`, else add time diff to end time of earlier operation."""
@@ -681,11 +704,22 @@ class WorkOrder(Document):
 				get_datetime(self.operations[idx - 1].planned_end_time) + get_mins_between_operations()
 			)
 
-		row.planned_end_time = get_datetime(row.planned_start_time) + relativedelta(minutes=row.time_in_mins)
+		row.planned_end_time = self.get_operation_end_time(row)
 
 		if row.planned_start_time == row.planned_end_time:
 			frappe.throw(_("Capacity Planning Error, planned start time can not be same as end time"))
 
+	def get_operation_end_time(self, row):
+		"""End time of the operation as per the working hours and holidays of its workstation."""
+
+		if not row.workstation or cint(
+			frappe.db.get_single_value("Manufacturing Settings", "allow_overtime")
+		):
+			return get_datetime(row.planned_start_time) + relativedelta(minutes=row.time_in_mins)
+
+		calendar = get_workstation_calendar(row.workstation, row.planned_start_time)
+		return calendar.add_working_minutes(row.planned_start_time, flt(row.time_in_mins))
+
 	def validate_cancel(self):
 		if self.status == "Stopped":
 			frappe.throw(_("Stopped Work Order cannot be cancelled, Unstop it first to cancel"))
@@ -911,26 +945,7 @@ class WorkOrder(Document):
 		self.calculate_operating_cost()
 
 	def get_holidays(self, workstation):
-		holiday_list = frappe.db.get_value("Workstation", workstation, "holiday_list")
-
-		holidays = {}
-
-		if holiday_list not in holidays:
-			holiday_list_days = [
-				getdate(d[0])
-				for d in frappe.get_all(
-					"Holiday",
-					fields=["holiday_date"],
-					filters={"parent": holiday_list},
-					order_by="holiday_date",
-					limit_page_length=0,
-					as_list=1,
-				)
-			]
-
-			holidays[holiday_list] = holiday_list_days
-
-		return holidays[holiday_list]
+		return get_workstation_calendar(workstation).holidays
 
 	def update_operation_status(self):
 		allowance_percentage = flt(
@@ -1413,6 +1428,10 @@ def set_work_order_ops(name):
 
 @frappe.whitelist()
 def make_stock_entry(work_order_id, purpose, qty=None, target_warehouse=None):
+	return get_stock_entry(work_order_id, purpose, qty, target_warehouse).as_dict()
+
+
+def get_stock_entry(work_order_id, purpose, qty=None, target_warehouse=None, available_materials=None):
 	work_order = frappe.get_doc("Work Order", work_order_id)
 	if not frappe.db.get_value("Warehouse", work_order.wip_warehouse, "is_group"):
 		wip_warehouse = work_order.wip_warehouse
@@ -1446,13 +1465,119 @@ def make_stock_entry(work_order_id, purpose, qty=None, target_warehouse=None):
 		stock_entry.from_warehouse = work_order.fg_warehouse
 		stock_entry.to_warehouse = target_warehouse or work_order.source_warehouse
 
+	stock_entry.pro_doc = work_order
+	stock_entry.flags.available_materials = available_materials
 	stock_entry.set_stock_entry_type()
 	stock_entry.get_items()
 
 	if purpose != "Disassemble":
 		stock_entry.set_serial_no_batch_for_finished_good()
 
-	return stock_entry.as_dict()
+	return stock_entry
+
+
+@frappe.whitelist()
+def complete_work_orders(names, purpose="Manufacture"):
+	"""Create and submit the Stock Entries for the pending qty of the Work Orders in a background job."""
+
+	frappe.has_permission("Stock Entry", "submit", throw=True)
+	if purpose not in ("Material Transfer for Manufacture", "Manufacture"):
+		frappe.throw(_("Work Orders can only be completed in bulk for Manufacture or Material Transfer"))
+
+	names = json.loads(names) if isinstance(names, str) else names
+	frappe.enqueue(
+		make_stock_entries_for_work_orders,
+		queue="long",
+		timeout=len(names) * 30 + 600,
+		work_orders=names,
+		purpose=purpose,
+		enqueue_after_commit=True,
+	)
+
+	frappe.msgprint(
+		_("Started a background job to create {0} Stock Entries, check the Bulk Transaction Log").format(
+			len(names)
+		),
+		alert=True,
+	)
+
+
+def make_stock_entries_for_work_orders(work_orders, purpose="Manufacture", batch_size=100):
+	"""Submit a Stock Entry for the pending qty of each Work Order, logging the result of each in
+	the Bulk Transaction Log.
+
+	The pending qty and the transferred raw materials of the Work Orders are fetched once per
+	batch, and each batch is committed on its own so that a long job does not hold its locks
+	till the end.
+	"""
+	from erpnext.stock.doctype.stock_entry.stock_entry import get_available_materials_for_work_orders
+	from erpnext.utilities.bulk_transaction import create_log, show_job_status
+
+	fail_count = 0
+	for batch in create_batch(work_orders, batch_size):
+		pending_qty = get_pending_qty_for_stock_entry(batch, purpose)
+		available_materials = {}
+		if purpose == "Manufacture":
+			available_materials = get_available_materials_for_work_orders(batch)
+
+		for work_order in batch:
+			try:
+				frappe.db.savepoint("before_stock_entry")
+				if not pending_qty.get(work_order):
+					frappe.throw(
+						_("There is no pending qty for {0} in Work Order {1}").format(purpose, work_order)
+					)
+
+				stock_entry = get_stock_entry(
+					work_order,
+					purpose,
+					pending_qty[work_order],
+					available_materials=available_materials.get(work_order, {}),
+				)
+				stock_entry.submit()
+			except Exception:
+				frappe.db.rollback(save_point="before_stock_entry")
+				fail_count += 1
+				create_log(
+					work_order,
+					frappe.get_traceback(with_context=True),
+					"Work Order",
+					"Stock Entry",
+					status="Failed",
+				)
+			else:
+				create_log(work_order, None, "Work Order", "Stock Entry", status="Success")
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+	show_job_status(fail_count, len(work_orders), "Stock Entry")
+
+
+def get_pending_qty_for_stock_entry(work_orders, purpose):
+	"""Returns the qty of each open Work Order which is yet to be transferred or manufactured."""
+
+	pending_qty = {}
+	for row in frappe.get_all(
+		"Work Order",
+		filters={
+			"name": ("in", work_orders),
+			"docstatus": 1,
+			"status": ("not in", ["Stopped", "Closed", "Completed"]),
+		},
+		fields=["name", "qty", "produced_qty", "material_transferred_for_manufacturing", "skip_transfer"],
+	):
+		if row.skip_transfer:
+			qty = flt(row.qty) - flt(row.produced_qty)
+		elif purpose == "Manufacture":
+			qty = flt(row.material_transferred_for_manufacturing) - flt(row.produced_qty)
+		else:
+			qty = flt(row.qty) - flt(row.material_transferred_for_manufacturing)
+
+		if qty > 0:
+			pending_qty[row.name] = flt(qty, frappe.get_precision("Work Order", "qty"))
+
+	return pending_qty
 
 
 @frappe.whitelist()
@@ -1627,7 +1752,7 @@ def validate_operation_data(row):
 		)
 
 
-def create_job_card(work_order, row, enable_capacity_planning=False, auto_create=False):
+def create_job_card(work_order, row, enable_capacity_planning=False, auto_create=False, planner=None):
 	doc = frappe.new_doc("Job Card")
 	doc.update(
 		{
@@ -1664,7 +1789,7 @@ def create_job_card(work_order, row, enable_capacity_planning=False, auto_create
 	if auto_create:
 		doc.flags.ignore_mandatory = True
 		if enable_capacity_planning:
-			doc.schedule_time_logs(row)
+			doc.schedule_time_logs(row, planner=planner)
 
 		doc.insert()
 		frappe.msgprint(_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True)
@@ -10,6 +10,17 @@ frappe.listview_settings["Work Order"] = {
 		"planned_end_date",
 	],
 	filters: [["status", "!=", "Stopped"]],
+	onload: function (listview) {
+		const method = "erpnext.manufacturing.doctype.work_order.work_order.complete_work_orders";
+
+		listview.page.add_action_item(__("Transfer Materials"), () => {
+			listview.call_for_selected_items(method, { purpose: "Material Transfer for Manufacture" });
+		});
+
+		listview.page.add_action_item(__("Finish"), () => {
+			listview.call_for_selected_items(method, { purpose: "Manufacture" });
+		});
+	},
 	get_indicator: function (doc) {
 		if (doc.status === "Submitted") {
 			return [__("Not Started"), "orange", "status,=,Submitted"];
@@ -2,6 +2,7 @@
 # See license.txt
 import frappe
 from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import add_days, get_datetime, getdate
 
 from erpnext.manufacturing.doctype.operation.test_operation import make_operation
 from erpnext.manufacturing.doctype.routing.test_routing import create_routing, setup_bom
@@ -100,6 +101,55 @@ class TestWorkstation(IntegrationTestCase):
 		self.assertEqual(bom_doc.operations[0].hour_rate, 250)
 		self.assertEqual(bom_doc.operations[1].hour_rate, 250)
 
+	def test_workstation_calendar(self):
+		from erpnext.manufacturing.doctype.workstation.workstation_calendar import get_workstation_calendar
+		from erpnext.setup.doctype.holiday_list.test_holiday_list import make_holiday_list
+
+		frappe.db.set_single_value("Manufacturing Settings", "allow_production_on_holidays", 0)
+
+		today = getdate()
+		holiday_list = make_holiday_list(
+			"_Test Workstation Calendar Holiday List",
+			from_date=today,
+			to_date=add_days(today, 10),
+			holiday_dates=[{"holiday_date": add_days(today, 1), "description": "Holiday"}],
+		)
+
+		workstation = frappe.get_doc(
+			{
+				"doctype": "Workstation",
+				"workstation_name": "_Test Workstation Calendar",
+				"holiday_list": holiday_list.name,
+				"working_hours": [
+					{"start_time": "09:00:00", "end_time": "13:00:00"},
+					{"start_time": "14:00:00", "end_time": "18:00:00"},
+				],
+			}
+		).insert()
+
+		def add_working_minutes(days, time, minutes):
+			from_time = get_datetime(f"{add_days(today, days)} {time}")
+			return get_workstation_calendar(workstation.name).add_working_minutes(from_time, minutes)
+
+		# continues after the break and skips the holiday
+		self.assertEqual(add_working_minutes(0, "12:00:00", 120), get_datetime(f"{today} 15:00:00"))
+		self.assertEqual(
+			add_working_minutes(0, "14:00:00", 480), get_datetime(f"{add_days(today, 2)} 13:00:00")
+		)
+
+		# cached calendar is cleared when the working hours change
+		workstation.working_hours = []
+		workstation.append("working_hours", {"start_time": "08:00:00", "end_time": "16:00:00"})
+		workstation.save()
+		self.assertEqual(add_working_minutes(0, "07:00:00", 60), get_datetime(f"{today} 09:00:00"))
+
+		# and when the holidays change
+		holiday_list.holidays = []
+		holiday_list.save()
+		self.assertEqual(
+			add_working_minutes(0, "15:00:00", 120), get_datetime(f"{add_days(today, 1)} 09:00:00")
+		)
+
 
 def make_workstation(*args, **kwargs):
 	args = args if args else kwargs
@@ -20,7 +20,10 @@ from frappe.utils import (
 	to_timedelta,
 )
 
-from erpnext.support.doctype.issue.issue import get_holidays
+from erpnext.manufacturing.doctype.workstation.workstation_calendar import (
+	clear_workstation_calendar,
+	get_workstation_calendar,
+)
 
 
 class WorkstationHolidayError(frappe.ValidationError):
@@ -129,6 +132,7 @@ class Workstation(Document):
 	def on_update(self):
 		self.validate_overlap_for_operation_timings()
 		self.update_bom_operation()
+		clear_workstation_calendar(self.name)
 
 		if self.plant_floor:
 			self.publish_workstation_status()
@@ -186,6 +190,9 @@ class Workstation(Document):
 				(self.hour_rate, bom_no[0], self.name),
 			)
 
+	def on_trash(self):
+		clear_workstation_calendar(self.name)
+
 	def validate_workstation_holiday(self, schedule_date, skip_holiday_list_check=False):
 		if not skip_holiday_list_check and (
 			not self.holiday_list
@@ -193,9 +200,9 @@ class Workstation(Document):
 		):
 			return schedule_date
 
-		if schedule_date in tuple(get_holidays(self.holiday_list)):
+		holidays = set(get_workstation_calendar(self.name, schedule_date).holidays)
+		while getdate(schedule_date) in holidays:
 			schedule_date = add_days(schedule_date, 1)
-			return self.validate_workstation_holiday(schedule_date, skip_holiday_list_check=True)
 
 		return schedule_date
 
@@ -397,23 +404,20 @@ def check_if_within_operating_hours(workstation, operation, from_datetime, to_da
 
 def is_within_operating_hours(workstation, operation, from_datetime, to_datetime):
 	operation_length = time_diff_in_seconds(to_datetime, from_datetime)
-	workstation = frappe.get_doc("Workstation", workstation)
+	working_hours = get_workstation_calendar(workstation).working_hours
 
-	if not workstation.working_hours:
+	if not working_hours:
 		return
 
-	for working_hour in workstation.working_hours:
-		if working_hour.start_time and working_hour.end_time:
-			slot_length = (
-				to_timedelta(working_hour.end_time or "") - to_timedelta(working_hour.start_time or "")
-			).total_seconds()
-			if slot_length >= operation_length:
-				return
+	for start_time, end_time in working_hours:
+		slot_length = (to_timedelta(str(end_time)) - to_timedelta(str(start_time))).total_seconds()
+		if slot_length >= operation_length:
+			return
 
 	frappe.throw(
 		_(
 			"Operation {0} longer than any available working hours in workstation {1}, break down the operation into multiple operations"
-		).format(operation, workstation.name),
+		).format(operation, workstation),
 		NotInWorkingHoursError,
 	)
 
@@ -421,13 +425,12 @@ def is_within_operating_hours(workstation, operation, from_datetime, to_datetime
 def check_workstation_for_holiday(workstation, from_datetime, to_datetime):
 	holiday_list = frappe.db.get_value("Workstation", workstation, "holiday_list")
 	if holiday_list and from_datetime and to_datetime:
-		applicable_holidays = []
-		for d in frappe.db.sql(
-			"""select holiday_date from `tabHoliday` where parent = %s
-			and holiday_date between %s and %s """,
-			(holiday_list, getdate(from_datetime), getdate(to_datetime)),
-		):
-			applicable_holidays.append(formatdate(d[0]))
+		applicable_holidays = [
+			formatdate(holiday_date)
+			for holiday_date in get_workstation_calendar(workstation).get_holidays_between(
+				from_datetime, to_datetime
+			)
+		]
 
 		if applicable_holidays:
 			frappe.throw(
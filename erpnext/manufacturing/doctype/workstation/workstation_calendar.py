@@ -0,0 +1,201 @@
+# Copyright (c) 2025, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import datetime
+from bisect import bisect_left, bisect_right
+
+import frappe
+from frappe.utils import add_days, cint, get_datetime, get_time, getdate, today
+
+# days before and after today for which the working periods of a cached calendar are indexed
+CALENDAR_PAST_DAYS = 30
+CALENDAR_FUTURE_DAYS = 400
+
+
+class WorkstationCalendar:
+	"""Working periods of a workstation as per its working hours and holidays.
+
+	The periods from `from_date` till `to_date` are kept sorted along with the working time
+	elapsed before each of them, so that the period at a time and the time after some working
+	minutes are found with a binary search. Periods after `to_date` are generated day by day.
+	"""
+
+	def __init__(
+		self,
+		working_hours: list[tuple[datetime.time, datetime.time]],
+		holidays: list[datetime.date],
+		from_date: datetime.date,
+		to_date: datetime.date,
+		skip_holidays: bool = True,
+	) -> None:
+		self.working_hours = sorted(working_hours)
+		self.holidays = sorted(holidays)
+		self.skip_holidays = skip_holidays
+		self.holiday_set = set(holidays) if skip_holidays else set()
+		self.from_date, self.to_date = from_date, to_date
+
+		self.starts: list[datetime.datetime] = []
+		self.ends: list[datetime.datetime] = []
+		# working seconds from the start of the calendar till the start / end of each period
+		self.elapsed: list[float] = []
+		self.elapsed_till_end: list[float] = []
+
+		elapsed = 0.0
+		for start, end in self.get_periods_for_days(from_date, to_date):
+			self.starts.append(start)
+			self.ends.append(end)
+			self.elapsed.append(elapsed)
+			elapsed += (end - start).total_seconds()
+			self.elapsed_till_end.append(elapsed)
+
+	@property
+	def round_the_clock(self) -> bool:
+		return not self.working_hours
+
+	def covers(self, date: datetime.date) -> bool:
+		return self.from_date <= date <= self.to_date
+
+	def is_working_day(self, date: datetime.date) -> bool:
+		return date not in self.holiday_set
+
+	def get_holidays_between(self, from_date, to_date) -> list[datetime.date]:
+		from_date, to_date = getdate(from_date), getdate(to_date)
+		return self.holidays[bisect_left(self.holidays, from_date) : bisect_right(self.holidays, to_date)]
+
+	def get_periods_for_days(self, from_date: datetime.date, to_date: datetime.date | None = None):
+		date = from_date
+		while to_date is None or date <= to_date:
+			if self.is_working_day(date):
+				for start_time, end_time in self.working_hours:
+					yield (
+						datetime.datetime.combine(date, start_time),
+						datetime.datetime.combine(date, end_time),
+					)
+
+			date += datetime.timedelta(days=1)
+
+	def get_periods(self, from_time):
+		"""Yields the (start, end) periods in which the workstation works from `from_time` onwards.
+		End is None if the workstation works round the clock."""
+
+		from_time = get_datetime(from_time)
+		if self.round_the_clock:
+			yield from_time, None
+			return
+
+		next_date = from_time.date()
+		if self.covers(next_date):
+			idx = bisect_right(self.ends, from_time)
+			for start, end in zip(self.starts[idx:], self.ends[idx:], strict=True):
+				yield max(start, from_time), end
+
+			next_date = self.to_date + datetime.timedelta(days=1)
+
+		for start, end in self.get_periods_for_days(next_date):
+			if end > from_time:
+				yield max(start, from_time), end
+
+	def add_working_minutes(self, from_time, minutes: float) -> datetime.datetime:
+		"""Returns the time at which `minutes` of work starting at `from_time` gets completed."""
+
+		from_time = get_datetime(from_time)
+		if self.round_the_clock:
+			return from_time + datetime.timedelta(minutes=minutes)
+
+		if minutes <= 0:
+			return from_time
+
+		if self.covers(from_time.date()) and self.starts:
+			idx = bisect_right(self.starts, from_time) - 1
+			if idx >= 0 and from_time < self.ends[idx]:
+				elapsed = self.elapsed[idx] + (from_time - self.starts[idx]).total_seconds()
+			else:
+				elapsed = self.elapsed_till_end[idx] if idx >= 0 else 0.0
+
+			target = elapsed + minutes * 60
+			idx = bisect_left(self.elapsed_till_end, target)
+			if idx < len(self.starts):
+				return self.starts[idx] + datetime.timedelta(seconds=target - self.elapsed[idx])
+
+		remaining = datetime.timedelta(minutes=minutes)
+		for start, end in self.get_periods(from_time):
+			if end - start >= remaining:
+				return start + remaining
+
+			remaining -= end - start
+
+
+def get_workstation_calendar(workstation: str, from_time=None) -> WorkstationCalendar:
+	"""Returns the calendar of the workstation covering `from_time`.
+
+	Calendars indexed around today are cached till the workstation or its holiday list is
+	changed, others are built as and when required.
+	"""
+
+	from_date = getdate(from_time) if from_time else getdate(today())
+	skip_holidays = not cint(
+		frappe.db.get_single_value("Manufacturing Settings", "allow_production_on_holidays")
+	)
+
+	calendar = frappe.cache().hget("workstation_calendar", workstation)
+	if (
+		calendar
+		and calendar.covers(from_date)
+		and calendar.skip_holidays == skip_holidays
+		and calendar.from_date >= getdate(add_days(today(), -2 * CALENDAR_PAST_DAYS))
+	):
+		return calendar
+
+	calendar_from_date = min(from_date, getdate(add_days(today(), -CALENDAR_PAST_DAYS)))
+	calendar = build_workstation_calendar(
+		workstation,
+		calendar_from_date,
+		max(getdate(add_days(today(), CALENDAR_FUTURE_DAYS)), from_date),
+		skip_holidays,
+	)
+
+	if calendar_from_date >= getdate(add_days(today(), -CALENDAR_PAST_DAYS)):
+		frappe.cache().hset("workstation_calendar", workstation, calendar)
+
+	return calendar
+
+
+def build_workstation_calendar(
+	workstation: str, from_date: datetime.date, to_date: datetime.date, skip_holidays: bool = True
+) -> WorkstationCalendar:
+	holiday_list = frappe.db.get_value("Workstation", workstation, "holiday_list")
+
+	working_hours = [
+		(get_time(row.start_time), get_time(row.end_time))
+		for row in frappe.get_all(
+			"Workstation Working Hour",
+			filters={"parent": workstation, "parenttype": "Workstation"},
+			fields=["start_time", "end_time"],
+		)
+		if row.start_time and row.end_time
+	]
+
+	holidays = []
+	if holiday_list:
+		holidays = [
+			getdate(holiday_date)
+			for holiday_date in frappe.get_all(
+				"Holiday",
+				filters={"parent": holiday_list, "parenttype": "Holiday List"},
+				pluck="holiday_date",
+			)
+		]
+
+	return WorkstationCalendar(working_hours, holidays, from_date, to_date, skip_holidays)
+
+
+def clear_workstation_calendar(workstation: str | None = None) -> None:
+	if workstation:
+		frappe.cache().hdel("workstation_calendar", workstation)
+	else:
+		frappe.cache().delete_value("workstation_calendar")
+
+
+def clear_workstation_calendars(doc, method=None):
+	"Clear the cached calendars on a change of a Holiday List"
+	clear_workstation_calendar()
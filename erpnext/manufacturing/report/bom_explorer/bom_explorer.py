@@ -4,6 +4,9 @@
 
 import frappe
 from frappe import _
+from frappe.utils import create_batch
+
+from erpnext.manufacturing.doctype.bom_closure.bom_closure import get_bom_closure
 
 
 def execute(filters=None):
@@ -14,34 +17,31 @@ def execute(filters=None):
 
 
 def get_data(filters, data):
-	get_exploded_items(filters.bom, data)
-
+	closure = get_bom_closure([filters.bom]).get(filters.bom, [])
 
-def get_exploded_items(bom, data, indent=0, qty=1):
-	exploded_items = frappe.get_all(
-		"BOM Item",
-		filters={"parent": bom},
-		fields=["qty", "bom_no", "qty", "item_code", "item_name", "description", "uom", "idx"],
-		order_by="idx ASC",
-	)
+	bom_items = {}
+	for names in create_batch([row.bom_item for row in closure], 1000):
+		for item in frappe.get_all(
+			"BOM Item",
+			filters={"name": ("in", names)},
+			fields=["name", "item_name", "description", "uom"],
+		):
+			bom_items[item.name] = item
 
-	for item in exploded_items:
-		print(item.bom_no, indent)
-		item["indent"] = indent
+	for row in closure:
+		item = bom_items.get(row.bom_item, {})
 		data.append(
 			{
-				"item_code": item.item_code,
-				"item_name": item.item_name,
-				"indent": indent,
-				"bom_level": indent,
-				"bom": item.bom_no,
-				"qty": item.qty * qty,
-				"uom": item.uom,
-				"description": item.description,
+				"item_code": row.item_code,
+				"item_name": item.get("item_name"),
+				"indent": row.depth,
+				"bom_level": row.depth,
+				"bom": row.bom_no,
+				"qty": row.qty,
+				"uom": item.get("uom"),
+				"description": item.get("description"),
 			}
 		)
-		if item.bom_no:
-			get_exploded_items(item.bom_no, data, indent=indent + 1, qty=item.qty)
 
 
 def get_columns():
@@ -0,0 +1,9 @@
+import frappe
+
+from erpnext.manufacturing.doctype.bom_closure.bom_closure import update_bom_closure
+
+
+def execute():
+	# sub assemblies are mostly created before the BOMs using them, so their closure is reused
+	for bom in frappe.get_all("BOM", filters={"docstatus": 1}, pluck="name", order_by="creation"):
+		update_bom_closure(bom)
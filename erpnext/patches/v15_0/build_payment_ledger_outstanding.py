@@ -0,0 +1,7 @@
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	rebuild_payment_ledger_outstanding,
+)
+
+
+def execute():
+	rebuild_payment_ledger_outstanding()
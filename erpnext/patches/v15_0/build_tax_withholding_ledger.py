@@ -0,0 +1,7 @@
+from erpnext.accounts.doctype.tax_withholding_ledger.tax_withholding_ledger import (
+	rebuild_tax_withholding_ledger,
+)
+
+
+def execute():
+	rebuild_tax_withholding_ledger()
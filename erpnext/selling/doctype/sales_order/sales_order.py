@@ -37,7 +37,7 @@ from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry impor
 )
 from erpnext.stock.get_item_details import (
 	ItemDetailsCtx,
-	get_bin_details,
+	get_bin_details_map,
 	get_default_bom,
 	get_price_list_rate,
 )
@@ -282,16 +282,11 @@ class SalesOrder(SellingController):
 					)
 
 	def validate_for_items(self):
+		bin_details = get_bin_details_map([(d.item_code, d.warehouse) for d in self.get("items")])
 		for d in self.get("items"):
 			# used for production plan
 			d.transaction_date = self.transaction_date
-
-			tot_avail_qty = frappe.db.sql(
-				"select projected_qty from `tabBin` \
-				where item_code = %s and warehouse = %s",
-				(d.item_code, d.warehouse),
-			)
-			d.projected_qty = tot_avail_qty and flt(tot_avail_qty[0][0]) or 0
+			d.projected_qty = flt(bin_details[(d.item_code, d.warehouse)]["projected_qty"])
 
 	def product_bundle_has_stock_item(self, product_bundle):
 		"""Returns true if product bundle has stock item"""
@@ -834,6 +829,12 @@ def make_material_request(source_name, target_doc=None):
 			target.tc_name = None
 			target.terms = None
 
+		bin_details = get_bin_details_map(
+			[(d.item_code, d.warehouse) for d in target.items], include_child_warehouses=True
+		)
+		for d in target.items:
+			d.actual_qty = bin_details[(d.item_code, d.warehouse)].get("actual_qty", 0)
+
 	def get_remaining_qty(so_item):
 		return flt(
 			flt(so_item.qty)
@@ -850,9 +851,6 @@ def make_material_request(source_name, target_doc=None):
 		target.project = source_parent.project
 		target.qty = get_remaining_qty(source)
 		target.stock_qty = flt(target.qty) * flt(target.conversion_factor)
-		target.actual_qty = get_bin_details(
-			target.item_code, target.warehouse, source_parent.company, True
-		).get("actual_qty", 0)
 
 		ctx = ItemDetailsCtx(target.as_dict().copy())
 		ctx.update(
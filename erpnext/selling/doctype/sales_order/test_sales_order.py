@@ -225,6 +225,39 @@ class TestSalesOrder(AccountsTestMixin, IntegrationTestCase):
 		so.load_from_db()
 		self.assertEqual(so.get("items")[0].delivered_qty, 9)
 
+	def test_update_qty_for_multiple_rows(self):
+		from erpnext.controllers.status_updater import OverAllowanceError
+
+		frappe.db.set_single_value("Stock Settings", "allow_negative_stock", 1)
+		frappe.db.set_value("Item", "_Test Item", "over_delivery_receipt_allowance", 0)
+
+		so = make_sales_order(
+			item_list=[
+				{"item_code": "_Test Item", "warehouse": "_Test Warehouse - _TC", "qty": qty, "rate": 100}
+				for qty in (10, 20, 30)
+			]
+		)
+
+		dn = make_delivery_note(so.name)
+		for item, qty in zip(dn.items, (10, 5, 0), strict=True):
+			item.qty = qty
+		dn.items = [item for item in dn.items if item.qty]
+		dn.submit()
+
+		so.load_from_db()
+		self.assertEqual([item.delivered_qty for item in so.items], [10, 5, 0])
+		self.assertEqual(so.per_delivered, 25)
+
+		# over delivery is reported against the row which crosses its limit
+		dn1 = make_delivery_note(so.name)
+		dn1.items[0].qty = 16
+		dn1.items[1].qty = 31
+		self.assertRaises(OverAllowanceError, dn1.submit)
+
+		dn.cancel()
+		so.load_from_db()
+		self.assertEqual([item.delivered_qty for item in so.items], [0, 0, 0])
+
 	def test_return_against_sales_order(self):
 		so = make_sales_order()
 
@@ -4,10 +4,13 @@
 # For license information, please see license.txt
 
 
+import frappe
 from frappe import _, throw
 from frappe.model.document import Document
 from frappe.utils import cint, formatdate, get_datetime_str, nowdate
 
+from erpnext.setup.utils import clear_currency_exchange_index
+
 
 class CurrencyExchange(Document):
 	# begin: auto-generated types
@@ -53,3 +56,16 @@ class CurrencyExchange(Document):
 
 		if not cint(self.for_buying) and not cint(self.for_selling):
 			throw(_("Currency Exchange must be applicable for Buying or for Selling."))
+
+	def on_update(self):
+		self.clear_index()
+
+	def on_trash(self):
+		self.clear_index()
+
+	def clear_index(self):
+		clear_currency_exchange_index()
+		# the index can be rebuilt by another request, without this change, before it is committed,
+		# or with this change before it is rolled back
+		frappe.db.after_commit.add(clear_currency_exchange_index)
+		frappe.db.after_rollback.add(clear_currency_exchange_index)
@@ -7,7 +7,7 @@ import frappe
 from frappe.tests import IntegrationTestCase
 from frappe.utils import cint, flt
 
-from erpnext.setup.utils import get_exchange_rate
+from erpnext.setup.utils import clear_currency_exchange_index, get_exchange_rate, get_exchange_rates
 
 
 def save_new_records(test_records):
@@ -85,6 +85,9 @@ class TestCurrencyExchange(IntegrationTestCase):
 			key = "currency_exchange_rate_{}:{}:{}".format(date, "USD", "INR")
 			cache.delete(key)
 
+		# rates kept for the request
+		clear_currency_exchange_index()
+
 	def tearDown(self):
 		frappe.db.set_single_value("Accounts Settings", "allow_stale", 1)
 		self.clear_cache()
@@ -182,3 +185,44 @@ class TestCurrencyExchange(IntegrationTestCase):
 		exchange_rate = get_exchange_rate("USD", "INR", "2016-01-30", "for_buying")
 		self.assertFalse(exchange_rate == 65)
 		self.assertEqual(flt(exchange_rate, 3), 62.9)
+
+	def test_exchange_rate_cleared_on_change(self, mock_get):
+		frappe.db.set_single_value("Accounts Settings", "allow_stale", 1)
+		save_new_records(self.globalTestRecords["Currency Exchange"])
+
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-20", "for_buying"), 65.1)
+
+		record = frappe.get_doc(
+			{
+				"doctype": "Currency Exchange",
+				"date": "2016-01-18",
+				"from_currency": "USD",
+				"to_currency": "INR",
+				"exchange_rate": 64.5,
+				"for_buying": 1,
+				"for_selling": 1,
+			}
+		).insert()
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-20", "for_buying"), 64.5)
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-17", "for_buying"), 65.1)
+
+		record.delete()
+		self.assertEqual(get_exchange_rate("USD", "INR", "2016-01-20", "for_buying"), 65.1)
+
+		self.assertEqual(
+			get_exchange_rates(
+				[("USD", "2016-01-20"), ("USD", "2016-01-01"), ("USD", "2016-01-20"), ("INR", "2016-01-20")],
+				"INR",
+				"for_buying",
+			),
+			{("USD", "2016-01-20"): 65.1, ("USD", "2016-01-01"): 60.0, ("INR", "2016-01-20"): 1},
+		)
+
+	def test_exchange_rate_kept_for_request(self, mock_get):
+		frappe.db.set_single_value("Accounts Settings", "allow_stale", 1)
+		self.clear_cache()
+
+		# not available from the API, the failure is not retried for every entry of a report
+		self.assertEqual(get_exchange_rate("USD", "INR", "2010-06-01", "for_buying"), 0)
+		self.assertEqual(get_exchange_rate("USD", "INR", "2010-06-01", "for_buying"), 0)
+		self.assertEqual(mock_get.call_count, 1)
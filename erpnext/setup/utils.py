@@ -1,9 +1,11 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from bisect import bisect_right
+
 import frappe
 from frappe import _
-from frappe.utils import add_days, flt, get_datetime_str, nowdate
+from frappe.utils import add_days, flt, getdate, nowdate
 from frappe.utils.data import now_datetime
 from frappe.utils.nestedset import get_root_of
 
@@ -53,31 +55,41 @@ def get_exchange_rate(from_currency, to_currency, transaction_date=None, args=No
 
 	if not transaction_date:
 		transaction_date = nowdate()
-	currency_settings = frappe.get_doc("Accounts Settings").as_dict()
+	currency_settings = frappe.get_cached_doc("Accounts Settings")
 	allow_stale_rates = currency_settings.get("allow_stale")
 
-	filters = [
-		["date", "<=", get_datetime_str(transaction_date)],
-		["from_currency", "=", from_currency],
-		["to_currency", "=", to_currency],
-	]
+	# rates are kept for the request, failures included, so that reports converting many entries
+	# look up, or try to fetch, each rate once
+	if not hasattr(frappe.local, "exchange_rates"):
+		frappe.local.exchange_rates = {}
+
+	key = (
+		from_currency,
+		to_currency,
+		getdate(transaction_date),
+		args if args in ("for_buying", "for_selling") else None,
+		allow_stale_rates,
+		currency_settings.get("stale_days"),
+	)
+	if key not in frappe.local.exchange_rates:
+		frappe.local.exchange_rates[key] = _get_exchange_rate(
+			from_currency, to_currency, transaction_date, args, currency_settings
+		)
 
-	if args == "for_buying":
-		filters.append(["for_buying", "=", "1"])
-	elif args == "for_selling":
-		filters.append(["for_selling", "=", "1"])
+	return frappe.local.exchange_rates[key]
 
-	if not allow_stale_rates:
-		stale_days = currency_settings.get("stale_days")
-		checkpoint_date = add_days(transaction_date, -stale_days)
-		filters.append(["date", ">", get_datetime_str(checkpoint_date)])
+
+def _get_exchange_rate(from_currency, to_currency, transaction_date, args, currency_settings):
+	allow_stale_rates = currency_settings.get("allow_stale")
 
 	# cksgb 19/09/2016: get last entry in Currency Exchange with from_currency and to_currency.
-	entries = frappe.get_all(
-		"Currency Exchange", fields=["exchange_rate"], filters=filters, order_by="date desc", limit=1
-	)
-	if entries:
-		return flt(entries[0].exchange_rate)
+	dates, rates = get_currency_exchange_index(from_currency, to_currency, args)
+	i = bisect_right(dates, getdate(transaction_date))
+	if i and (
+		allow_stale_rates
+		or dates[i - 1] > getdate(add_days(transaction_date, -currency_settings.get("stale_days")))
+	):
+		return rates[i - 1]
 
 	if frappe.get_cached_value("Currency Exchange Settings", "Currency Exchange Settings", "disabled"):
 		return 0.00
@@ -117,6 +129,50 @@ def get_exchange_rate(from_currency, to_currency, transaction_date=None, args=No
 		return 0.0
 
 
+def get_exchange_rates(currency_dates, to_currency, args=None) -> dict:
+	"""Returns the exchange rates of many (from_currency, transaction_date) pairs to `to_currency`,
+	keyed by the pair. Each distinct pair is looked up once."""
+
+	return {
+		(from_currency, transaction_date): get_exchange_rate(
+			from_currency, to_currency, transaction_date, args
+		)
+		for from_currency, transaction_date in set(currency_dates)
+	}
+
+
+def get_currency_exchange_index(from_currency, to_currency, args=None) -> tuple[list, list]:
+	"""Returns the dates and rates of the Currency Exchange records of the currencies, sorted by date.
+
+	Indexes are cached till a Currency Exchange is changed, see `clear_currency_exchange_index`.
+	"""
+
+	purpose = args if args in ("for_buying", "for_selling") else None
+	key = f"{from_currency}:{to_currency}:{purpose}"
+	index = frappe.cache().hget("currency_exchange_index", key)
+	if index is None:
+		filters = {"from_currency": from_currency, "to_currency": to_currency}
+		if purpose:
+			filters[purpose] = 1
+
+		entries = frappe.get_all(
+			"Currency Exchange",
+			fields=["date", "exchange_rate"],
+			filters=filters,
+			order_by="date asc, creation asc",
+		)
+		index = ([getdate(d.date) for d in entries], [flt(d.exchange_rate) for d in entries])
+		frappe.cache().hset("currency_exchange_index", key, index)
+
+	return index
+
+
+def clear_currency_exchange_index(doc=None, method=None, *args):
+	"Clear the cached index, and the rates kept for the request, on a change of a Currency Exchange"
+	frappe.cache().delete_value("currency_exchange_index")
+	frappe.local.exchange_rates = {}
+
+
 def format_ces_api(data, param):
 	return data.format(
 		transaction_date=param.get("transaction_date"),
@@ -8,7 +8,15 @@ from frappe import _
 from frappe.core.doctype.prepared_report.prepared_report import create_json_gz_file
 from frappe.desk.form.load import get_attachments
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form, parse_json
+from frappe.utils import (
+	add_days,
+	add_months,
+	get_first_day,
+	get_last_day,
+	get_link_to_form,
+	getdate,
+	parse_json,
+)
 from frappe.utils.background_jobs import enqueue
 
 from erpnext.stock.report.stock_balance.stock_balance import execute
@@ -27,6 +35,7 @@ class ClosingStockBalance(Document):
 		company: DF.Link | None
 		from_date: DF.Date | None
 		include_uom: DF.Link | None
+		is_auto_generated: DF.Check
 		item_code: DF.Link | None
 		item_group: DF.Link | None
 		naming_series: DF.Literal["CBAL-.#####"]
@@ -62,6 +71,7 @@ class ClosingStockBalance(Document):
 			.where(
 				(table.docstatus == 1)
 				& (table.company == self.company)
+				& (table.is_auto_generated == self.is_auto_generated)
 				& (
 					(table.from_date.between(self.from_date, self.to_date))
 					| (table.to_date.between(self.from_date, self.to_date))
@@ -83,7 +93,10 @@ class ClosingStockBalance(Document):
 
 	def on_submit(self):
 		self.set_status(save=True)
-		self.enqueue_job()
+
+		# auto generated closing balances are built month after month by the scheduler
+		if not self.is_auto_generated:
+			self.enqueue_job()
 
 	def on_cancel(self):
 		self.set_status(save=True)
@@ -116,7 +129,9 @@ class ClosingStockBalance(Document):
 					"item_group": self.item_group,
 					"warehouse_type": self.warehouse_type,
 					"include_uom": self.include_uom,
-					"ignore_closing_balance": 1,
+					# auto generated closing balance is built on top of the previous month's balance
+					"ignore_closing_balance": 0 if self.is_auto_generated else 1,
+					"show_dimension_wise_stock": 1 if self.is_auto_generated else 0,
 					"show_variant_attributes": 1,
 					"show_stock_ageing_data": 1,
 				}
@@ -152,3 +167,101 @@ def prepare_closing_stock_balance(name):
 	except Exception:
 		doc.db_set("status", "Failed")
 		doc.log_error(title="Closing Stock Balance Failed")
+
+
+def create_auto_closing_stock_balance():
+	"""Create the missing monthly closing balances and regenerate the outdated ones."""
+	if not frappe.db.get_single_value("Stock Settings", "auto_create_closing_stock_balance"):
+		return
+
+	for company in frappe.get_all("Company", pluck="name"):
+		make_monthly_closing_stock_balance(company)
+
+	# Queued entries are either new or invalidated by back-dated transactions,
+	# process them in the order of their dates so that each month starts from the previous one
+	companies_pending_repost = set()
+	for row in frappe.get_all(
+		"Closing Stock Balance",
+		filters={"docstatus": 1, "is_auto_generated": 1, "status": "Queued"},
+		fields=["name", "company", "to_date"],
+		order_by="to_date asc",
+	):
+		# the stock ledger is rewritten by the pending repost, the later months are skipped as well
+		if row.company in companies_pending_repost or has_pending_repost(row.company, row.to_date):
+			companies_pending_repost.add(row.company)
+			continue
+
+		prepare_closing_stock_balance(row.name)
+		frappe.db.commit()
+
+
+def has_pending_repost(company, to_date) -> bool:
+	return bool(
+		frappe.db.exists(
+			"Repost Item Valuation",
+			{
+				"docstatus": 1,
+				"company": company,
+				"status": ("in", ["Queued", "In Progress"]),
+				"posting_date": ("<=", to_date),
+			},
+		)
+	)
+
+
+def make_monthly_closing_stock_balance(company):
+	last_month_end = get_last_day(add_months(getdate(), -1))
+
+	last_closing = frappe.get_all(
+		"Closing Stock Balance",
+		filters={"docstatus": 1, "is_auto_generated": 1, "company": company},
+		fields=["to_date"],
+		order_by="to_date desc",
+		limit=1,
+	)
+
+	if last_closing:
+		from_date = add_days(last_closing[0].to_date, 1)
+	elif frappe.db.exists("Stock Ledger Entry", {"company": company, "is_cancelled": 0}):
+		# first closing balance of the company, older months are not required
+		from_date = get_first_day(last_month_end)
+	else:
+		return
+
+	while getdate(from_date) <= last_month_end:
+		doc = frappe.new_doc("Closing Stock Balance")
+		doc.update(
+			{
+				"company": company,
+				"from_date": from_date,
+				"to_date": get_last_day(from_date),
+				"is_auto_generated": 1,
+			}
+		)
+		doc.submit()
+
+		from_date = add_days(doc.to_date, 1)
+
+
+def invalidate_closing_stock_balance(company, posting_date):
+	"""Mark auto generated closing balances affected by a back-dated transaction for regeneration."""
+	if not company or not posting_date:
+		return
+
+	names = frappe.get_all(
+		"Closing Stock Balance",
+		filters={
+			"docstatus": 1,
+			"is_auto_generated": 1,
+			"company": company,
+			"status": ("in", ["Completed", "Failed"]),
+			"to_date": (">=", posting_date),
+		},
+		pluck="name",
+	)
+
+	if not names:
+		return
+
+	table = frappe.qb.DocType("Closing Stock Balance")
+	(frappe.qb.update(table).set(table.status, "Queued").where(table.name.isin(names))).run()
@@ -219,8 +219,11 @@ class Item(Document):
 			self.old_item_group = frappe.db.get_value(self.doctype, self.name, "item_group")
 
 	def on_update(self):
+		from erpnext.manufacturing.doctype.bom.bom_graph import clear_bom_graph
+
 		self.update_variants()
 		self.update_item_price()
+		clear_bom_graph()
 
 	def validate_description(self):
 		"""Clean HTML description if set"""
@@ -111,6 +111,8 @@ class RepostItemValuation(Document):
 			"status": "Completed",
 			"docstatus": 1,
 			"to_date": (">=", self.posting_date),
+			# auto generated closing balances are regenerated instead of blocking the repost
+			"is_auto_generated": 0,
 		}
 
 		for field in ["warehouse", "item_code"]:
@@ -188,6 +190,11 @@ class RepostItemValuation(Document):
 
 		        These flags are useful for asserting real time behaviour like quantity updates.
 		"""
+		from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+			invalidate_closing_stock_balance,
+		)
+
+		invalidate_closing_stock_balance(self.company, self.posting_date)
 
 		if not frappe.flags.in_test:
 			return
@@ -251,6 +258,10 @@ def on_doctype_update():
 
 
 def repost(doc):
+	from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+		invalidate_closing_stock_balance,
+	)
+
 	try:
 		frappe.flags.through_repost_item_valuation = True
 		if not frappe.db.exists("Repost Item Valuation", doc.name):
@@ -266,6 +277,9 @@ def repost(doc):
 		repost_sl_entries(doc)
 		repost_gl_entries(doc)
 
+		# closing balances regenerated while the repost was running are built from the old entries
+		invalidate_closing_stock_balance(doc.company, doc.posting_date)
+
 		doc.set_status("Completed")
 		doc.db_set("reposting_data_file", None)
 		remove_attached_file(doc.name)
@@ -12,6 +12,7 @@ from frappe.query_builder.functions import CombineDatetime, Sum
 from frappe.utils import (
 	add_days,
 	cint,
+	create_batch,
 	cstr,
 	flt,
 	get_link_to_form,
@@ -26,6 +27,7 @@ from erpnext.stock.serial_batch_bundle import (
 	BatchNoValuation,
 	SerialNoValuation,
 	get_batches_from_bundle,
+	get_serial_nos_batch,
 )
 from erpnext.stock.serial_batch_bundle import get_serial_nos as get_serial_nos_from_bundle
 
@@ -46,6 +48,13 @@ class SerialNoWarehouseError(frappe.ValidationError):
 	pass
 
 
+# Bundles with at least these many entries are written with multi-row inserts
+BULK_WRITE_THRESHOLD = 500
+
+# Max number of values passed in a single IN clause
+QUERY_CHUNK_SIZE = 1000
+
+
 class SerialandBatchBundle(Document):
 	# begin: auto-generated types
 	# This code is auto-generated. Do not modify anything in this block.
@@ -102,6 +111,40 @@ class SerialandBatchBundle(Document):
 		self.set_incoming_rate()
 		self.calculate_qty_and_amount()
 
+	def db_insert(self, *args, **kwargs):
+		super().db_insert(*args, **kwargs)
+
+		if len(self.entries) >= BULK_WRITE_THRESHOLD:
+			self.bulk_insert_entries()
+
+	def update_child_table(self, fieldname, df=None):
+		if fieldname != "entries" or len(self.entries) < BULK_WRITE_THRESHOLD:
+			return super().update_child_table(fieldname, df)
+
+		# Rewrite all the entries with multi-row inserts instead of updating them one by one
+		frappe.db.delete(
+			"Serial and Batch Entry",
+			{"parent": self.name, "parenttype": self.doctype, "parentfield": "entries"},
+		)
+
+		self.bulk_insert_entries()
+
+	def bulk_insert_entries(self):
+		fields = None
+		values = []
+		for row in self.entries:
+			row_data = row.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+			if fields is None:
+				fields = list(row_data)
+
+			values.append(tuple(row_data.get(field) for field in fields))
+
+			# Skip the row wise insert done by the framework for child rows
+			row.flags.bulk_inserted = True
+			row.set("__islocal", False)
+
+		frappe.db.bulk_insert("Serial and Batch Entry", fields=fields, values=values)
+
 	def reset_serial_batch_bundle(self):
 		if self.is_new() and self.amended_from:
 			for field in ["is_cancelled", "is_rejected"]:
@@ -118,14 +161,7 @@ class SerialandBatchBundle(Document):
 			if not has_no_batch:
 				return
 
-			serial_no_batch = frappe._dict(
-				frappe.get_all(
-					"Serial No",
-					filters={"name": ("in", serial_nos)},
-					fields=["name", "batch_no"],
-					as_list=True,
-				)
-			)
+			serial_no_batch = get_serial_nos_batch(serial_nos)
 
 			for row in self.entries:
 				if not row.batch_no:
@@ -140,17 +176,15 @@ class SerialandBatchBundle(Document):
 		if self.voucher_type == "POS Invoice":
 			kwargs["ignore_voucher_nos"] = [self.voucher_no]
 
-		available_serial_nos = get_available_serial_nos(frappe._dict(kwargs))
-
-		serial_no_warehouse = {}
-		for data in available_serial_nos:
-			if data.serial_no not in serial_nos:
-				continue
-
-			serial_no_warehouse[data.serial_no] = data.warehouse
+		reserved_serial_nos = set(get_reserved_serial_nos(frappe._dict(kwargs)))
+		serial_no_warehouse = get_serial_nos_warehouse(serial_nos, self.item_code)
 
 		for serial_no in serial_nos:
-			if not serial_no_warehouse.get(serial_no) or serial_no_warehouse.get(serial_no) != self.warehouse:
+			if (
+				serial_no in reserved_serial_nos
+				or not serial_no_warehouse.get(serial_no)
+				or serial_no_warehouse.get(serial_no) != self.warehouse
+			):
 				self.throw_error_message(
 					f"Serial No {bold(serial_no)} is not present in the warehouse {bold(self.warehouse)}.",
 					SerialNoWarehouseError,
@@ -186,6 +220,7 @@ class SerialandBatchBundle(Document):
 		if self.docstatus == 1:
 			kwargs["voucher_no"] = self.voucher_no
 
+		serial_nos = set(serial_nos)
 		available_serial_nos = get_available_serial_nos(kwargs)
 		for data in available_serial_nos:
 			if data.serial_no in serial_nos:
@@ -1628,6 +1663,11 @@ def get_available_serial_nos(kwargs):
 	if kwargs.get("ignore_serial_nos"):
 		ignore_serial_nos.extend(kwargs.get("ignore_serial_nos"))
 
+	# Restrict the lookup to the given serial nos (used while validating large bundles)
+	serial_nos = None
+	if kwargs.get("serial_nos"):
+		serial_nos = set(kwargs.serial_nos).difference(ignore_serial_nos)
+
 	if kwargs.get("posting_date"):
 		if kwargs.get("posting_time") is None:
 			kwargs.posting_time = nowtime()
@@ -1637,8 +1677,11 @@ def get_available_serial_nos(kwargs):
 		if not time_based_serial_nos:
 			return []
 
-		filters["name"] = ("in", time_based_serial_nos)
-	elif ignore_serial_nos:
+		if serial_nos is not None:
+			serial_nos = time_based_serial_nos
+		else:
+			filters["name"] = ("in", time_based_serial_nos)
+	elif ignore_serial_nos and serial_nos is None:
 		filters["name"] = ("not in", ignore_serial_nos)
 
 	if kwargs.get("batches"):
@@ -1648,6 +1691,14 @@ def get_available_serial_nos(kwargs):
 
 		filters["batch_no"] = ("in", batches)
 
+	if serial_nos is not None:
+		data = []
+		for chunk in create_batch(sorted(serial_nos), QUERY_CHUNK_SIZE):
+			filters["name"] = ("in", chunk)
+			data.extend(frappe.get_all("Serial No", fields=fields, filters=filters, order_by=order_by))
+
+		return data[: cint(kwargs.qty)] if cint(kwargs.qty) else data
+
 	return frappe.get_all(
 		"Serial No",
 		fields=fields,
@@ -1657,6 +1708,23 @@ def get_available_serial_nos(kwargs):
 	)
 
 
+def get_serial_nos_warehouse(serial_nos, item_code) -> dict:
+	"""Returns the current warehouse of the given serial nos, queried in chunks."""
+
+	serial_no_warehouse = {}
+	for chunk in create_batch(list(set(serial_nos)), QUERY_CHUNK_SIZE):
+		serial_no_warehouse.update(
+			frappe.get_all(
+				"Serial No",
+				filters={"name": ("in", chunk), "item_code": item_code},
+				fields=["name", "warehouse"],
+				as_list=True,
+			)
+		)
+
+	return serial_no_warehouse
+
+
 def get_non_expired_batches(batches):
 	filters = {}
 	if isinstance(batches, list):
@@ -1678,9 +1746,10 @@ def get_serial_nos_based_on_posting_date(kwargs, ignore_serial_nos):
 	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
 	serial_nos = set()
+	requested_serial_nos = set(kwargs.serial_nos) if kwargs.get("serial_nos") else None
 	data = get_stock_ledgers_for_serial_nos(kwargs)
 
-	bundle_wise_serial_nos = get_bundle_wise_serial_nos(data)
+	bundle_wise_serial_nos = get_bundle_wise_serial_nos(data, requested_serial_nos)
 	for d in data:
 		if d.serial_and_batch_bundle:
 			if sns := bundle_wise_serial_nos.get(d.serial_and_batch_bundle):
@@ -1691,34 +1760,46 @@ def get_serial_nos_based_on_posting_date(kwargs, ignore_serial_nos):
 
 		elif d.serial_no:
 			sns = get_serial_nos(d.serial_no)
+			if requested_serial_nos is not None:
+				sns = requested_serial_nos.intersection(sns)
+
 			if d.actual_qty > 0:
 				serial_nos.update(sns)
 			else:
 				serial_nos.difference_update(sns)
 
-	serial_nos = list(serial_nos)
-	for serial_no in ignore_serial_nos:
-		if serial_no in serial_nos:
-			serial_nos.remove(serial_no)
+	serial_nos.difference_update(ignore_serial_nos)
 
-	return serial_nos
+	return list(serial_nos)
+
+
+def get_bundle_wise_serial_nos(data, serial_nos=None):
+	"""Returns the serial nos of the given ledgers' bundles.
 
+	If `serial_nos` is passed, only those serial nos are looked up, which avoids
+	loading every bundle of the item while validating a few serial nos.
+	"""
 
-def get_bundle_wise_serial_nos(data):
 	bundle_wise_serial_nos = defaultdict(list)
-	bundles = [d.serial_and_batch_bundle for d in data if d.serial_and_batch_bundle]
+	bundles = {d.serial_and_batch_bundle for d in data if d.serial_and_batch_bundle}
 	if not bundles:
 		return bundle_wise_serial_nos
 
-	bundle_data = frappe.get_all(
-		"Serial and Batch Entry",
-		fields=["serial_no", "parent"],
-		filters={"parent": ("in", bundles), "docstatus": 1, "serial_no": ("is", "set")},
-	)
+	if serial_nos is not None:
+		key, values = "serial_no", serial_nos
+	else:
+		key, values = "parent", bundles
+
+	for chunk in create_batch(list(values), QUERY_CHUNK_SIZE):
+		bundle_data = frappe.get_all(
+			"Serial and Batch Entry",
+			fields=["serial_no", "parent"],
+			filters={key: ("in", chunk), "docstatus": 1, "serial_no": ("is", "set")},
+		)
 
-	for d in bundle_data:
-		if d.parent:
-			bundle_wise_serial_nos[d.parent].append(d.serial_no)
+		for d in bundle_data:
+			if d.parent in bundles:
+				bundle_wise_serial_nos[d.parent].append(d.serial_no)
 
 	return bundle_wise_serial_nos
 
@@ -553,6 +553,59 @@ class TestSerialandBatchBundle(IntegrationTestCase):
 
 		self.assertRaises(frappe.exceptions.ValidationError, pr2.save)
 
+	def test_bulk_serial_nos_inward_and_outward(self):
+		from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+			BULK_WRITE_THRESHOLD,
+		)
+
+		item_code = make_item(
+			"Test Bulk Serial No Item",
+			properties={"has_serial_no": 1, "serial_no_series": "TBSNI-.#####", "is_stock_item": 1},
+		).name
+
+		qty = BULK_WRITE_THRESHOLD * 2
+		se = make_stock_entry(item_code=item_code, target="_Test Warehouse - _TC", qty=qty, rate=100)
+
+		bundle = se.items[0].serial_and_batch_bundle
+		entries = frappe.get_all(
+			"Serial and Batch Entry",
+			filters={"parent": bundle},
+			fields=["serial_no", "docstatus", "idx"],
+			order_by="idx",
+		)
+
+		self.assertEqual(len(entries), qty)
+		self.assertEqual({d.docstatus for d in entries}, {1})
+		self.assertEqual([d.idx for d in entries], list(range(1, qty + 1)))
+
+		serial_nos = [d.serial_no for d in entries]
+		self.assertEqual(
+			frappe.db.count("Serial No", {"name": ("in", serial_nos), "warehouse": "_Test Warehouse - _TC"}),
+			qty,
+		)
+
+		# Inward of the same serial nos again should fail
+		se = make_stock_entry(
+			item_code=item_code,
+			target="_Test Warehouse - _TC",
+			qty=1,
+			rate=100,
+			serial_no=serial_nos[-1:],
+			do_not_submit=True,
+		)
+		self.assertRaises(frappe.ValidationError, se.submit)
+
+		se = make_stock_entry(
+			item_code=item_code,
+			source="_Test Warehouse - _TC",
+			qty=qty,
+			serial_no=serial_nos,
+		)
+
+		self.assertFalse(
+			frappe.db.count("Serial No", {"name": ("in", serial_nos), "warehouse": ("is", "set")})
+		)
+
 	def test_serial_no_valuation_for_legacy_ledgers(self):
 		sn_item = make_item(
 			"Test Serial No Valuation for Legacy Ledgers",
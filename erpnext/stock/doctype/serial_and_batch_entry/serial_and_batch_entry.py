@@ -29,4 +29,9 @@ class SerialandBatchEntry(Document):
 		warehouse: DF.Link | None
 	# end: auto-generated types
 
-	pass
+	def db_insert(self, *args, **kwargs):
+		# Already inserted along with the other rows by SerialandBatchBundle.bulk_insert_entries
+		if self.flags.bulk_inserted:
+			return
+
+		super().db_insert(*args, **kwargs)
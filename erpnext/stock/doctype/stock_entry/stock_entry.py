@@ -42,7 +42,7 @@ from erpnext.stock.doctype.stock_reconciliation.stock_reconciliation import (
 from erpnext.stock.get_item_details import (
 	ItemDetailsCtx,
 	get_barcode_data,
-	get_bin_details,
+	get_bin_details_map,
 	get_conversion_factor,
 	get_default_cost_center,
 )
@@ -181,8 +181,9 @@ class StockEntry(StockController):
 			)
 
 	def onload(self):
+		bin_details = get_bin_details_map([(item.item_code, item.s_warehouse) for item in self.get("items")])
 		for item in self.get("items"):
-			item.update(get_bin_details(item.item_code, item.s_warehouse))
+			item.update(bin_details[(item.item_code, item.s_warehouse)])
 
 	def before_validate(self):
 		from erpnext.stock.doctype.putaway_rule.putaway_rule import apply_putaway_rule
@@ -2233,7 +2234,9 @@ class StockEntry(StockController):
 				)
 
 	def add_transfered_raw_materials_in_items(self) -> None:
-		available_materials = get_available_materials(self.work_order)
+		available_materials = self.flags.available_materials
+		if available_materials is None:
+			available_materials = get_available_materials(self.work_order)
 
 		wo_data = frappe.db.get_value(
 			"Work Order",
@@ -3118,10 +3121,17 @@ def get_items_from_subcontract_order(source_name, target_doc=None):
 
 
 def get_available_materials(work_order) -> dict:
-	data = get_stock_entry_data(work_order)
+	return get_available_materials_for_work_orders([work_order]).get(work_order, {})
 
-	available_materials = {}
+
+def get_available_materials_for_work_orders(work_orders: list[str]) -> dict[str, dict]:
+	"""Returns the raw materials transferred and not yet consumed, for each of the Work Orders."""
+
+	data = get_stock_entry_data(work_orders)
+
+	materials_by_work_order = {}
 	for row in data:
+		available_materials = materials_by_work_order.setdefault(row.work_order, {})
 		key = (row.item_code, row.warehouse)
 		if row.purpose != "Material Transfer for Manufacture":
 			key = (row.item_code, row.s_warehouse)
@@ -3173,10 +3183,10 @@ def get_available_materials(work_order) -> dict:
 					if serial_no in item_data.serial_nos:
 						item_data.serial_nos.remove(serial_no)
 
-	return available_materials
+	return materials_by_work_order
 
 
-def get_stock_entry_data(work_order):
+def get_stock_entry_data(work_order: str | list[str]):
 	from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 		get_voucher_wise_serial_batch_from_bundle,
 	)
@@ -3203,10 +3213,11 @@ def get_stock_entry_data(work_order):
 			stock_entry_detail.serial_no,
 			stock_entry.purpose,
 			stock_entry.name,
+			stock_entry.work_order,
 		)
 		.where(
 			(stock_entry.name == stock_entry_detail.parent)
-			& (stock_entry.work_order == work_order)
+			& (stock_entry.work_order.isin([work_order] if isinstance(work_order, str) else work_order))
 			& (stock_entry.docstatus == 1)
 			& (stock_entry_detail.s_warehouse.isnotnull())
 			& (
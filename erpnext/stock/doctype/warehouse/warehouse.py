@@ -227,6 +227,23 @@ def get_child_warehouses(warehouse):
 	return [*children, warehouse]  # append self for backward compatibility
 
 
+@frappe.request_cache
+def get_warehouse_subtree(warehouse: str) -> tuple[str, ...]:
+	"""Return the warehouse and all its descendants, cached for the current request."""
+	lft, rgt = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"]) or (None, None)
+	if lft is None:
+		return (warehouse,)
+
+	return tuple(
+		frappe.get_all(
+			"Warehouse",
+			filters={"lft": (">=", lft), "rgt": ("<=", rgt)},
+			order_by="lft",
+			pluck="name",
+		)
+	)
+
+
 def get_warehouses_based_on_account(account, company=None):
 	warehouses = []
 	for d in frappe.get_all("Warehouse", fields=["name", "is_group"], filters={"account": account}):
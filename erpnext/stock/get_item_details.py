@@ -1209,52 +1209,103 @@ def get_conversion_factor(item_code, uom):
 
 @frappe.whitelist()
 def get_projected_qty(item_code, warehouse):
-	return {
-		"projected_qty": frappe.db.get_value(
-			"Bin", {"item_code": item_code, "warehouse": warehouse}, "projected_qty"
-		)
-	}
+	return {"projected_qty": get_bin_details(item_code, warehouse).get("projected_qty")}
 
 
 @frappe.whitelist()
 def get_bin_details(item_code, warehouse, company=None, include_child_warehouses=False):
-	bin_details = {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0}
+	return get_bin_details_map(
+		[(item_code, warehouse)], company=company, include_child_warehouses=include_child_warehouses
+	)[(item_code, warehouse)]
 
-	if warehouse:
-		from frappe.query_builder.functions import Coalesce, Sum
 
-		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
+@frappe.whitelist()
+def get_bin_details_for_items(items, company=None, include_child_warehouses=False):
+	"""Bulk version of `get_bin_details`.
+
+	:param items: list of dicts with `item_code` and `warehouse`
+	:return: list of bin details in the same order as `items`
+	"""
+	items = parse_json(items)
+	pairs = [(d.get("item_code"), d.get("warehouse")) for d in items]
+	bin_details = get_bin_details_map(
+		pairs, company=company, include_child_warehouses=cint(include_child_warehouses)
+	)
+
+	return [bin_details[pair] for pair in pairs]
 
-		warehouses = get_child_warehouses(warehouse) if include_child_warehouses else [warehouse]
 
+def get_bin_details_map(
+	pairs: list[tuple[str, str]], company=None, include_child_warehouses=False
+) -> dict[tuple[str, str], dict]:
+	"""Return projected, actual and reserved qty for (item_code, warehouse) pairs using one Bin query.
+
+	Group warehouses are expanded with their subtree (cached per request) if `include_child_warehouses`.
+	"""
+	from erpnext.stock.doctype.warehouse.warehouse import get_warehouse_subtree
+
+	bin_details = {pair: {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0} for pair in pairs}
+
+	warehouse_subtree = {}
+	for _item_code, warehouse in bin_details:
+		if warehouse and warehouse not in warehouse_subtree:
+			warehouse_subtree[warehouse] = (
+				get_warehouse_subtree(warehouse) if include_child_warehouses else (warehouse,)
+			)
+
+	item_codes = {item_code for item_code, warehouse in bin_details if item_code and warehouse}
+	if item_codes:
 		bin = frappe.qb.DocType("Bin")
-		bin_details = (
+		bins = (
 			frappe.qb.from_(bin)
-			.select(
-				Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
-				Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
-				Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
+			.select(bin.item_code, bin.warehouse, bin.projected_qty, bin.actual_qty, bin.reserved_qty)
+			.where(
+				(bin.item_code.isin(list(item_codes)))
+				& (bin.warehouse.isin(list({wh for subtree in warehouse_subtree.values() for wh in subtree})))
 			)
-			.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
-		).run(as_dict=True)[0]
+		).run(as_dict=True)
+
+		bin_map = {(d.item_code, d.warehouse): d for d in bins}
+		for (item_code, warehouse), details in bin_details.items():
+			if not (item_code and warehouse):
+				continue
+
+			for child_warehouse in warehouse_subtree[warehouse]:
+				if row := bin_map.get((item_code, child_warehouse)):
+					details["projected_qty"] += flt(row.projected_qty)
+					details["actual_qty"] += flt(row.actual_qty)
+					details["reserved_qty"] += flt(row.reserved_qty)
 
 	if company:
-		bin_details["company_total_stock"] = get_company_total_stock(item_code, company)
+		company_total_stock = get_company_total_stock_map({item_code for item_code, _wh in pairs}, company)
+		for (item_code, _warehouse), details in bin_details.items():
+			details["company_total_stock"] = company_total_stock.get(item_code)
 
 	return bin_details
 
 
 def get_company_total_stock(item_code, company):
+	return get_company_total_stock_map([item_code], company).get(item_code)
+
+
+def get_company_total_stock_map(item_codes, company) -> dict[str, float]:
+	item_codes = [item_code for item_code in item_codes if item_code]
+	if not item_codes:
+		return {}
+
 	bin = frappe.qb.DocType("Bin")
 	wh = frappe.qb.DocType("Warehouse")
 
-	return (
-		frappe.qb.from_(bin)
-		.inner_join(wh)
-		.on(bin.warehouse == wh.name)
-		.select(Sum(bin.actual_qty))
-		.where((wh.company == company) & (bin.item_code == item_code))
-	).run()[0][0]
+	return frappe._dict(
+		(
+			frappe.qb.from_(bin)
+			.inner_join(wh)
+			.on(bin.warehouse == wh.name)
+			.select(bin.item_code, Sum(bin.actual_qty))
+			.where((wh.company == company) & (bin.item_code.isin(item_codes)))
+			.groupby(bin.item_code)
+		).run()
+	)
 
 
 @frappe.whitelist()
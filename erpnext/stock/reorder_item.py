@@ -181,33 +181,22 @@ def get_reorder_levels_for_variants(itemwise_reorder):
 
 
 def get_item_warehouse_projected_qty(items_to_consider):
+	"""Returns the projected qty of the items in the warehouses, or warehouse groups, of their
+	reorder levels, including the child warehouses."""
+	from erpnext.stock.get_item_details import get_bin_details_map
+
+	pairs = {
+		(item_code, d.warehouse_group or d.warehouse)
+		for item_code, reorder_levels in items_to_consider.items()
+		for d in reorder_levels
+		if d.warehouse_group or d.warehouse
+	}
+
 	item_warehouse_projected_qty = {}
-	items_to_consider = list(items_to_consider.keys())
-
-	for item_code, warehouse, projected_qty in frappe.db.sql(
-		"""select item_code, warehouse, projected_qty
-		from tabBin where item_code in ({})
-			and (warehouse != '' and warehouse is not null)""".format(
-			", ".join(["%s"] * len(items_to_consider))
-		),
-		items_to_consider,
-	):
-		if item_code not in item_warehouse_projected_qty:
-			item_warehouse_projected_qty.setdefault(item_code, {})
-
-		if warehouse not in item_warehouse_projected_qty.get(item_code):
-			item_warehouse_projected_qty[item_code][warehouse] = flt(projected_qty)
-
-		warehouse_doc = frappe.get_doc("Warehouse", warehouse)
-
-		while warehouse_doc.parent_warehouse:
-			if not item_warehouse_projected_qty.get(item_code, {}).get(warehouse_doc.parent_warehouse):
-				item_warehouse_projected_qty.setdefault(item_code, {})[warehouse_doc.parent_warehouse] = flt(
-					projected_qty
-				)
-			else:
-				item_warehouse_projected_qty[item_code][warehouse_doc.parent_warehouse] += flt(projected_qty)
-			warehouse_doc = frappe.get_doc("Warehouse", warehouse_doc.parent_warehouse)
+	for (item_code, warehouse), details in get_bin_details_map(
+		list(pairs), include_child_warehouses=True
+	).items():
+		item_warehouse_projected_qty.setdefault(item_code, {})[warehouse] = flt(details["projected_qty"])
 
 	return item_warehouse_projected_qty
 
@@ -2,12 +2,15 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from bisect import bisect_left
+from collections import deque
 from collections.abc import Iterator
+from datetime import date
 from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, date_diff, flt
+from frappe.utils import add_days, cint, date_diff, flt, getdate
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -73,9 +76,10 @@ def format_report_data(filters: Filters, item_details: dict, to_date: str) -> li
 
 
 def get_average_age(fifo_queue: list, to_date: str) -> float:
-	batch_age = age_qty = total_qty = 0.0
+	to_date = getdate(to_date)
+	age_qty = total_qty = 0.0
 	for batch in fifo_queue:
-		batch_age = date_diff(to_date, batch[1])
+		batch_age = get_age(to_date, batch[1])
 
 		if isinstance(batch[0], int | float):
 			age_qty += batch_age * batch[0]
@@ -89,22 +93,38 @@ def get_average_age(fifo_queue: list, to_date: str) -> float:
 
 def get_range_age(filters: Filters, fifo_queue: list, to_date: str, item_dict: dict) -> list:
 	precision = cint(frappe.db.get_single_value("System Settings", "float_precision", cache=True))
-	range_values = [0.0] * (len(filters.ranges) + 1)
+	to_date = getdate(to_date)
+	age_limits = [flt(age_limit) for age_limit in filters.ranges]
+	range_values = [0.0] * (len(age_limits) + 1)
+
+	# ranges are entered in ascending order, bucket can be located with a binary search
+	is_sorted = age_limits == sorted(age_limits)
 
 	for item in fifo_queue:
-		age = flt(date_diff(to_date, item[1]))
+		age = get_age(to_date, item[1])
 		qty = flt(item[0]) if not item_dict["has_serial_no"] else 1.0
 
-		for i, age_limit in enumerate(filters.ranges):
-			if age <= flt(age_limit):
-				range_values[i] = flt(range_values[i] + qty, precision)
-				break
+		if is_sorted:
+			index = bisect_left(age_limits, age)
 		else:
-			range_values[-1] = flt(range_values[-1] + qty, precision)
+			index = next((i for i, age_limit in enumerate(age_limits) if age <= age_limit), len(age_limits))
+
+		range_values[index] = flt(range_values[index] + qty, precision)
 
 	return range_values
 
 
+def get_age(to_date: date, posting_date: date | str) -> int:
+	if type(posting_date) is date:
+		return (to_date - posting_date).days
+
+	return date_diff(to_date, posting_date)
+
+
+def is_negative_slot(slot: list) -> bool:
+	return isinstance(slot[0], int | float) and slot[0] < 0
+
+
 def get_columns(filters: Filters) -> list[dict]:
 	range_columns = []
 	setup_ageing_columns(filters, range_columns)
@@ -214,6 +234,7 @@ class FIFOSlots:
 		self.serial_no_batch_purchase_details = {}
 		self.filters = filters
 		self.sle = sle
+		self.start_from = None
 
 	def generate(self) -> dict:
 		"""
@@ -234,6 +255,7 @@ class FIFOSlots:
 
 		bundle_wise_serial_nos = frappe._dict({})
 		if stock_ledger_entries is None:
+			self.__set_opening_slots_from_closing_balance()
 			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos()
 
 		with frappe.db.unbuffered_cursor():
@@ -265,6 +287,10 @@ class FIFOSlots:
 			# Note that stock_ledger_entries is an iterator, you can not reuse it  like a list
 			del stock_ledger_entries
 
+		# queues are deques while processing for O(1) consumption from the front
+		for row in self.item_details.values():
+			row["fifo_queue"] = list(row["fifo_queue"])
+
 		if not self.filters.get("show_warehouse_wise_stock"):
 			# (Item 1, WH 1), (Item 1, WH 2) => (Item 1)
 			self.item_details = self.__aggregate_details_by_item(self.item_details)
@@ -275,15 +301,18 @@ class FIFOSlots:
 		"Initialise keys and FIFO Queue."
 
 		key = (row.name, row.warehouse)
-		self.item_details.setdefault(key, {"details": row, "fifo_queue": []})
+		if key not in self.item_details:
+			self.item_details[key] = {"details": row, "fifo_queue": deque()}
+
 		fifo_queue = self.item_details[key]["fifo_queue"]
 
 		transferred_item_key = (row.voucher_no, row.name, row.warehouse)
-		self.transferred_item_details.setdefault(transferred_item_key, [])
+		if transferred_item_key not in self.transferred_item_details:
+			self.transferred_item_details[transferred_item_key] = deque()
 
 		return key, fifo_queue, transferred_item_key
 
-	def __compute_incoming_stock(self, row: dict, fifo_queue: list, transfer_key: tuple, serial_nos: list):
+	def __compute_incoming_stock(self, row: dict, fifo_queue: deque, transfer_key: tuple, serial_nos: list):
 		"Update FIFO Queue on inward stock."
 
 		transfer_data = self.transferred_item_details.get(transfer_key)
@@ -309,10 +338,13 @@ class FIFOSlots:
 					self.serial_no_batch_purchase_details.setdefault(serial_no, row.posting_date)
 					fifo_queue.append([serial_no, row.posting_date])
 
-	def __compute_outgoing_stock(self, row: dict, fifo_queue: list, transfer_key: tuple, serial_nos: list):
+	def __compute_outgoing_stock(self, row: dict, fifo_queue: deque, transfer_key: tuple, serial_nos: list):
 		"Update FIFO Queue on outward stock."
 		if serial_nos:
-			fifo_queue[:] = [serial_no for serial_no in fifo_queue if serial_no[0] not in serial_nos]
+			serial_nos = set(serial_nos)
+			remaining_slots = [slot for slot in fifo_queue if slot[0] not in serial_nos]
+			fifo_queue.clear()
+			fifo_queue.extend(remaining_slots)
 			return
 
 		qty_to_pop = abs(row.actual_qty)
@@ -322,7 +354,7 @@ class FIFOSlots:
 				# qty to pop >= slot qty
 				# if +ve and not enough or exactly same balance in current slot, consume whole slot
 				qty_to_pop -= flt(slot[0])
-				self.transferred_item_details[transfer_key].append(fifo_queue.pop(0))
+				self.transferred_item_details[transfer_key].append(fifo_queue.popleft())
 			elif not fifo_queue:
 				# negative stock, no balance but qty yet to consume
 				fifo_queue.append([-(qty_to_pop), row.posting_date])
@@ -335,7 +367,7 @@ class FIFOSlots:
 				self.transferred_item_details[transfer_key].append([qty_to_pop, slot[1]])
 				qty_to_pop = 0
 
-	def __adjust_incoming_transfer_qty(self, transfer_data: dict, fifo_queue: list, row: dict):
+	def __adjust_incoming_transfer_qty(self, transfer_data: deque, fifo_queue: deque, row: dict):
 		"Add previously removed stock back to FIFO Queue."
 		transfer_qty_to_pop = flt(row.actual_qty)
 
@@ -351,7 +383,7 @@ class FIFOSlots:
 			if transfer_data and 0 < transfer_data[0][0] <= transfer_qty_to_pop:
 				# bucket qty is not enough, consume whole
 				transfer_qty_to_pop -= transfer_data[0][0]
-				add_to_fifo_queue(transfer_data.pop(0))
+				add_to_fifo_queue(transfer_data.popleft())
 			elif not transfer_data:
 				# transfer bucket is empty, extra incoming qty
 				add_to_fifo_queue([transfer_qty_to_pop, row.posting_date])
@@ -363,14 +395,15 @@ class FIFOSlots:
 				transfer_qty_to_pop = 0
 
 	def __update_balances(self, row: dict, key: tuple | str):
-		self.item_details[key]["qty_after_transaction"] = row.qty_after_transaction
+		item_row = self.item_details[key]
+		item_row["qty_after_transaction"] = row.qty_after_transaction
 
-		if "total_qty" not in self.item_details[key]:
-			self.item_details[key]["total_qty"] = row.actual_qty
+		if "total_qty" not in item_row:
+			item_row["total_qty"] = row.actual_qty
 		else:
-			self.item_details[key]["total_qty"] += row.actual_qty
+			item_row["total_qty"] += row.actual_qty
 
-		self.item_details[key]["has_serial_no"] = row.has_serial_no
+		item_row["has_serial_no"] = row.has_serial_no
 
 	def __aggregate_details_by_item(self, wh_wise_data: dict) -> dict:
 		"Aggregate Item-Wh wise data into single Item entry."
@@ -396,6 +429,130 @@ class FIFOSlots:
 
 		return item_aggregated_data
 
+	def __set_opening_slots_from_closing_balance(self):
+		"""Start from the FIFO queues of the nearest auto generated Closing Stock Balance.
+
+		Only the stock ledger entries posted after the closing balance are processed then.
+		"""
+		if self.filters.get("ignore_closing_balance") or not self.filters.get("company"):
+			return
+
+		closing_balance = frappe.get_all(
+			"Closing Stock Balance",
+			filters={
+				"docstatus": 1,
+				"is_auto_generated": 1,
+				"status": "Completed",
+				"company": self.filters.get("company"),
+				"to_date": ("<", self.filters.get("to_date")),
+			},
+			fields=["name", "to_date"],
+			order_by="to_date desc",
+			limit=1,
+		)
+
+		if not closing_balance:
+			return
+
+		rows = self.__get_applicable_closing_balance_rows(closing_balance[0].name)
+		if rows is None:
+			return
+
+		item_details = self.__get_item_details({row.item_code for row in rows})
+		for row in rows:
+			if row.item_code in item_details:
+				row.details = item_details[row.item_code]
+
+		self.set_opening_slots([row for row in rows if row.details])
+		self.start_from = add_days(closing_balance[0].to_date, 1)
+
+	def set_opening_slots(self, rows: list[dict]) -> None:
+		"""Seed the FIFO queues from the rows of a Closing Stock Balance, the stock ledger entries
+		posted after it are processed on top of them.
+
+		Every dimension-wise row carries the whole queue of its item and warehouse, so the queue
+		is taken once per item and warehouse while the balance qty is summed.
+		"""
+		for row in rows:
+			key = (row.item_code, row.warehouse)
+			if key in self.item_details:
+				item_row = self.item_details[key]
+				item_row["qty_after_transaction"] += flt(row.bal_qty)
+				item_row["total_qty"] += flt(row.bal_qty)
+				continue
+
+			details = frappe._dict(row.get("details") or row, warehouse=row.warehouse)
+			self.item_details[key] = {
+				"details": details,
+				"fifo_queue": deque(),
+				"qty_after_transaction": flt(row.bal_qty),
+				"total_qty": flt(row.bal_qty),
+				"has_serial_no": details.get("has_serial_no"),
+			}
+
+			# negative stock stays at the front of the queue, to be neutralised by the next inward entry
+			slots = sorted(row.fifo_queue or [], key=lambda slot: not is_negative_slot(slot))
+			for slot in slots:
+				posting_date = getdate(slot[1])
+				if isinstance(slot[0], str):
+					self.serial_no_batch_purchase_details.setdefault(slot[0], posting_date)
+
+				self.item_details[key]["fifo_queue"].append([slot[0], posting_date])
+
+	def __get_applicable_closing_balance_rows(self, closing_balance: str) -> list[dict] | None:
+		"""Return the rows matching the report filters, None if the FIFO queues are unusable."""
+		data = frappe.get_doc("Closing Stock Balance", closing_balance).get_prepared_data()
+		if not data:
+			return None
+
+		warehouses = None
+		if self.filters.get("warehouse"):
+			lft, rgt = frappe.db.get_value("Warehouse", self.filters.get("warehouse"), ["lft", "rgt"])
+			warehouses = set(
+				frappe.get_all("Warehouse", filters={"lft": (">=", lft), "rgt": ("<=", rgt)}, pluck="name")
+			)
+		elif self.filters.get("warehouse_type"):
+			warehouses = set(
+				frappe.get_all(
+					"Warehouse",
+					filters={"warehouse_type": self.filters.get("warehouse_type"), "is_group": 0},
+					pluck="name",
+				)
+			)
+
+		rows = []
+		for row in data.data or []:
+			row = frappe._dict(row)
+			if self.filters.get("item_code") and row.item_code != self.filters.get("item_code"):
+				continue
+
+			if warehouses is not None and row.warehouse not in warehouses:
+				continue
+
+			# queue is required to age the balance
+			if flt(row.bal_qty) and not row.fifo_queue:
+				return None
+
+			rows.append(row)
+
+		return rows
+
+	def __get_item_details(self, item_codes: set) -> dict:
+		if not item_codes:
+			return {}
+
+		filters = {"name": ("in", list(item_codes))}
+		if self.filters.get("brand"):
+			filters["brand"] = self.filters.get("brand")
+
+		items = frappe.get_all(
+			"Item",
+			filters=filters,
+			fields=["name", "item_name", "description", "stock_uom", "brand", "item_group", "has_serial_no"],
+		)
+
+		return {item.name: item for item in items}
+
 	def __get_stock_ledger_entries(self) -> Iterator[dict]:
 		sle = frappe.qb.DocType("Stock Ledger Entry")
 		item = self.__get_item_query()  # used as derived table in sle query
@@ -429,6 +586,9 @@ class FIFOSlots:
 			)
 		)
 
+		if self.start_from:
+			sle_query = sle_query.where(sle.posting_date >= self.start_from)
+
 		if self.filters.get("warehouse"):
 			sle_query = self.__get_warehouse_conditions(sle, sle_query)
 		elif self.filters.get("warehouse_type"):
@@ -462,6 +622,9 @@ class FIFOSlots:
 			)
 		)
 
+		if self.start_from:
+			query = query.where(bundle.posting_date >= self.start_from)
+
 		for field in ["item_code"]:
 			if self.filters.get(field):
 				query = query.where(bundle[field] == self.filters.get(field))
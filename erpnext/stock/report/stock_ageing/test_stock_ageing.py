@@ -1,8 +1,12 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
+import random
+import time
+
 import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, flt, getdate
 
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, format_report_data
 
@@ -685,6 +689,63 @@ class TestStockAgeing(IntegrationTestCase):
 		self.assertFalse(transfer_bucket)
 		self.assertEqual(item_result["fifo_queue"][0][0], 10.0)
 
+	def test_opening_slots_from_closing_balance(self):
+		"Entries after a closing balance consume the queues of the closing balance."
+		closing_balance_rows = [
+			# dimension-wise rows carry the whole queue of the item and warehouse
+			frappe._dict(
+				item_code="Flask Item",
+				warehouse="WH 1",
+				bal_qty=qty,
+				fifo_queue=[[30, "2021-11-01"], [20, "2021-11-15"]],
+			)
+			for qty in (20, 30)
+		]
+		closing_balance_rows.append(
+			frappe._dict(
+				item_code="Flask Item", warehouse="WH 2", bal_qty=-5, fifo_queue=[[-5, "2021-11-20"]]
+			)
+		)
+
+		sle = [
+			frappe._dict(
+				name="Flask Item",
+				actual_qty=(-40),
+				qty_after_transaction=10,
+				warehouse="WH 1",
+				posting_date=getdate("2021-12-03"),
+				voucher_type="Stock Entry",
+				voucher_no="001",
+				has_serial_no=False,
+				serial_no=None,
+			),
+			frappe._dict(
+				name="Flask Item",
+				actual_qty=20,
+				qty_after_transaction=15,
+				warehouse="WH 2",
+				posting_date=getdate("2021-12-02"),
+				voucher_type="Stock Entry",
+				voucher_no="002",
+				has_serial_no=False,
+				serial_no=None,
+			),
+		]
+
+		self.filters.show_warehouse_wise_stock = True
+		fifo_slots = FIFOSlots(self.filters, sle)
+		fifo_slots.set_opening_slots(closing_balance_rows)
+		slots = fifo_slots.generate()
+
+		wh_1 = slots[("Flask Item", "WH 1")]
+		self.assertEqual(wh_1["fifo_queue"], [[10.0, getdate("2021-11-15")]])
+		self.assertEqual(wh_1["total_qty"], 10)
+
+		# negative balance of the closing balance is neutralised by the next inward entry
+		wh_2 = slots[("Flask Item", "WH 2")]
+		self.assertEqual(wh_2["fifo_queue"], [[15.0, getdate("2021-12-02")]])
+		self.assertEqual(wh_2["total_qty"], 15)
+
 	def test_precision(self):
 		"Test if final balance qty is rounded off correctly."
 		sle = [
@@ -722,6 +783,64 @@ class TestStockAgeing(IntegrationTestCase):
 		self.assertEqual(bal_qty, 0.9)
 		self.assertEqual(bal_qty, range_qty_sum)
 
+	def test_generated_ledger(self):
+		"Benchmark FIFO slots and ageing buckets on a generated ledger."
+		sle = generate_stock_ledger(items=200, warehouses=5, entries_per_bin=50)
+		filters = frappe._dict(self.filters, show_warehouse_wise_stock=True)
+
+		start = time.perf_counter()
+		slots = FIFOSlots(filters, sle).generate()
+		slots_time = time.perf_counter() - start
+
+		start = time.perf_counter()
+		report_data = format_report_data(filters, slots, filters["to_date"])
+		ageing_time = time.perf_counter() - start
+
+		self.assertEqual(len(slots), 200 * 5)
+		for row in slots.values():
+			self.assertAlmostEqual(sum(slot[0] for slot in row["fifo_queue"]), row["total_qty"])
+
+		for row in report_data:
+			# available qty is split into the ageing buckets
+			self.assertAlmostEqual(row[6], sum(row[8:12]))
+
+		# generous limit, only to catch regressions to quadratic behaviour
+		self.assertLess(
+			slots_time + ageing_time, 60, msg=f"{slots_time=} {ageing_time=} for {len(sle)} entries"
+		)
+
+
+def generate_stock_ledger(items: int, warehouses: int, entries_per_bin: int) -> list:
+	"Generate random inward/outward movements for every item-warehouse, ordered by posting date."
+	random.seed(42)
+	sle = []
+
+	for item in range(items):
+		for warehouse in range(warehouses):
+			balance = 0.0
+			for idx in range(entries_per_bin):
+				qty = flt(random.randint(1, 20))
+				if balance >= qty and random.random() < 0.4:
+					qty = -qty
+
+				balance += qty
+				sle.append(
+					frappe._dict(
+						name=f"Item {item}",
+						actual_qty=qty,
+						qty_after_transaction=balance,
+						warehouse=f"WH {warehouse}",
+						posting_date=add_days("2021-01-01", idx),
+						voucher_type="Stock Entry",
+						voucher_no=f"{item}-{warehouse}-{idx}",
+						has_serial_no=False,
+						serial_no=None,
+					)
+				)
+
+	sle.sort(key=lambda row: row.posting_date)
+	return sle
+
 
 def generate_item_and_item_wh_wise_slots(filters, sle):
 	"Return results with and without 'show_warehouse_wise_stock'"
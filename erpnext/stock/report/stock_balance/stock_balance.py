@@ -74,6 +74,7 @@ class StockBalanceReport:
 
 	def prepare_opening_data_from_closing_balance(self) -> None:
 		self.opening_data = frappe._dict({})
+		self.opening_fifo_slots = []
 
 		closing_balance = self.get_closing_balance()
 		if not closing_balance:
@@ -82,19 +83,87 @@ class StockBalanceReport:
 		self.start_from = add_days(closing_balance[0].to_date, 1)
 		res = frappe.get_doc("Closing Stock Balance", closing_balance[0].name).get_prepared_data()
 
+		# closing balance can be prepared for wider filters than the report, e.g. company-wide
+		# and dimension-wise, hence apply the report filters and regroup as per the report
+		applicable_rows = self.get_filters_for_closing_balance_rows()
+
 		for entry in res.data:
 			entry = frappe._dict(entry)
+			if not self.is_closing_balance_row_applicable(entry, applicable_rows):
+				continue
+
+			self.opening_fifo_slots.append(
+				frappe._dict(
+					item_code=entry.item_code,
+					warehouse=entry.warehouse,
+					bal_qty=entry.bal_qty,
+					fifo_queue=entry.fifo_queue,
+				)
+			)
 
 			group_by_key = self.get_group_by_key(entry)
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
+				continue
+
+			opening_data = self.opening_data[group_by_key]
+			opening_data.bal_qty = flt(opening_data.bal_qty) + flt(entry.bal_qty)
+			opening_data.bal_val = flt(opening_data.bal_val) + flt(entry.bal_val)
+
+			# every dimension-wise row carries the whole queue of the item and warehouse,
+			# which are always part of the group by key
+			if not opening_data.fifo_queue:
+				opening_data.fifo_queue = entry.fifo_queue
+
+	def get_filters_for_closing_balance_rows(self) -> dict[str, set]:
+		applicable_rows = {}
+
+		if self.filters.get("brand"):
+			item_filters = {"brand": self.filters.get("brand")}
+			if self.filters.get("item_code"):
+				item_filters["name"] = self.filters.get("item_code")
+
+			applicable_rows["item_code"] = set(frappe.get_all("Item", filters=item_filters, pluck="name"))
+		elif self.filters.get("item_code"):
+			applicable_rows["item_code"] = {self.filters.get("item_code")}
+
+		if item_group := self.filters.get("item_group"):
+			children = get_descendants_of("Item Group", item_group, ignore_permissions=True)
+			applicable_rows["item_group"] = {*children, item_group}
+
+		if warehouse := self.filters.get("warehouse"):
+			lft, rgt = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"])
+			applicable_rows["warehouse"] = set(
+				frappe.get_all("Warehouse", filters={"lft": (">=", lft), "rgt": ("<=", rgt)}, pluck="name")
+			)
+		elif warehouse_type := self.filters.get("warehouse_type"):
+			applicable_rows["warehouse"] = set(
+				frappe.get_all("Warehouse", filters={"warehouse_type": warehouse_type}, pluck="name")
+			)
+
+		for fieldname in self.inventory_dimensions:
+			if values := self.filters.get(fieldname):
+				applicable_rows[fieldname] = set(values if isinstance(values, list) else [values])
+
+		return applicable_rows
+
+	@staticmethod
+	def is_closing_balance_row_applicable(entry, applicable_rows: dict[str, set]) -> bool:
+		for fieldname, values in applicable_rows.items():
+			if entry.get(fieldname) not in values:
+				return False
+
+		return True
 
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
 
 		if self.filters.get("show_stock_ageing_data"):
 			self.filters["show_warehouse_wise_stock"] = True
-			item_wise_fifo_queue = FIFOSlots(self.filters, self.sle_entries).generate()
+			fifo_slots = FIFOSlots(self.filters, self.sle_entries)
+			# entries after the closing balance consume its queues
+			fifo_slots.set_opening_slots(self.opening_fifo_slots)
+			item_wise_fifo_queue = fifo_slots.generate()
 
 		_func = itemgetter(1)
 
@@ -111,18 +180,13 @@ class StockBalanceReport:
 				report_data.update(variant_data)
 
 			if self.filters.get("show_stock_ageing_data"):
-				opening_fifo_queue = self.get_opening_fifo_queue(report_data) or []
-
-				fifo_queue = []
+				item_fifo_queue = []
 				if fifo_queue := item_wise_fifo_queue.get((report_data.item_code, report_data.warehouse)):
-					fifo_queue = fifo_queue.get("fifo_queue")
-
-				if fifo_queue:
-					opening_fifo_queue.extend(fifo_queue)
+					item_fifo_queue = fifo_queue.get("fifo_queue") or []
 
 				stock_ageing_data = {"average_age": 0, "earliest_age": 0, "latest_age": 0}
-				if opening_fifo_queue:
-					fifo_queue = sorted(filter(_func, opening_fifo_queue), key=_func)
+				if item_fifo_queue:
+					fifo_queue = sorted(filter(_func, item_fifo_queue), key=_func)
 					if not fifo_queue:
 						continue
 
@@ -261,7 +325,12 @@ class StockBalanceReport:
 		return tuple(group_by_key)
 
 	def get_closing_balance(self) -> list[dict[str, Any]]:
-		if self.filters.get("ignore_closing_balance"):
+		"""Return the nearest closing balance usable as the opening balance of the report.
+
+		A closing balance is usable if each of its filters is either not set or same as the report,
+		the rows not matching the report filters are dropped while preparing the opening data.
+		"""
+		if self.filters.get("ignore_closing_balance") or not self.filters.get("company"):
 			return []
 
 		table = frappe.qb.DocType("Closing Stock Balance")
@@ -272,16 +341,27 @@ class StockBalanceReport:
 			.where(
 				(table.docstatus == 1)
 				& (table.company == self.filters.company)
-				& (table.to_date <= self.from_date)
+				& (table.to_date < self.from_date)
 				& (table.status == "Completed")
 			)
 			.orderby(table.to_date, order=Order.desc)
+			.orderby(table.is_auto_generated)
 			.limit(1)
 		)
 
 		for fieldname in ["warehouse", "item_code", "item_group", "warehouse_type"]:
 			if self.filters.get(fieldname):
-				query = query.where(table[fieldname] == self.filters.get(fieldname))
+				query = query.where(
+					(Coalesce(table[fieldname], "") == "") | (table[fieldname] == self.filters.get(fieldname))
+				)
+			else:
+				query = query.where(Coalesce(table[fieldname], "") == "")
+
+		# only auto generated closing balances are prepared dimension-wise
+		if self.filters.get("show_dimension_wise_stock") or any(
+			self.filters.get(fieldname) for fieldname in self.inventory_dimensions
+		):
+			query = query.where(table.is_auto_generated == 1)
 
 		return query.run(as_dict=True)
 
@@ -599,14 +679,6 @@ class StockBalanceReport:
 	def get_inventory_dimension_fields():
 		return [dimension.fieldname for dimension in get_inventory_dimensions()]
 
-	@staticmethod
-	def get_opening_fifo_queue(report_data):
-		opening_fifo_queue = report_data.get("opening_fifo_queue") or []
-		for row in opening_fifo_queue:
-			row[1] = getdate(row[1])
-
-		return opening_fifo_queue
-
 
 def filter_items_with_no_transactions(
 	iwb_map, float_precision: float, inventory_dimensions: list | None = None
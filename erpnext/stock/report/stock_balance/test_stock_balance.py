@@ -3,7 +3,7 @@ from typing import Any
 import frappe
 from frappe import _dict
 from frappe.tests import IntegrationTestCase
-from frappe.utils import today
+from frappe.utils import getdate, today
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -168,3 +168,82 @@ class TestStockBalance(IntegrationTestCase):
 		rows = stock_balance(self.filters.update({"show_variant_attributes": 1, "item_code": variant.name}))
 		self.assertPartialDictEq(attributes, rows[0])
 		self.assertInvariants(rows)
+
+	def test_opening_balance_from_auto_closing_stock_balance(self):
+		from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+			prepare_closing_stock_balance,
+		)
+
+		self.generate_stock_ledger(
+			self.item.name,
+			[
+				_dict(qty=1, rate=1, posting_date="2021-01-01"),
+				_dict(qty=2, rate=2, posting_date="2021-01-02"),
+				_dict(qty=3, rate=3, posting_date="2021-02-03"),
+			],
+		)
+
+		closing_balance = frappe.new_doc("Closing Stock Balance")
+		closing_balance.update(
+			{
+				"company": "_Test Company",
+				"from_date": "2021-01-01",
+				"to_date": "2021-01-31",
+				"is_auto_generated": 1,
+			}
+		)
+		closing_balance.submit()
+		prepare_closing_stock_balance(closing_balance.name)
+		self.assertEqual(
+			frappe.db.get_value("Closing Stock Balance", closing_balance.name, "status"), "Completed"
+		)
+
+		# company-wide closing balance is used for the item filter
+		rows = stock_balance(self.filters.update({"from_date": "2021-02-01"}))
+		self.assertInvariants(rows)
+		self.assertPartialDictEq({"opening_qty": 3, "opening_val": 5, "in_qty": 3}, rows[0])
+
+		# back-dated entry makes the closing balance outdated
+		self.generate_stock_ledger(self.item.name, [_dict(qty=4, rate=4, posting_date="2021-01-15")])
+		self.assertEqual(
+			frappe.db.get_value("Closing Stock Balance", closing_balance.name, "status"), "Queued"
+		)
+
+		rows = stock_balance(self.filters)
+		self.assertInvariants(rows)
+		self.assertPartialDictEq({"opening_qty": 7, "in_qty": 3}, rows[0])
+
+	def test_stock_ageing_from_auto_closing_stock_balance(self):
+		from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+			prepare_closing_stock_balance,
+		)
+
+		self.generate_stock_ledger(
+			self.item.name,
+			[
+				_dict(qty=1, rate=1, posting_date="2021-01-01"),
+				_dict(qty=2, rate=2, posting_date="2021-01-02"),
+			],
+		)
+
+		closing_balance = frappe.new_doc("Closing Stock Balance")
+		closing_balance.update(
+			{
+				"company": "_Test Company",
+				"from_date": "2021-01-01",
+				"to_date": "2021-01-31",
+				"is_auto_generated": 1,
+			}
+		)
+		closing_balance.submit()
+		prepare_closing_stock_balance(closing_balance.name)
+
+		# issue after the closing balance consumes the oldest slots of the closing balance
+		make_stock_entry(
+			item_code=self.item.name, from_warehouse="_Test Warehouse - _TC", qty=2, posting_date="2021-02-03"
+		)
+
+		rows = stock_balance(self.filters.update({"from_date": "2021-02-01", "show_stock_ageing_data": 1}))
+		self.assertInvariants(rows)
+		self.assertPartialDictEq({"opening_qty": 3, "out_qty": 2, "bal_qty": 1}, rows[0])
+		self.assertEqual(rows[0].fifo_queue, [[1.0, getdate("2021-01-02")]])
@@ -105,7 +105,44 @@ frappe.query_reports["Stock Ledger"] = {
 			fieldtype: "Check",
 			default: 0,
 		},
+		{
+			fieldname: "page_length",
+			label: __("Page Length"),
+			fieldtype: "Int",
+			description: __("Load the ledger page by page, 0 loads all the entries"),
+			on_change() {
+				frappe.query_report.set_filter_value("start_after", "");
+			},
+		},
+		{
+			fieldname: "start_after",
+			label: __("Start After"),
+			fieldtype: "Data",
+			hidden: 1,
+		},
 	],
+	onload: function (report) {
+		report.page.add_inner_button(__("Next Page"), () => {
+			const data = (report.data || []).filter((row) => row.creation);
+			if (!report.get_filter_value("page_length") || !data.length) {
+				frappe.msgprint(__("Set Page Length to load the ledger page by page"));
+				return;
+			}
+
+			const last_row = data[data.length - 1];
+			report.set_filter_value(
+				"start_after",
+				JSON.stringify({
+					date: last_row.date,
+					creation: last_row.creation,
+				})
+			);
+		});
+
+		report.page.add_inner_button(__("First Page"), () => {
+			report.set_filter_value("start_after", "");
+		});
+	},
 	formatter: function (value, row, column, data, default_formatter) {
 		value = default_formatter(value, row, column, data);
 		if (column.fieldname == "out_qty" && data && data.out_qty < 0) {
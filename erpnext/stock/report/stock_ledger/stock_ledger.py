@@ -7,8 +7,8 @@ from collections import defaultdict
 
 import frappe
 from frappe import _
-from frappe.query_builder.functions import CombineDatetime, Sum
-from frappe.utils import cint, flt
+from frappe.query_builder.functions import Sum
+from frappe.utils import cint, flt, get_datetime, parse_json
 
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
@@ -27,7 +27,9 @@ def execute(filters=None):
 	items = get_items(filters)
 	sl_entries = get_stock_ledger_entries(filters, items)
 	item_details = get_item_details(items, sl_entries, include_uom)
-	if filters.get("batch_no"):
+	if cursor := get_pagination_cursor(filters):
+		opening_row = get_opening_balance_from_cursor(filters, items, cursor)
+	elif filters.get("batch_no"):
 		opening_row = get_opening_balance_from_batch(filters, columns, sl_entries)
 	else:
 		opening_row = get_opening_balance(filters, columns, sl_entries)
@@ -367,12 +369,27 @@ def get_columns(filters):
 
 
 def get_stock_ledger_entries(filters, items):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = get_stock_ledger_query(filters, items)
+
+	if cursor := get_pagination_cursor(filters):
+		# keyset pagination, continue after the last entry of the previous page
+		query = query.where(~get_entries_till_cursor(sle, cursor))
+
+	if page_length := cint(filters.get("page_length")):
+		query = query.limit(page_length)
+
+	return query.run(as_dict=True)
+
+
+def get_stock_ledger_query(filters, items):
 	sle = frappe.qb.DocType("Stock Ledger Entry")
 	query = (
 		frappe.qb.from_(sle)
 		.select(
 			sle.item_code,
 			sle.posting_datetime.as_("date"),
+			sle.creation,
 			sle.warehouse,
 			sle.posting_date,
 			sle.posting_time,
@@ -395,7 +412,7 @@ def get_stock_ledger_entries(filters, items):
 			& (sle.is_cancelled == 0)
 			& (sle.posting_date[filters.from_date : filters.to_date])
 		)
-		.orderby(CombineDatetime(sle.posting_date, sle.posting_time))
+		.orderby(sle.posting_datetime)
 		.orderby(sle.creation)
 	)
 
@@ -423,9 +440,88 @@ def get_stock_ledger_entries(filters, items):
 		else:
 			query = query.where(sle.batch_no == filters.batch_no)
 
-	query = apply_warehouse_filter(query, sle, filters)
+	return apply_warehouse_filter(query, sle, filters)
 
-	return query.run(as_dict=True)
+
+def get_pagination_cursor(filters) -> dict | None:
+	"""Return the last row of the previous page, set as `start_after` by the report view."""
+	if not (cint(filters.get("page_length")) and filters.get("start_after")):
+		return None
+
+	cursor = parse_json(filters.get("start_after"))
+	if not (cursor.get("date") and cursor.get("creation")):
+		return None
+
+	return cursor
+
+
+def get_entries_till_cursor(table, cursor):
+	"""Condition for the entries up to and including the last entry of the previous page."""
+	posting_datetime = get_datetime(cursor.get("date"))
+	return (table.posting_datetime < posting_datetime) | (
+		(table.posting_datetime == posting_datetime)
+		& (table.creation <= get_datetime(cursor.get("creation")))
+	)
+
+
+def get_opening_balance_from_cursor(filters, items, cursor):
+	"""Opening of a page is the balance after the last entry of the previous page."""
+	if filters.get("batch_no"):
+		return get_opening_balance_from_batch(filters, None, [], cursor=cursor)
+
+	if check_inventory_dimension_filters_applied(filters):
+		# running balance of the entries shown on the previous pages
+		opening_row = get_opening_balance(filters, None, []) or {}
+		qty_after_transaction, stock_value = get_stock_ledger_totals_till_cursor(filters, items, cursor)
+		qty_after_transaction += flt(opening_row.get("qty_after_transaction"))
+		stock_value += flt(opening_row.get("stock_value"))
+
+	elif filters.item_code and filters.warehouse:
+		last_entry = get_last_stock_ledger_entry_till_cursor(filters, cursor)
+		qty_after_transaction = flt(last_entry.get("qty_after_transaction"))
+		stock_value = flt(last_entry.get("stock_value"))
+
+	else:
+		return
+
+	return {
+		"item_code": _("'Opening'"),
+		"qty_after_transaction": qty_after_transaction,
+		"valuation_rate": stock_value / qty_after_transaction if qty_after_transaction else 0.0,
+		"stock_value": stock_value,
+	}
+
+
+def get_last_stock_ledger_entry_till_cursor(filters, cursor):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(sle.qty_after_transaction, sle.stock_value)
+		.where(
+			(sle.item_code == filters.item_code)
+			& (sle.docstatus < 2)
+			& (sle.is_cancelled == 0)
+			& get_entries_till_cursor(sle, cursor)
+		)
+		.orderby(sle.posting_datetime, order=frappe.qb.desc)
+		.orderby(sle.creation, order=frappe.qb.desc)
+		.limit(1)
+	)
+
+	last_entry = apply_warehouse_filter(query, sle, filters).run(as_dict=True)
+	return last_entry[0] if last_entry else frappe._dict()
+
+
+def get_stock_ledger_totals_till_cursor(filters, items, cursor) -> tuple[float, float]:
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	entries = (
+		get_stock_ledger_query(filters, items).where(get_entries_till_cursor(sle, cursor)).as_("entries")
+	)
+
+	totals = (
+		frappe.qb.from_(entries).select(Sum(entries.actual_qty), Sum(entries.stock_value_difference)).run()
+	)
+	return flt(totals[0][0]), flt(totals[0][1])
 
 
 def get_serial_and_batch_bundles(filters):
@@ -526,30 +622,38 @@ def get_sle_conditions(filters):
 	return "and {}".format(" and ".join(conditions)) if conditions else ""
 
 
-def get_opening_balance_from_batch(filters, columns, sl_entries):
-	query_filters = {
-		"batch_no": filters.batch_no,
-		"docstatus": 1,
-		"is_cancelled": 0,
-		"posting_date": ("<", filters.from_date),
-		"company": filters.company,
-	}
+def get_opening_balance_from_batch(filters, columns, sl_entries, cursor=None):
+	table = frappe.qb.DocType("Stock Ledger Entry")
+	if cursor:
+		till_opening = get_entries_till_cursor(table, cursor)
+	else:
+		till_opening = table.posting_date < filters.from_date
 
-	for fields in ["item_code", "warehouse"]:
-		if filters.get(fields):
-			query_filters[fields] = filters.get(fields)
+	query = (
+		frappe.qb.from_(table)
+		.select(
+			Sum(table.actual_qty).as_("qty_after_transaction"),
+			Sum(table.stock_value_difference).as_("stock_value"),
+		)
+		.where(
+			(table.batch_no == filters.batch_no)
+			& (table.docstatus == 1)
+			& (table.is_cancelled == 0)
+			& (table.company == filters.company)
+			& till_opening
+		)
+	)
 
-	opening_data = frappe.get_all(
-		"Stock Ledger Entry",
-		fields=["sum(actual_qty) as qty_after_transaction", "sum(stock_value_difference) as stock_value"],
-		filters=query_filters,
-	)[0]
+	for field in ["item_code", "warehouse"]:
+		if filters.get(field):
+			query = query.where(table[field] == filters.get(field))
+
+	opening_data = query.run(as_dict=True)[0]
 
 	for field in ["qty_after_transaction", "stock_value", "valuation_rate"]:
 		if opening_data.get(field) is None:
 			opening_data[field] = 0.0
 
-	table = frappe.qb.DocType("Stock Ledger Entry")
 	sabb_table = frappe.qb.DocType("Serial and Batch Entry")
 	query = (
 		frappe.qb.from_(table)
@@ -562,8 +666,8 @@ def get_opening_balance_from_batch(filters, columns, sl_entries):
 		.where(
 			(sabb_table.batch_no == filters.batch_no)
 			& (sabb_table.docstatus == 1)
-			& (table.posting_date < filters.from_date)
 			& (table.is_cancelled == 0)
+			& till_opening
 		)
 	)
 
@@ -605,14 +709,26 @@ def get_opening_balance(filters, columns, sl_entries):
 	)
 
 	# check if any SLEs are actually Opening Stock Reconciliation
-	for sle in list(sl_entries):
-		if (
-			sle.get("voucher_type") == "Stock Reconciliation"
-			and sle.posting_date == filters.from_date
-			and frappe.db.get_value("Stock Reconciliation", sle.voucher_no, "purpose") == "Opening Stock"
-		):
-			last_entry = sle
-			sl_entries.remove(sle)
+	stock_reconciliations = [
+		sle.voucher_no
+		for sle in sl_entries
+		if sle.get("voucher_type") == "Stock Reconciliation" and sle.posting_date == filters.from_date
+	]
+
+	if stock_reconciliations:
+		opening_stock_reconciliations = frappe.get_all(
+			"Stock Reconciliation",
+			filters={"name": ("in", stock_reconciliations), "purpose": "Opening Stock"},
+			pluck="name",
+		)
+
+		for sle in list(sl_entries):
+			if (
+				sle.get("voucher_type") == "Stock Reconciliation"
+				and sle.voucher_no in opening_stock_reconciliations
+			):
+				last_entry = sle
+				sl_entries.remove(sle)
 
 	row = {
 		"item_code": _("'Opening'"),
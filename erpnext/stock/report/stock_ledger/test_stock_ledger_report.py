@@ -8,6 +8,9 @@ from frappe.utils import add_days, today
 from erpnext.maintenance.doctype.maintenance_schedule.test_maintenance_schedule import (
 	make_serial_item_with_serial,
 )
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.report.stock_ledger.stock_ledger import execute
 
 
 class TestStockLedgerReeport(IntegrationTestCase):
@@ -22,3 +25,36 @@ class TestStockLedgerReeport(IntegrationTestCase):
 
 	def tearDown(self) -> None:
 		frappe.db.rollback()
+
+	def test_keyset_pagination(self):
+		item_code = make_item("_Test Stock Ledger Pagination Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		for qty in (5, 3, 2, 7, 1):
+			make_stock_entry(item_code=item_code, target=warehouse, qty=qty, rate=10)
+
+		filters = frappe._dict(self.filters, item_code=item_code, warehouse=warehouse, from_date=today())
+		all_rows = execute(filters)[1][1:]  # skip opening row
+
+		filters.page_length = 2
+		pages = []
+		while True:
+			rows = execute(filters)[1]
+			opening, rows = rows[0], rows[1:]
+			if pages:
+				# opening of a page is the balance after the previous page
+				self.assertEqual(opening["qty_after_transaction"], pages[-1]["qty_after_transaction"])
+
+			if not rows:
+				break
+
+			self.assertLessEqual(len(rows), 2)
+			pages.extend(rows)
+			filters.start_after = frappe.as_json({"date": rows[-1]["date"], "creation": rows[-1]["creation"]})
+
+		self.assertEqual([row["voucher_no"] for row in pages], [row["voucher_no"] for row in all_rows])
+
+		# start after is ignored when the ledger is not paginated
+		filters.page_length = 0
+		rows = execute(filters)[1]
+		self.assertEqual(rows[0]["item_code"], "'Opening'")
+		self.assertEqual(len(rows) - 1, len(all_rows))
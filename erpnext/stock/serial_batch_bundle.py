@@ -4,7 +4,7 @@ import frappe
 from frappe import _, bold
 from frappe.model.naming import make_autoname
 from frappe.query_builder.functions import CombineDatetime, Sum, Timestamp
-from frappe.utils import add_days, cint, cstr, flt, get_link_to_form, now, nowtime, today
+from frappe.utils import add_days, cint, create_batch, cstr, flt, get_link_to_form, now, nowtime, today
 from pypika import Order
 
 from erpnext.stock.deprecated_serial_batch import (
@@ -1037,10 +1037,15 @@ class SerialBatchCreation:
 			self.batches = frappe._dict({self.batch_no: abs(self.actual_qty)})
 
 	def make_serial_no_if_not_exists(self):
-		non_exists_serial_nos = []
-		for row in self.serial_nos:
-			if not frappe.db.exists("Serial No", row):
-				non_exists_serial_nos.append(row)
+		from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import QUERY_CHUNK_SIZE
+
+		existing_serial_nos = set()
+		for chunk in create_batch(list(set(self.serial_nos)), QUERY_CHUNK_SIZE):
+			existing_serial_nos.update(
+				frappe.get_all("Serial No", filters={"name": ("in", chunk)}, pluck="name")
+			)
+
+		non_exists_serial_nos = [row for row in self.serial_nos if row not in existing_serial_nos]
 
 		if non_exists_serial_nos:
 			self.make_serial_nos(non_exists_serial_nos)
@@ -1051,13 +1056,14 @@ class SerialBatchCreation:
 		if self.batches:
 			batch_no = next(iter(self.batches.keys()))
 
+		timestamp = now()
 		for serial_no in serial_nos:
 			serial_nos_details.append(
 				(
 					serial_no,
 					serial_no,
-					now(),
-					now(),
+					timestamp,
+					timestamp,
 					frappe.session.user,
 					frappe.session.user,
 					self.warehouse,
@@ -1169,6 +1175,7 @@ class SerialBatchCreation:
 		if self.get("voucher_no"):
 			voucher_no = self.get("voucher_no")
 
+		timestamp = now()
 		for _i in range(abs(cint(self.actual_qty))):
 			serial_no = make_autoname(self.serial_no_series, "Serial No")
 			sr_nos.append(serial_no)
@@ -1176,8 +1183,8 @@ class SerialBatchCreation:
 				(
 					serial_no,
 					serial_no,
-					now(),
-					now(),
+					timestamp,
+					timestamp,
 					frappe.session.user,
 					frappe.session.user,
 					self.warehouse,
@@ -1230,11 +1237,17 @@ def get_serial_or_batch_items(items):
 
 
 def get_serial_nos_batch(serial_nos):
-	return frappe._dict(
-		frappe.get_all(
-			"Serial No",
-			fields=["name", "batch_no"],
-			filters={"name": ("in", serial_nos)},
-			as_list=1,
+	from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import QUERY_CHUNK_SIZE
+
+	serial_no_batch = frappe._dict()
+	for chunk in create_batch(list(set(serial_nos)), QUERY_CHUNK_SIZE):
+		serial_no_batch.update(
+			frappe.get_all(
+				"Serial No",
+				fields=["name", "batch_no"],
+				filters={"name": ("in", chunk)},
+				as_list=1,
+			)
 		)
-	)
+
+	return serial_no_batch
@@ -65,6 +65,9 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 	                        stock)
 	"""
 	from erpnext.controllers.stock_controller import future_sle_exists
+	from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+		invalidate_closing_stock_balance,
+	)
 
 	if sl_entries:
 		cancel = sl_entries[0].get("is_cancelled")
@@ -72,6 +75,11 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 			validate_cancellation(sl_entries)
 			set_as_cancel(sl_entries[0].get("voucher_type"), sl_entries[0].get("voucher_no"))
 
+		# back-dated entries make the auto generated closing balances outdated
+		invalidate_closing_stock_balance(
+			sl_entries[0].get("company"), min(getdate(sle.get("posting_date")) for sle in sl_entries)
+		)
+
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
 
@@ -1,7 +1,9 @@
 import frappe
 from frappe.tests import IntegrationTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.get_item_details import get_bin_details, get_bin_details_for_items, get_item_details
 
 EXTRA_TEST_RECORD_DEPENDENCIES = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
 
@@ -28,3 +30,26 @@ class TestGetItemDetail(IntegrationTestCase):
 		)
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
+
+	def test_bulk_bin_details(self):
+		item_code = make_item("_Test Bulk Bin Details Item", {"is_stock_item": 1}).name
+		make_stock_entry(item_code=item_code, target="_Test Warehouse - _TC", qty=5, rate=10)
+		make_stock_entry(item_code=item_code, target="_Test Warehouse 1 - _TC", qty=3, rate=10)
+
+		items = [
+			{"item_code": item_code, "warehouse": "_Test Warehouse - _TC"},
+			{"item_code": item_code, "warehouse": "All Warehouses - _TC"},
+			{"item_code": "_Test Item", "warehouse": None},
+		]
+
+		bin_details = get_bin_details_for_items(items, company="_Test Company", include_child_warehouses=1)
+		self.assertEqual(bin_details[0]["actual_qty"], 5)
+		self.assertEqual(bin_details[1]["actual_qty"], 8)
+		self.assertEqual(bin_details[1]["company_total_stock"], 8)
+		self.assertEqual(bin_details[2]["actual_qty"], 0)
+
+		# single row API returns the same result
+		for row, details in zip(items[:2], bin_details[:2], strict=True):
+			self.assertEqual(
+				get_bin_details(row["item_code"], row["warehouse"], "_Test Company", True), details
+			)